@@ -0,0 +1,8 @@
+"""
+----- Benchmarks du projet -----
+
+Chaque module se lance depuis la racine du dépôt, par exemple :
+    python -m benchmarks.bench_import
+
+Les résultats sont affichés dans la console.
+"""
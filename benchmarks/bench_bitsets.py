@@ -0,0 +1,146 @@
+"""
+Questions 23, 24, 25 et 28 sur des fichiers agrandis (benchmarks.dataset) : ancienne version avec des sets, des
+jointures et une Query, et nouvelle version avec des bitmaps de codes de pays (module bitsets). Seul le calcul est
+mesuré, sans l'affichage. Les tables sont de simples listes, sans index ni cache de résultats, et le dictionnaire des
+codes est construit une fois, comme dans projet.main.
+
+La dernière colone ne mesure que la combinaison des critères déjà calculés (différences et intersections), avec des
+sets et avec des bitmaps convertis en codes
+"""
+
+import tempfile
+
+from benchmarks.common import best_time
+from benchmarks.dataset import generate_dataset
+from bitsets import CodeDictionary
+from query import Query
+from tables import (
+    filter_table_by_comparator,
+    filter_table_by_list,
+    filter_table_by_value,
+    get_table_content,
+    get_unique_values_on_column,
+    join_on,
+    summarize_column,
+)
+
+FACTORS = (1, 10, 50)
+
+
+def get_french_official_countries(table_lang, table_country):
+    """
+    :return list[tuple]: les pays où le français est une langue officielle, comme les questions 7 et 8
+    """
+    french_official_codes = get_unique_values_on_column(
+        filter_table_by_value(filter_table_by_value(table_lang, 1, 'French'), 2, 'T'), 0
+    )
+    return filter_table_by_list(table_country, 0, french_official_codes)
+
+
+def get_sa_life_expectancy(table_country):
+    summary = summarize_column(filter_table_by_value(table_country, 3, 'South America'), 7)
+    return summary['sum'] / summary['count']
+
+
+def questions_with_sets(table_lang, table_country, table_city, french_official_countries):
+    french = set(get_unique_values_on_column(filter_table_by_value(table_lang, 1, 'French'), 0))
+    english = set(get_unique_values_on_column(filter_table_by_value(table_lang, 1, 'English'), 0))
+    result_23 = filter_table_by_list(table_country, 0, french - english)
+    result_24 = join_on(table_country, table_city, 0, 2, how='semi')
+    result_25 = join_on(table_country, table_lang, 0, 0, how='anti')
+
+    lang_count_by_country_codes = dict()
+    for row in table_lang:
+        lang_count_by_country_codes[row[0]] = lang_count_by_country_codes.get(row[0], 0) + 1
+    more_3_langs = [code for code, count in lang_count_by_country_codes.items() if count >= 3]
+    countries_28 = (
+        Query(table_country)
+        .where_in(0, more_3_langs)
+        .where_in(0, get_unique_values_on_column(french_official_countries, 0))
+        .where_gt(7, get_sa_life_expectancy(table_country))
+        .all()
+    )
+    result_28 = filter_table_by_list(table_city, 2, get_unique_values_on_column(countries_28, 0))
+    return result_23, result_24, result_25, result_28
+
+
+def questions_with_bitmaps(table_lang, table_country, table_city, french_official_countries, country_codes):
+    french = country_codes.from_column(filter_table_by_value(table_lang, 1, 'French'), 0)
+    english = country_codes.from_column(filter_table_by_value(table_lang, 1, 'English'), 0)
+    result_23 = filter_table_by_list(table_country, 0, country_codes.to_codes(french & ~english))
+    result_24 = filter_table_by_list(table_country, 0, country_codes.to_codes(country_codes.from_column(table_city, 2)))
+    result_25 = filter_table_by_list(
+        table_country, 0, country_codes.to_codes(country_codes.all & ~country_codes.from_column(table_lang, 0))
+    )
+
+    selected_28 = (
+        country_codes.from_counts(table_lang, 0, 3)
+        & country_codes.from_column(french_official_countries, 0)
+        & country_codes.from_column(
+            filter_table_by_comparator(table_country, 7, '>', get_sa_life_expectancy(table_country)), 0
+        )
+    )
+    result_28 = filter_table_by_list(table_city, 2, country_codes.to_codes(selected_28))
+    return result_23, result_24, result_25, result_28
+
+
+def combine_sets(criteria):
+    french, english, all_codes, lang_codes, more_3_langs, french_official, long_life = criteria
+    return french - english, all_codes - lang_codes, more_3_langs & french_official & long_life
+
+
+def combine_bitmaps(criteria, country_codes):
+    french, english, all_codes, lang_codes, more_3_langs, french_official, long_life = criteria
+    return (country_codes.to_codes(french & ~english), country_codes.to_codes(all_codes & ~lang_codes),
+            country_codes.to_codes(more_3_langs & french_official & long_life))
+
+
+def get_criteria(table_lang, table_country, french_official_countries):
+    """
+    :return tuple[set]: les ensembles de codes de pays combinés par les questions 23, 25 et 28
+    """
+    lang_count_by_country_codes = dict()
+    for row in table_lang:
+        lang_count_by_country_codes[row[0]] = lang_count_by_country_codes.get(row[0], 0) + 1
+    long_life = filter_table_by_comparator(table_country, 7, '>', get_sa_life_expectancy(table_country))
+    return (
+        {row[0] for row in filter_table_by_value(table_lang, 1, 'French')},
+        {row[0] for row in filter_table_by_value(table_lang, 1, 'English')},
+        {row[0] for row in table_country},
+        {row[0] for row in table_lang},
+        {code for code, count in lang_count_by_country_codes.items() if count >= 3},
+        {row[0] for row in french_official_countries},
+        {row[0] for row in long_life},
+    )
+
+
+def main():
+    print('{:>8} {:>8} {:>10} {:>14} {:>14} {:>8} {:>26}'
+          .format('facteur', 'pays', 'villes', 'sets', 'bitmaps', 'gain', 'combinaison sets/bitmaps'))
+    for factor in FACTORS:
+        with tempfile.TemporaryDirectory() as directory:
+            file_names = generate_dataset(directory, factor)
+            table_lang, table_country, table_city = (
+                get_table_content(file_names[name]) for name in ('table_lang', 'table_country', 'table_city')
+            )
+            french_official_countries = get_french_official_countries(table_lang, table_country)
+            arguments = (table_lang, table_country, table_city, french_official_countries)
+            country_codes = CodeDictionary.from_table(table_country, 0)
+
+            sets_time, sets_results = best_time(questions_with_sets, *arguments)
+            bitmaps_time, bitmaps_results = best_time(questions_with_bitmaps, *arguments, country_codes)
+            assert sets_results == bitmaps_results
+
+            criteria = get_criteria(table_lang, table_country, french_official_countries)
+            bitmap_criteria = tuple(map(country_codes.from_codes, criteria))
+            combine_sets_time, combined = best_time(combine_sets, criteria)
+            combine_bitmaps_time, bitmap_combined = best_time(combine_bitmaps, bitmap_criteria, country_codes)
+            assert list(map(set, bitmap_combined)) == list(combined)
+
+            print('{:>8} {:>8} {:>10} {:>11.1f} ms {:>11.1f} ms {:>7.1f}x {:>11.3f} ms / {:>7.3f} ms'
+                  .format(factor, len(table_country), len(table_city), sets_time * 1000, bitmaps_time * 1000,
+                          sets_time / bitmaps_time, combine_sets_time * 1000, combine_bitmaps_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Colones 'category' encodées par dictionnaire (CategoryColumn) comparées à une liste de strings partagées (ancien
+stockage des colones 'category') : mémoire de chaque colone et temps des filtres d'égalité et de liste blanche, sur
+des copies de pays.csv, villes.csv et langues.csv agrandies 100 fois
+"""
+
+import tracemalloc
+
+import tables
+from benchmarks.common import best_time, scale_city_table, scale_table
+from columnar import ColumnTable
+from tables import filter_table_by_list, filter_table_by_value, get_unique_values_on_column
+
+FACTOR = 100
+
+
+def loaded_memory(function, *args):
+    """
+    :return tuple[int, any]: la mémoire encore occupée par le résultat de la fonction en octets, et le résultat
+    """
+    tracemalloc.start()
+    result = function(*args)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    cases = (
+        ('pays', scale_table(list(tables.table_country), FACTOR), tables.DEFAULT_SCHEMAS['table_country']),
+        ('villes', scale_city_table(FACTOR), tables.DEFAULT_SCHEMAS['table_city']),
+        ('langues', scale_table(list(tables.table_lang), FACTOR), tables.DEFAULT_SCHEMAS['table_lang']),
+    )
+    print('{:>8} {:>8} {:>10} {:>8} {:>12} {:>12} {:>13} {:>13} {:>13} {:>13}'
+          .format('fichier', 'colone', 'lignes', 'valeurs', 'liste (Mo)', 'codes (Mo)',
+                  '== liste', '== codes', 'in liste', 'in codes'))
+    total_before = total_after = 0
+    for name, table, schema in cases:
+        for column_index, column_type in enumerate(schema):
+            if column_type != 'category':
+                continue
+            values = [row[column_index] for row in table]
+            before_memory, before_table = loaded_memory(ColumnTable.from_rows, [(value,) for value in values], ('str',))
+            after_memory, after_table = loaded_memory(ColumnTable.from_rows, [(value,) for value in values],
+                                                      ('category',))
+            total_before += before_memory
+            total_after += after_memory
+
+            unique_values = get_unique_values_on_column(after_table, 0)
+            value, whitelist = unique_values[0], unique_values[::4]
+            before_value_time, before_value = best_time(filter_table_by_value, before_table, 0, value)
+            after_value_time, after_value = best_time(filter_table_by_value, after_table, 0, value)
+            before_list_time, before_list = best_time(filter_table_by_list, before_table, 0, whitelist)
+            after_list_time, after_list = best_time(filter_table_by_list, after_table, 0, whitelist)
+            assert before_value.selection == after_value.selection and before_list.selection == after_list.selection
+
+            print('{:>8} {:>8} {:>10} {:>8} {:>12.2f} {:>12.2f} {:>10.1f} ms {:>10.1f} ms {:>10.1f} ms {:>10.1f} ms'
+                  .format(name, column_index, len(values), len(unique_values), before_memory / 1_000_000,
+                          after_memory / 1_000_000, before_value_time * 1000, after_value_time * 1000,
+                          before_list_time * 1000, after_list_time * 1000))
+    print('total : {:.1f} Mo avec des listes, {:.1f} Mo avec des codes ({:.1f}x moins)'
+          .format(total_before / 1_000_000, total_after / 1_000_000, total_before / total_after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Comparaison entre une table de tuples de strings et une ColumnTable typée, sur des copies agrandies de villes.csv :
+mémoire occupée par la table chargée, et temps des filtres numériques des questions 4 et 11
+"""
+
+import tempfile
+import tracemalloc
+
+from benchmarks.common import best_time, write_scaled_city_file
+from columnar import CITY_SCHEMA
+from tables import filter_table_by_comparator, get_column_table, get_table_content, summarize_column
+
+FACTORS = (1, 10, 50)
+
+
+def loaded_memory(function, *args):
+    """
+    Permet de mesurer la mémoire encore occupée par le résultat d'une fonction après son appel
+    :param function: la fonction à mesurer
+    :param args: les arguments de la fonction
+    :return tuple[int, any]: la mémoire occupée en octets et le résultat de la fonction
+    """
+    tracemalloc.start()
+    result = function(*args)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    print('{:>8} {:>10} {:>12} {:>12} {:>14} {:>14}'
+          .format('facteur', 'lignes', 'tuples (Mo)', 'typée (Mo)', 'filtre tuples', 'filtre typée'))
+    with tempfile.TemporaryDirectory() as directory:
+        for factor in FACTORS:
+            file_name = write_scaled_city_file(directory, factor)
+            row_memory, row_table = loaded_memory(get_table_content, file_name)
+            column_memory, column_table = loaded_memory(get_column_table, file_name, CITY_SCHEMA)
+
+            row_time, row_result = best_time(filter_table_by_comparator, row_table, 4, '>', 100_000)
+            column_time, column_result = best_time(filter_table_by_comparator, column_table, 4, '>', 100_000)
+            assert len(row_result) == len(column_result)
+            assert summarize_column(row_result, 4) == summarize_column(column_result, 4)
+
+            print('{:>8} {:>10} {:>12.2f} {:>12.2f} {:>11.1f} ms {:>11.1f} ms'
+                  .format(factor, len(row_table), row_memory / 1_000_000, column_memory / 1_000_000,
+                          row_time * 1000, column_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Temps de chargement de copies agrandies de villes.csv : lecture du CSV sans cache, premier chargement avec cache
+(lecture du CSV et écriture du cache) et chargement suivant (lecture du cache seulement)
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import write_scaled_city_file
+from disk_cache import get_cache_file_name
+from tables import get_table_content
+
+FACTORS = (1, 50, 200)
+
+
+def elapsed(function, *args, **kwargs):
+    """
+    :return tuple[float, any]: le temps d'exécution d'un seul appel en secondes, et son résultat
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print('{:>8} {:>10} {:>14} {:>12} {:>12}'.format('facteur', 'lignes', 'sans cache', 'à froid', 'à chaud'))
+    with tempfile.TemporaryDirectory() as directory:
+        for factor in FACTORS:
+            file_name = write_scaled_city_file(directory, factor)
+            plain_time, plain_table = elapsed(get_table_content, file_name)
+            cold_time, cold_table = elapsed(get_table_content, file_name, cache=True)
+            warm_time, warm_table = elapsed(get_table_content, file_name, cache=True)
+            assert plain_table == cold_table == warm_table
+            assert os.path.exists(get_cache_file_name(file_name))
+            print('{:>8} {:>10} {:>11.1f} ms {:>9.1f} ms {:>9.1f} ms'
+                  .format(factor, len(plain_table), plain_time * 1000, cold_time * 1000, warm_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
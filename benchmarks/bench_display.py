@@ -0,0 +1,71 @@
+"""
+Comparaison entre l'ancien display_table (tables transposées et chaque case convertie trois fois en string) et le
+nouveau, pour l'affichage de 10 lignes et de toute la table, sur des copies agrandies de villes.csv
+"""
+
+import contextlib
+import io
+
+from benchmarks.common import best_time, scale_city_table
+from tables import change_table_direction, display_table
+
+FACTORS = (1, 10, 100)
+
+
+def display_table_before(table, start=0, end=None):
+    """
+    display_table avant son optimisation, pour les tables sous forme de liste
+    """
+    new_table = table[start:end]
+    rows = len(table)
+    stats = {
+        'rows': rows,
+        'displayed_rows': end if end and end < rows else rows - start,
+        'columns': len(new_table[0])
+    }
+    print_list = list()
+    print_list.append('{} lignes ({} affichées), {} colones, {} cellules ({} affichées)'
+                      .format(stats['rows'], stats['displayed_rows'], stats['columns'],
+                              stats['rows'] * stats['columns'],
+                              stats['displayed_rows'] * stats['columns']))
+    row_max_length = [max([len(str(cell)) for cell in row]) for row in change_table_direction(new_table)]
+    for row in new_table:
+        print_list.append('+' + '+'.join(['-' * (length + 2) for length in row_max_length]) + '+')
+        print_list.append(
+            '| ' + ' | '.join(
+                [str(cell) + ' ' * (row_max_length[index] - len(str(cell))) for index, cell in enumerate(row)]
+            ) + ' |')
+    print_list.append('+' + '+'.join(['-' * (length + 2) for length in row_max_length]) + '+')
+    print(*print_list, sep='\n')
+
+
+def render_before(table, end):
+    with contextlib.redirect_stdout(io.StringIO()) as stream:
+        display_table_before(table, 0, end)
+    return stream.getvalue()
+
+
+def render_after(table, end):
+    stream = io.StringIO()
+    display_table(table, 0, end, file=stream)
+    return stream.getvalue()
+
+
+def main():
+    print('{:>8} {:>10} {:>14} {:>14} {:>14} {:>14}'
+          .format('facteur', 'lignes', '10 avant', '10 après', 'tout avant', 'tout après'))
+    for factor in FACTORS:
+        table = scale_city_table(factor)
+        short_before_time, short_before = best_time(render_before, table, 10)
+        short_after_time, short_after = best_time(render_after, table, 10)
+        full_before_time, full_before = best_time(render_before, table, None)
+        full_after_time, full_after = best_time(render_after, table, None)
+        assert short_before == short_after and full_before == full_after
+
+        print('{:>8} {:>10} {:>11.2f} ms {:>11.2f} ms {:>11.1f} ms {:>11.1f} ms'
+              .format(factor, len(table), short_before_time * 1000, short_after_time * 1000,
+                      full_before_time * 1000, full_after_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Suppression des doublons : l'ancienne version de filter_duplicated_rows (recherche dans une liste, quadratique) contre
+la nouvelle (set, linéaire), sur des copies agrandies de villes.csv.
+
+Les identifiants des villes sont tous différents : c'est le pire cas de l'ancienne version, qui est seulement estimée
+au-delà de OLD_MAX_ROWS lignes. La dernière colone utilise une clé composée (code de pays, district).
+"""
+
+from benchmarks.common import best_time, scale_city_table
+from tables import filter_duplicated_rows
+
+FACTORS = (1, 2, 4, 8, 25, 100)
+OLD_MAX_ROWS = 40_000
+
+
+def filter_duplicated_rows_list(table, column_index):
+    """
+    Ancienne version de filter_duplicated_rows
+    """
+    column_data = list()
+    new_table = list()
+    for row in table:
+        if not row[column_index] in column_data:
+            new_table.append(row)
+            column_data.append(row[column_index])
+    return new_table
+
+
+def main():
+    print('{:>10} {:>15} {:>15} {:>22}'.format('lignes', 'liste (ms)', 'set (ms)', 'set, clé composée (ms)'))
+    measured_rows, measured_time = None, None
+    for factor in FACTORS:
+        table_city = scale_city_table(factor)
+        new_time, new_result = best_time(filter_duplicated_rows, table_city, 0)
+        composite_time, _ = best_time(filter_duplicated_rows, table_city, 2, 3)
+
+        if len(table_city) <= OLD_MAX_ROWS:
+            old_time, old_result = best_time(filter_duplicated_rows_list, table_city, 0, repeat=1)
+            assert old_result == new_result
+            measured_rows, measured_time = len(table_city), old_time
+            old_text = '{:.1f}'.format(old_time * 1000)
+        else:  # Estimation quadratique à partir de la dernière mesure
+            old_text = '~{:.0f}'.format(measured_time * (len(table_city) / measured_rows) ** 2 * 1000)
+
+        print('{:>10} {:>15} {:>15.1f} {:>22.1f}'.format(len(table_city), old_text, new_time * 1000,
+                                                         composite_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
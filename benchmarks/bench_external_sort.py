@@ -0,0 +1,77 @@
+"""
+Tri externe d'un fichier au format de villes.csv de 10 millions de lignes (ou du nombre donné en argument) par
+population puis par nom, lu ligne par ligne : temps et mémoire maximale du processus (RSS), qui reste bornée par la
+taille des morceaux au lieu de grandir avec le fichier.
+
+    python -m benchmarks.bench_external_sort [lignes] [lignes par morceau]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+from benchmarks.common import write_synthetic_city_file
+from external_sort import CHUNK_ROWS, external_sort, get_sort_key
+from tables import get_table_content
+
+try:
+    import resource
+except ImportError:  # Le module resource n'existe pas sous Windows
+    resource = None
+
+ROWS = 10_000_000
+
+SAMPLE_ROWS = 10_000
+
+
+def max_rss():
+    """
+    :return float | None: la mémoire maximale utilisée par le processus depuis son lancement en Mo, None si elle ne peut
+        pas être mesurée
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1_000_000 if sys.platform == 'darwin' else rss / 1000  # Octets sous macOS, Ko sous Linux
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else CHUNK_ROWS
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, 'villes_{}.csv'.format(rows))
+        start = time.perf_counter()
+        write_synthetic_city_file(file_name, rows)
+        print('{} lignes ({:.0f} Mo) écrites en {:.1f} s'
+              .format(rows, os.path.getsize(file_name) / 1_000_000, time.perf_counter() - start))
+
+        # Mémoire d'une table chargée en entier, estimée sur les premières lignes
+        tracemalloc.start()
+        sample = list(islice(get_table_content(file_name, lazy=True), SAMPLE_ROWS))
+        row_size = tracemalloc.get_traced_memory()[0] / len(sample)
+        tracemalloc.stop()
+        del sample
+        print('table en mémoire estimée : {:.0f} Mo'.format(row_size * rows / 1_000_000))
+
+        rss_before = max_rss()
+        start = time.perf_counter()
+        key = get_sort_key((4, 1), (4,))
+        count = 0
+        previous = None
+        for row in external_sort(get_table_content(file_name, lazy=True), (4, 1), numeric_columns=(4,),
+                                 chunk_size=chunk_size, directory=directory):
+            row_key = key(row)
+            assert previous is None or previous <= row_key
+            previous = row_key
+            count += 1
+        assert count == rows
+        print('tri externe ({} lignes par morceau) : {:.1f} s'.format(chunk_size, time.perf_counter() - start))
+        if rss_before is not None:
+            print('RSS maximale : {:.0f} Mo avant le tri, {:.0f} Mo après'.format(rss_before, max_rss()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Comparaison des deux façons de calculer la population minimale des villes de chaque pays (question 21) :
+un filter_table_by_value par code de pays, ou un seul passage avec summarize_column_by_group
+"""
+
+from benchmarks.common import best_time, scale_city_table
+from tables import filter_table_by_value, get_unique_values_on_column, summarize_column_by_group
+
+FACTORS = (1, 10, 50)
+
+
+def min_population_by_rescan(table_city):
+    """
+    Ancienne méthode : une recherche complète de la table pour chaque code de pays
+    :param list[tuple] table_city: la table des villes
+    :return dict[str, float]: la population minimale de chaque code de pays
+    """
+    return {
+        country_code: min([float(row[4]) for row in filter_table_by_value(table_city, 2, country_code)])
+        for country_code in get_unique_values_on_column(table_city, 2)
+    }
+
+
+def min_population_by_group(table_city):
+    """
+    Nouvelle méthode : un seul passage sur la table
+    :param list[tuple] table_city: la table des villes
+    :return dict[str, float]: la population minimale de chaque code de pays
+    """
+    return {
+        country_code: population['min']
+        for country_code, population in summarize_column_by_group(table_city, 2, 4).items()
+    }
+
+
+def main():
+    print('{:>8} {:>10} {:>14} {:>14} {:>9}'.format('facteur', 'lignes', 'rescan (ms)', 'group_by (ms)', 'gain'))
+    for factor in FACTORS:
+        table_city = scale_city_table(factor)
+        rescan_time, rescan_result = best_time(min_population_by_rescan, table_city, repeat=1)
+        group_time, group_result = best_time(min_population_by_group, table_city)
+        assert rescan_result == group_result
+        print('{:>8} {:>10} {:>14.1f} {:>14.1f} {:>8.1f}x'
+              .format(factor, len(table_city), rescan_time * 1000, group_time * 1000, rescan_time / group_time))
+
+
+if __name__ == '__main__':
+    main()
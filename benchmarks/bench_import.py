@@ -0,0 +1,44 @@
+"""
+Mesure du coût de démarrage : import du module tables, import de projet, et rapport complet.
+
+Avant la séparation en module, ``import projet`` exécutait tout le rapport : son coût était celui de la dernière
+ligne. Après, importer tables ou projet ne lit aucun fichier CSV.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = (
+    ('python à vide', 'pass'),
+    ('import tables', 'import tables'),
+    ('import projet', 'import projet'),
+    ('import projet + main() (ancien import)', 'import projet; projet.main()'),
+)
+
+
+def time_command(code, repeat=5):
+    """
+    Permet de mesurer le temps d'exécution d'un interpréteur python qui lance le code donné
+    :param str code: le code à exécuter
+    :param int repeat: le nombre de mesures, seule la meilleure est gardée
+    :return float: le meilleur temps en secondes
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIRECTORY, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    for title, code in CASES:
+        print('{:<42} {:8.1f} ms'.format(title, time_command(code) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Comparaison entre une relecture complète (get_table_content puis summarize_column_by_group) et TailTable.refresh
+quand des villes sont ajoutées à la fin d'une copie agrandie de villes.csv : population par pays (question 26) et
+population minimale par pays (question 21)
+"""
+
+import csv
+import tempfile
+import time
+
+from benchmarks.common import scale_city_table, write_table
+from incremental import TailTable
+from tables import get_table_content, summarize_column_by_group
+
+FACTOR = 100
+APPENDS = 5
+APPENDED_ROWS = (10, 1000, 10_000)
+
+
+def full_reload(file_name):
+    return summarize_column_by_group(get_table_content(file_name), 2, 4)
+
+
+def main():
+    table = scale_city_table(FACTOR)
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = write_table('{}/villes_x{}.csv'.format(directory, FACTOR), table)
+        tail_table = TailTable(file_name, keep_rows=False)
+        population_by_country = tail_table.add_aggregate(2, 4)
+        start = time.perf_counter()
+        tail_table.refresh()
+        print('{} lignes, première lecture : {:.1f} ms'.format(len(table), (time.perf_counter() - start) * 1000))
+
+        print('{:>16} {:>18} {:>14}'.format('lignes ajoutées', 'relecture totale', 'refresh'))
+        next_id = len(table) + 1
+        for appended_rows in APPENDED_ROWS:
+            reload_time = refresh_time = 0
+            for _ in range(APPENDS):
+                new_rows = [(str(next_id + index),) + row[1:] for index, row in enumerate(table[:appended_rows])]
+                next_id += appended_rows
+                with open(file_name, 'a', encoding='UTF-8', newline='') as file:
+                    csv.writer(file, delimiter=';', lineterminator='\n').writerows(new_rows)
+
+                start = time.perf_counter()
+                expected = full_reload(file_name)
+                reload_time += time.perf_counter() - start
+                start = time.perf_counter()
+                tail_table.refresh()
+                refresh_time += time.perf_counter() - start
+                assert population_by_country == expected
+
+            print('{:>16} {:>15.1f} ms {:>11.2f} ms'
+                  .format(appended_rows, reload_time / APPENDS * 1000, refresh_time / APPENDS * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Comparaison entre des filtres qui parcourent toute la table et des filtres qui utilisent les index d'une
+IndexedTable, pour des recherches répétées sur des copies agrandies de villes.csv et pays.csv : une recherche par code
+de pays, une par continent, et des comparaisons sur la population
+"""
+
+import time
+
+import tables
+from benchmarks.common import best_time, scale_city_table, scale_table
+from indexes import IndexedTable
+from tables import (
+    DEFAULT_INDEXES,
+    filter_table_by_comparator,
+    filter_table_by_list,
+    filter_table_by_value,
+    get_unique_values_on_column,
+)
+
+FACTORS = (1, 10, 100)
+
+POPULATION_THRESHOLDS = (10_000, 100_000, 1_000_000, 5_000_000)
+
+
+def lookups(table_city, table_country, country_codes, continents):
+    """
+    Permet de lancer les mêmes recherches que les questions du rapport, une fois par valeur
+    :return int: le nombre total de lignes trouvées
+    """
+    found = 0
+    for code in country_codes:
+        found += len(filter_table_by_value(table_city, 2, code))
+    for continent in continents:
+        continent_countries = filter_table_by_value(table_country, 2, continent)
+        found += len(filter_table_by_list(table_city, 2, get_unique_values_on_column(continent_countries, 0)))
+    for threshold in POPULATION_THRESHOLDS:
+        found += len(filter_table_by_comparator(table_city, 4, '>', threshold))
+        found += len(filter_table_by_comparator(table_country, 6, '<', threshold))
+    return found
+
+
+def main():
+    country_codes = get_unique_values_on_column(tables.table_country, 0)
+    continents = get_unique_values_on_column(tables.table_country, 2)
+    print('{} recherches par code, {} par continent, {} comparaisons'
+          .format(len(country_codes), len(continents), len(POPULATION_THRESHOLDS)))
+    print('{:>8} {:>10} {:>14} {:>14} {:>14}'.format('facteur', 'villes', 'parcours', 'construction', 'index'))
+    for factor in FACTORS:
+        city_table = scale_city_table(factor)
+        country_table = scale_table(list(tables.table_country), factor)
+        scan_time, scan_found = best_time(lookups, city_table, country_table, country_codes, continents, repeat=1)
+
+        indexed_city = IndexedTable(city_table, **DEFAULT_INDEXES['table_city'])
+        indexed_country = IndexedTable(country_table, **DEFAULT_INDEXES['table_country'])
+        start = time.perf_counter()  # Le premier passage construit les index
+        lookups(indexed_city, indexed_country, country_codes, continents)
+        build_time = time.perf_counter() - start
+        index_time, index_found = best_time(lookups, indexed_city, indexed_country, country_codes, continents)
+        assert scan_found == index_found
+
+        print('{:>8} {:>10} {:>11.1f} ms {:>11.1f} ms {:>11.1f} ms'
+              .format(factor, len(city_table), scan_time * 1000, build_time * 1000, index_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
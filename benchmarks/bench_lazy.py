@@ -0,0 +1,69 @@
+"""
+Mémoire maximale utilisée (mesurée avec tracemalloc) par la chaine de filtres de la question 11, en mode liste et en
+mode paresseux, sur des copies agrandies de villes.csv
+"""
+
+import tempfile
+import tracemalloc
+
+import tables
+from benchmarks.common import write_scaled_city_file
+from tables import count_rows, filter_table_by_comparator, filter_table_by_list, get_table_content
+
+FACTORS = (1, 10, 50)
+
+
+def question_11_count(file_name, spanish_country_codes, north_american_country_codes, lazy):
+    """
+    Compte les villes nord-américaines de plus de 100k habitants ou l'on parle espagnol
+    :param str file_name: l'emplacement du fichier des villes
+    :param set[str] spanish_country_codes: les codes des pays ou l'on parle espagnol
+    :param set[str] north_american_country_codes: les codes des pays d'Amérique du Nord
+    :param bool lazy: true pour utiliser le mode paresseux
+    :return int: le nombre de villes
+    """
+    return count_rows(
+        filter_table_by_list(
+            filter_table_by_list(
+                filter_table_by_comparator(get_table_content(file_name, lazy=lazy), 4, '>', 100_000, lazy=lazy),
+                2, spanish_country_codes, lazy=lazy
+            ), 2, north_american_country_codes, lazy=lazy
+        )
+    )
+
+
+def peak_memory(function, *args):
+    """
+    Permet de mesurer la mémoire maximale allouée pendant l'appel d'une fonction
+    :param function: la fonction à mesurer
+    :param args: les arguments de la fonction
+    :return tuple[int, any]: la mémoire maximale en octets et le résultat de la fonction
+    """
+    tracemalloc.start()
+    result = function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, result
+
+
+def main():
+    spanish_country_codes = {row[0] for row in tables.table_lang if row[1] == 'Spanish'}
+    north_american_country_codes = {row[0] for row in tables.table_country if row[2] == 'North America'}
+
+    print('{:>8} {:>10} {:>14} {:>16}'.format('facteur', 'villes', 'liste (Mo)', 'paresseux (Mo)'))
+    with tempfile.TemporaryDirectory() as directory:
+        for factor in FACTORS:
+            file_name = write_scaled_city_file(directory, factor)
+            eager_peak, eager_count = peak_memory(
+                question_11_count, file_name, spanish_country_codes, north_american_country_codes, False
+            )
+            lazy_peak, lazy_count = peak_memory(
+                question_11_count, file_name, spanish_country_codes, north_american_country_codes, True
+            )
+            assert eager_count == lazy_count
+            print('{:>8} {:>10} {:>14.2f} {:>16.2f}'
+                  .format(factor, eager_count, eager_peak / 1_000_000, lazy_peak / 1_000_000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Temps du rapport complet avec et sans le cache de résultats (module memo), sur les tables du projet et sur une table
+des villes agrandie. Le rapport est lancé deux fois avec le cache : le deuxième passage ne fait presque plus de calcul
+"""
+
+import contextlib
+import io
+import time
+
+import projet
+import tables
+from benchmarks.common import scale_city_table
+from indexes import IndexedTable
+from memo import results_cache
+
+FACTORS = (1, 20)
+
+
+def run_report():
+    """
+    :return float: le temps du rapport complet en secondes, sans son affichage
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        projet.main()
+    return time.perf_counter() - start
+
+
+def main():
+    print('{:>8} {:>10} {:>14} {:>14} {:>14} {:>16}'
+          .format('facteur', 'villes', 'sans cache', '1er passage', '2e passage', 'hits 1er+2e'))
+    for factor in FACTORS:
+        tables.get_default_table('table_city')
+        tables._loaded_tables['table_city'] = IndexedTable(
+            scale_city_table(factor), **tables.DEFAULT_INDEXES['table_city']
+        )
+
+        results_cache.enabled = False
+        run_report()  # Construit les index, pour ne mesurer ensuite que le cache
+        disabled_time = run_report()
+        results_cache.enabled = True
+        results_cache.clear()
+        first_time = run_report()
+        first_info = results_cache.cache_info()
+        second_time = run_report()
+        second_info = results_cache.cache_info()
+
+        print('{:>8} {:>10} {:>11.1f} ms {:>11.1f} ms {:>11.1f} ms {:>16}'
+              .format(factor, len(tables.table_city), disabled_time * 1000, first_time * 1000, second_time * 1000,
+                      '{}+{}'.format(first_info['hits'], second_info['hits'] - first_info['hits'])))
+        tables.reload_default_table('table_city')
+
+
+if __name__ == '__main__':
+    main()
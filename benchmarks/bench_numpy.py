@@ -0,0 +1,92 @@
+"""
+Comparaison du backend python pur et du backend NumPy des ColumnTable, sur des tables de villes et de pays d'environ
+un million de lignes, pour les questions 4, 12, 16 et 17.
+
+Les résultats des deux backends sont comparés : les nombres de lignes doivent être identiques, les sommes aussi à
+l'arrondi près (NumPy additionne les floats par paires, dans un ordre différent de la boucle python).
+"""
+
+import math
+
+import tables
+from benchmarks.common import best_time, scale_table
+from columnar import CITY_SCHEMA, COUNTRY_SCHEMA, ColumnTable, load_numpy
+from tables import filter_table_by_comparator, filter_table_by_list, filter_table_by_value, summarize_column
+
+ROWS = 1_000_000
+
+
+def question_4(table_city, europe_country_codes):
+    cities = filter_table_by_comparator(filter_table_by_list(table_city, 2, europe_country_codes), 4, '>', 100_000)
+    return {'rows': len(cities), 'population': summarize_column(cities, 4)}
+
+
+def question_12(table_country):
+    return summarize_column(filter_table_by_value(table_country, 2, 'Europe'), 4)
+
+
+def question_16(table_country):
+    return summarize_column(filter_table_by_value(table_country, 2, 'Asia'), 6)
+
+
+def question_17(table_city, asia_country_codes):
+    return summarize_column(filter_table_by_list(table_city, 2, asia_country_codes), 4)
+
+
+def same_result(python_result, numpy_result):
+    """
+    Permet de comparer les résultats des deux backends, les sommes étant comparées à l'arrondi près
+    :param dict python_result: le résultat du backend python
+    :param dict numpy_result: le résultat du backend NumPy
+    :return bool: true si les résultats sont identiques
+    """
+    if python_result.keys() != numpy_result.keys():
+        return False
+    for key, value in python_result.items():
+        if isinstance(value, dict):
+            if not same_result(value, numpy_result[key]):
+                return False
+        elif isinstance(value, float):
+            if not math.isclose(value, numpy_result[key], rel_tol=1e-12):
+                return False
+        elif value != numpy_result[key]:
+            return False
+    return True
+
+
+def main():
+    try:
+        load_numpy()
+    except ImportError:
+        print('NumPy n\'est pas installé, le backend NumPy ne peut pas être mesuré')
+        return
+
+    table_city = ColumnTable.from_rows(
+        scale_table(tables.table_city, ROWS // len(tables.table_city), 0), CITY_SCHEMA
+    )
+    table_country = ColumnTable.from_rows(
+        scale_table(tables.table_country, ROWS // len(tables.table_country)), COUNTRY_SCHEMA
+    )
+    europe_country_codes = {row[0] for row in tables.table_country if row[2] == 'Europe'}
+    asia_country_codes = {row[0] for row in tables.table_country if row[2] == 'Asia'}
+
+    cases = (
+        ('Question 4', question_4, (table_city, europe_country_codes)),
+        ('Question 12', question_12, (table_country,)),
+        ('Question 16', question_16, (table_country,)),
+        ('Question 17', question_17, (table_city, asia_country_codes)),
+    )
+
+    print('{} villes, {} pays'.format(len(table_city), len(table_country)))
+    print('{:<12} {:>12} {:>12} {:>8} {:>10}'.format('', 'python (ms)', 'numpy (ms)', 'gain', 'identique'))
+    for title, function, args in cases:
+        numpy_args = tuple(arg.to_numpy() if isinstance(arg, ColumnTable) else arg for arg in args)
+        python_time, python_result = best_time(function, *args)
+        numpy_time, numpy_result = best_time(function, *numpy_args)
+        print('{:<12} {:>12.1f} {:>12.1f} {:>7.1f}x {:>10}'
+              .format(title, python_time * 1000, numpy_time * 1000, python_time / numpy_time,
+                      'oui' if same_result(python_result, numpy_result) else 'NON'))
+
+
+if __name__ == '__main__':
+    main()
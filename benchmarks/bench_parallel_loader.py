@@ -0,0 +1,54 @@
+"""
+Débit de get_tables_content selon le nombre de processus, sur un gros fichier (découpé en morceaux) et sur plusieurs
+fichiers plus petits, comparé à get_table_content
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import scale_city_table, write_table
+from loader import get_tables_content
+from tables import get_table_content
+
+FACTOR = 200
+SHARDS = 8
+CHUNK_SIZE = 1024 * 1024
+
+
+def elapsed(function, *args, **kwargs):
+    """
+    :return tuple[float, any]: le temps d'exécution d'un seul appel en secondes, et son résultat
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    workers_list = sorted({1, 2, 4, os.cpu_count() or 1})
+    table_city = scale_city_table(FACTOR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        big_file_name = write_table(os.path.join(directory, 'villes.csv'), table_city)
+        shard_size = len(table_city) // SHARDS + 1
+        for shard in range(SHARDS):
+            write_table(os.path.join(directory, 'villes_{:02}.csv'.format(shard)),
+                        table_city[shard * shard_size:(shard + 1) * shard_size])
+
+        reference_time, reference = elapsed(get_table_content, big_file_name)
+        print('{} lignes, {} processeurs'.format(len(reference), os.cpu_count()))
+        print('get_table_content : {:.0f} lignes/s'.format(len(reference) / reference_time))
+        print('{:>10} {:>20} {:>20}'.format('processus', '1 fichier (l/s)', '{} fichiers (l/s)'.format(SHARDS)))
+        for workers in workers_list:
+            big_time, big_table = elapsed(get_tables_content, big_file_name, workers, CHUNK_SIZE)
+            shards_time, shards_table = elapsed(
+                get_tables_content, os.path.join(directory, 'villes_*.csv'), workers, CHUNK_SIZE
+            )
+            assert big_table == shards_table == reference
+            print('{:>10} {:>20.0f} {:>20.0f}'
+                  .format(workers, len(reference) / big_time, len(reference) / shards_time))
+
+
+if __name__ == '__main__':
+    main()
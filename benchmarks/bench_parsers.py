@@ -0,0 +1,37 @@
+"""
+Débit des moteurs de lecture de get_table_content (module parsers) sur des copies agrandies de villes.csv, en lignes
+par seconde, et vérification que les trois moteurs renvoient exactement la même table
+"""
+
+import tempfile
+
+from benchmarks.common import best_time, write_scaled_city_file
+from parsers import PARSE_ENGINES
+from tables import get_table_content
+
+FACTORS = (1, 10, 100)
+
+
+def main():
+    print('{:>8} {:>10}'.format('facteur', 'lignes') + ''.join('{:>16}'.format(engine) for engine in PARSE_ENGINES)
+          + '{:>10}'.format('gain'))
+    with tempfile.TemporaryDirectory() as directory:
+        for factor in FACTORS:
+            file_name = write_scaled_city_file(directory, factor)
+            speeds = list()
+            reference = None
+            for engine in PARSE_ENGINES:
+                elapsed, table = best_time(get_table_content, file_name, False, False, None, engine)
+                if reference is None:
+                    reference = table
+                assert table == reference, 'Different tables with engines csv and ' + engine
+                speeds.append(len(table) / elapsed)
+            rows = len(reference)
+            del reference, table
+            print('{:>8} {:>10}'.format(factor, rows)
+                  + ''.join('{:>10.0f} l/s'.format(speed) for speed in speeds)
+                  + '{:>9.1f}x'.format(max(speeds) / speeds[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Coût de la mesure (module profiling) sur les filtres de tables : mesure désactivée, activée, et activée avec la
+mémoire (tracemalloc), sur une copie agrandie de villes.csv
+"""
+
+import profiling
+from benchmarks.common import best_time, scale_city_table
+from tables import filter_table_by_comparator, filter_table_by_value, get_unique_values_on_column
+
+FACTOR = 10
+CALLS = 200
+
+
+def run_filters(table):
+    for _ in range(CALLS):
+        big_cities = filter_table_by_comparator(table, 4, '>', 1_000_000)
+        get_unique_values_on_column(filter_table_by_value(big_cities, 2, 'FRA'), 2)
+
+
+def main():
+    table = scale_city_table(FACTOR)  # Une liste : le cache de résultats n'est pas utilisé
+    print('{} lignes, {} répétitions de 3 appels'.format(len(table), CALLS))
+
+    disabled_time, _ = best_time(run_filters, table)
+    profiling.enable()
+    enabled_time, _ = best_time(run_filters, table)
+    profiling.disable()
+    profiling.enable(memory=True)
+    memory_time, _ = best_time(run_filters, table)
+    profiling.disable()
+
+    print('{:<24} {:>10.1f} ms'.format('mesure désactivée', disabled_time * 1000))
+    print('{:<24} {:>10.1f} ms  x{:.2f}'.format('mesure activée', enabled_time * 1000, enabled_time / disabled_time))
+    print('{:<24} {:>10.1f} ms  x{:.2f}'.format('avec la mémoire', memory_time * 1000, memory_time / disabled_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Projection des colones : mémoire et temps de lecture de copies de pays.csv et villes.csv agrandies 100 fois, avec
+toutes les colones et avec seulement celles utiles (get_table_content(..., columns=...)), puis ancien et nouveau
+filter_table_columns sur la table chargée
+"""
+
+import os
+import tempfile
+import tracemalloc
+
+import tables
+from benchmarks.common import best_time, scale_city_table, scale_table, write_table
+from tables import filter_table_columns, get_table_content
+
+FACTOR = 100
+
+# Fichier, table agrandie et colones gardées
+CASES = (
+    ('pays', lambda: scale_table(list(tables.table_country), FACTOR), (0, 2, 6)),
+    ('villes', lambda: scale_city_table(FACTOR), (2, 4)),
+)
+
+
+def filter_table_columns_before(table, *columns):
+    """
+    filter_table_columns avant son optimisation : un test dans un tuple par case, et des listes au lieu de tuples
+    """
+    new_table = []
+    for index, row in enumerate(table):
+        new_table.append([cell for cell_index, cell in enumerate(row) if cell_index in columns])
+    return new_table
+
+
+def loaded_memory(function, *args, **kwargs):
+    """
+    :return int: la mémoire encore occupée par le résultat de la fonction après son appel, en octets
+    """
+    tracemalloc.start()
+    result = function(*args, **kwargs)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    print('{:>8} {:>10} {:>10} {:>12} {:>12} {:>12} {:>12} {:>14} {:>14}'
+          .format('fichier', 'lignes', 'colones', 'tout (Mo)', 'projeté (Mo)', 'tout', 'projeté',
+                  'filtre avant', 'filtre après'))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, scaled_table, columns in CASES:
+            table = scaled_table()
+            file_name = write_table(os.path.join(directory, '{}_x{}.csv'.format(name, FACTOR)), table)
+            del table
+
+            full_memory = loaded_memory(get_table_content, file_name)
+            projected_memory = loaded_memory(get_table_content, file_name, columns=columns)
+            full_time, full_table = best_time(get_table_content, file_name)
+            projected_time, projected_table = best_time(lambda: get_table_content(file_name, columns=columns))
+
+            before_time, before = best_time(filter_table_columns_before, full_table, *columns)
+            after_time, after = best_time(filter_table_columns, full_table, *columns)
+            assert after == projected_table == [tuple(row) for row in before]
+
+            print('{:>8} {:>10} {:>10} {:>12.1f} {:>12.1f} {:>9.0f} ms {:>9.0f} ms {:>11.0f} ms {:>11.0f} ms'
+                  .format(name, len(full_table), '{}/{}'.format(len(columns), len(full_table[0])),
+                          full_memory / 1_000_000, projected_memory / 1_000_000, full_time * 1000,
+                          projected_time * 1000, before_time * 1000, after_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
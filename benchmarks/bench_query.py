@@ -0,0 +1,103 @@
+"""
+Comparaison entre les filtres imbriqués (une liste intermédiaire par filtre, dans l'ordre d'écriture) et une Query
+(un seul passage, prédicats réordonnés), pour les questions 11 et 28 sur des copies agrandies des tables. La colone
+"Q11 index" mesure la même Query sur une IndexedTable avec les index par défaut des villes (déjà construits), sans le
+cache de résultats
+"""
+
+import tables
+from benchmarks.common import best_time, scale_city_table, scale_table
+from indexes import IndexedTable
+from memo import results_cache
+from query import Query
+from tables import (
+    filter_table_by_comparator,
+    filter_table_by_list,
+    filter_table_by_value,
+    get_unique_values_on_column,
+)
+
+FACTORS = (1, 10, 100)
+
+
+def question_11_nested(table_city, spanish_codes, north_american_codes):
+    return filter_table_by_list(
+        filter_table_by_list(
+            filter_table_by_comparator(table_city, 4, '>', 100_000), 2, spanish_codes
+        ), 2, north_american_codes
+    )
+
+
+def question_11_query(table_city, spanish_codes, north_american_codes):
+    return Query(table_city).where_gt(4, 100_000).where_in(2, spanish_codes).where_in(2, north_american_codes).all()
+
+
+def question_28_nested(table_country, more_3_langs_codes, french_codes, life_expectancy):
+    return filter_table_by_comparator(
+        filter_table_by_list(
+            filter_table_by_list(table_country, 0, more_3_langs_codes), 0, french_codes
+        ), 7, '>', life_expectancy
+    )
+
+
+def question_28_query(table_country, more_3_langs_codes, french_codes, life_expectancy):
+    return (Query(table_country).where_in(0, more_3_langs_codes).where_in(0, french_codes)
+            .where_gt(7, life_expectancy).all())
+
+
+def main():
+    table_lang = tables.table_lang
+    table_country = tables.table_country
+    spanish_codes = get_unique_values_on_column(filter_table_by_value(table_lang, 1, 'Spanish'), 0)
+    north_american_codes = get_unique_values_on_column(filter_table_by_value(table_country, 2, 'North America'), 0)
+
+    # Arguments de la question 28, calculés comme dans projet.py
+    lang_counts = dict()
+    for row in table_lang:
+        lang_counts[row[0]] = lang_counts.get(row[0], 0) + 1
+    more_3_langs_codes = [code for code, count in lang_counts.items() if count >= 3]
+    french_codes = get_unique_values_on_column(
+        filter_table_by_value(filter_table_by_value(table_lang, 1, 'French'), 2, 'T'), 0
+    )
+    south_america = filter_table_by_value(table_country, 3, 'South America')
+    life_expectancy = tables.summarize_column(south_america, 7)
+    life_expectancy = life_expectancy['sum'] / life_expectancy['count']
+
+    print('{:>8} {:>10} {:>14} {:>14} {:>14} {:>10} {:>14} {:>14}'
+          .format('facteur', 'villes', 'Q11 imbriqué', 'Q11 Query', 'Q11 index', 'pays', 'Q28 imbriqué', 'Q28 Query'))
+    for factor in FACTORS:
+        city_table = scale_city_table(factor)
+        country_table = scale_table(table_country, factor)
+
+        q11_args = (city_table, spanish_codes, north_american_codes)
+        nested_11_time, nested_11 = best_time(question_11_nested, *q11_args)
+        query_11_time, query_11 = best_time(question_11_query, *q11_args)
+        assert nested_11 == query_11
+
+        indexed_table = IndexedTable(city_table, **tables.DEFAULT_INDEXES['table_city'])
+        results_cache.enabled = False
+        try:
+            question_11_query(indexed_table, *q11_args[1:])  # Construit les index
+            indexed_11_time, indexed_11 = best_time(question_11_query, indexed_table, *q11_args[1:])
+        finally:
+            results_cache.enabled = True
+        assert indexed_11 == query_11
+
+        q28_args = (country_table, more_3_langs_codes, french_codes, life_expectancy)
+        nested_28_time, nested_28 = best_time(question_28_nested, *q28_args)
+        query_28_time, query_28 = best_time(question_28_query, *q28_args)
+        assert nested_28 == query_28
+
+        print('{:>8} {:>10} {:>11.1f} ms {:>11.1f} ms {:>11.1f} ms {:>10} {:>11.1f} ms {:>11.1f} ms'
+              .format(factor, len(city_table), nested_11_time * 1000, query_11_time * 1000, indexed_11_time * 1000,
+                      len(country_table), nested_28_time * 1000, query_28_time * 1000))
+
+    print()
+    print(Query(city_table).where_gt(4, 100_000).where_in(2, spanish_codes).where_in(2, north_american_codes)
+          .explain())
+    print(Query(country_table).where_in(0, more_3_langs_codes).where_in(0, french_codes)
+          .where_gt(7, life_expectancy).explain())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Micro-benchmarks des questions 1, 3, 10 et 12 : re.match appelé avec l'expression brute à chaque ligne (ancienne
+méthode) contre les expressions en cache et les raccourcis de get_regex_matcher et is_number
+"""
+
+import re
+
+import tables
+from benchmarks.common import best_time, scale_table
+from tables import filter_table_by_regex, filter_table_by_value, summarize_column
+
+FACTOR = 50
+
+
+def filter_table_by_regex_raw(table, column_index, regex):
+    """
+    Ancienne version de filter_table_by_regex
+    """
+    return [row for row in table if re.match(regex, row[column_index], flags=re.IGNORECASE)]
+
+
+def summarize_column_raw(table, column_index):
+    """
+    Ancienne version de summarize_column
+    """
+    total = float()
+    matches = 0
+    for row in table:
+        if re.match('^\\d+(\\.\\d+)?$', row[column_index]):
+            total += float(row[column_index])
+            matches += 1
+    return {'sum': total, 'count': matches}
+
+
+def main():
+    table_city = scale_table(tables.table_city, FACTOR, 0)
+    table_country = scale_table(tables.table_country, FACTOR)
+    europe_country_codes = {row[0] for row in tables.table_country if row[2] == 'Europe'}
+    europe_cities = [row for row in table_city if row[2] in europe_country_codes]
+    europe_countries = filter_table_by_value(table_country, 2, 'Europe')
+
+    cases = (
+        ('Question 1', filter_table_by_regex_raw, filter_table_by_regex, (table_city, 1, '^pa')),
+        ('Question 3', filter_table_by_regex_raw, filter_table_by_regex, (europe_cities, 1, '^pa')),
+        ('Question 10', filter_table_by_regex_raw, filter_table_by_regex, (table_country, 11, '.*Republic.*')),
+        ('Question 12', summarize_column_raw, summarize_column, (europe_countries, 4)),
+    )
+
+    print('{} villes, {} pays'.format(len(table_city), len(table_country)))
+    print('{:<12} {:>13} {:>13} {:>8}'.format('', 'avant (ms)', 'après (ms)', 'gain'))
+    for title, old_function, new_function, args in cases:
+        old_time, old_result = best_time(old_function, *args)
+        new_time, new_result = best_time(new_function, *args)
+        assert old_result == new_result
+        print('{:<12} {:>13.2f} {:>13.2f} {:>7.1f}x'.format(title, old_time * 1000, new_time * 1000, old_time / new_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Rapport complet exécuté question par question dans le processus principal, puis avec run_tasks (python projet.py
+--jobs n) pour plusieurs nombres de processus, sur des fichiers agrandis (benchmarks.dataset). Le temps avec n
+processus ne peut pas être meilleur que celui de la question la plus longue, ni que le temps total divisé par le nombre
+de processeurs
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+import projet
+import tables
+from benchmarks.common import best_time
+from benchmarks.dataset import generate_dataset
+from memo import results_cache
+
+FACTORS = (1, 10, 50)
+
+
+def run_report(jobs):
+    """
+    Permet de lancer le rapport complet sans l'afficher, en relisant les tables
+    :param int jobs: None pour exécuter les questions l'une après l'autre, ou le nombre de processus
+    :return str: le rapport
+    """
+    tables._loaded_tables.clear()
+    results_cache.clear()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        projet.main(jobs=jobs)
+    return output.getvalue()
+
+
+def main():
+    jobs_list = sorted({1, 2, 4, os.cpu_count() or 1})
+    print('{} processeurs'.format(os.cpu_count()))
+    print('{:>8} {:>10} {:>14}'.format('facteur', 'villes', 'séquentiel')
+          + ''.join('{:>17}'.format('{} processus'.format(jobs)) for jobs in jobs_list))
+    data_directory = tables.DATA_DIRECTORY
+    try:
+        for factor in FACTORS:
+            with tempfile.TemporaryDirectory() as directory:
+                generate_dataset(directory, factor)
+                tables.DATA_DIRECTORY = directory
+                run_report(None)  # Non mesuré : compile les expressions régulières
+                sequential_time, reference = best_time(run_report, None)
+                cells = list()
+                for jobs in jobs_list:
+                    jobs_time, report = best_time(run_report, jobs)
+                    assert report == reference
+                    cells.append('{:>8.1f} ms {:>4.1f}x'.format(jobs_time * 1000, sequential_time / jobs_time))
+                print('{:>8} {:>10} {:>11.1f} ms'.format(factor, len(tables.table_city), sequential_time * 1000)
+                      + ''.join(cells))
+    finally:
+        tables.DATA_DIRECTORY = data_directory
+        tables._loaded_tables.clear()
+        results_cache.clear()
+
+
+if __name__ == '__main__':
+    main()
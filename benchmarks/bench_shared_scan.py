@@ -0,0 +1,108 @@
+"""
+Rapport complet en mode habituel (chaque question parcourt les villes, ou utilise un index) et en mode --shared-scan
+(les filtres et résumés des villes sont calculés en un seul passage et donnés aux questions, voir shared_scan), sur des
+fichiers agrandis (benchmarks.dataset). Les deux modes sont mesurés avec les index par défaut sur les villes, puis
+sans index sur les villes, comme pour un fichier trop grand pour être indexé : chaque question fait alors un passage
+complet. Les tables sont lues avant les mesures : la lecture des fichiers est la même dans les deux modes.
+
+Enfin, les mêmes appels (projet.get_city_scan) sont faits directement sur le fichier des villes lu en flux
+(get_table_content(..., lazy=True)), sans le charger : un passage sur le fichier par appel, ou un seul passage pour
+tous les appels
+"""
+
+import contextlib
+import io
+import tempfile
+
+import projet
+import tables
+from benchmarks.common import best_time
+from benchmarks.dataset import generate_dataset
+from bitsets import CodeDictionary
+from memo import results_cache
+
+FACTORS = (1, 10, 50)
+
+NO_INDEXES = {'hash_columns': (), 'sorted_columns': ()}
+
+
+def load_tables():
+    """
+    Permet de relire les tables par défaut, par exemple après un changement de DEFAULT_INDEXES
+    """
+    tables._loaded_tables.clear()
+    for name in tables.DEFAULT_TABLES:
+        tables.get_default_table(name)
+
+
+def run_report(shared_scan):
+    """
+    Permet de lancer le rapport complet sans l'afficher, sans les résultats déjà calculés
+    :param bool shared_scan: true pour le mode --shared-scan
+    """
+    results_cache.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        projet.main(shared_scan=shared_scan)
+
+
+def run_per_query(scan, file_name):
+    """
+    :return list: le résultat de chaque appel du SharedScan, avec un passage sur le fichier par appel
+    """
+    return [function(tables.get_table_content(file_name, lazy=True), *args) for function, args in scan.calls]
+
+
+def run_shared(scan, file_name):
+    """
+    :return list: le résultat de chaque appel du SharedScan, avec un seul passage sur le fichier
+    """
+    return scan.run(tables.get_table_content(file_name, lazy=True))
+
+
+def compare_streaming(file_name):
+    """
+    :param str file_name: le fichier des villes
+    :return tuple[int, float, float]: le nombre d'appels, le temps avec un passage par appel, et avec un seul passage
+    """
+    country_codes = CodeDictionary.from_table(tables.table_country)
+    scan, _ = projet.get_city_scan(tables.table_lang, tables.table_country, country_codes)
+    per_query_time, per_query_results = best_time(run_per_query, scan, file_name)
+    shared_time, shared_results = best_time(run_shared, scan, file_name)
+    assert per_query_results == shared_results
+    return len(scan), per_query_time, shared_time
+
+
+def main():
+    print('{:>8} {:>10} {:>12} {:>14} {:>14} {:>8}'
+          .format('facteur', 'villes', 'index', 'par question', 'shared scan', 'gain'))
+    data_directory = tables.DATA_DIRECTORY
+    city_indexes = tables.DEFAULT_INDEXES['table_city']
+    try:
+        for factor in FACTORS:
+            with tempfile.TemporaryDirectory() as directory:
+                generate_dataset(directory, factor)
+                tables.DATA_DIRECTORY = directory
+                for indexes in (city_indexes, NO_INDEXES):
+                    tables.DEFAULT_INDEXES['table_city'] = indexes
+                    load_tables()
+                    run_report(False)  # Non mesuré : compile les expressions régulières
+                    per_query_time, _ = best_time(run_report, False)
+                    shared_time, _ = best_time(run_report, True)
+                    print('{:>8} {:>10} {:>12} {:>11.1f} ms {:>11.1f} ms {:>7.1f}x'
+                          .format(factor, len(tables.table_city), 'oui' if indexes is city_indexes else 'non',
+                                  per_query_time * 1000, shared_time * 1000, per_query_time / shared_time))
+                calls, per_query_time, shared_time = compare_streaming(
+                    '{}/{}'.format(directory, tables.DEFAULT_TABLES['table_city'])
+                )
+                print('{:>8} {:>10} {:>12} {:>11.1f} ms {:>11.1f} ms {:>7.1f}x'
+                      .format(factor, len(tables.table_city), '{} en flux'.format(calls),
+                              per_query_time * 1000, shared_time * 1000, per_query_time / shared_time))
+    finally:
+        tables.DATA_DIRECTORY = data_directory
+        tables.DEFAULT_INDEXES['table_city'] = city_indexes
+        tables._loaded_tables.clear()
+        results_cache.clear()
+
+
+if __name__ == '__main__':
+    main()
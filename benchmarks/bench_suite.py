@@ -0,0 +1,200 @@
+"""
+Suite de benchmarks du rapport complet : pour chaque facteur, les trois fichiers du projet sont agrandis avec
+benchmarks.dataset, puis le rapport est lancé plusieurs fois avec la mesure activée (module profiling). Pour chaque
+facteur sont gardés le meilleur temps de chaque question et le meilleur temps total des fonctions filter_table_*,
+summarize_column* et display_table.
+
+Les résultats sont écrits en JSON (--output), et comparés à une référence enregistrée avec --save-baseline : une
+mesure est une régression si elle est plus lente que la référence de plus de REGRESSION_THRESHOLD, et d'au moins
+MIN_DIFFERENCE secondes (les mesures plus courtes sont trop bruitées). La commande se termine avec le code 1 s'il y a
+des régressions. Les temps dépendent de la machine : la référence doit être enregistrée sur la machine qui compare.
+
+    python -m benchmarks.bench_suite [--factors 1 10 50] [--repeat 3] [--output resultats.json]
+                                     [--baseline reference.json] [--save-baseline]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+
+import profiling
+import projet
+import tables
+from benchmarks.dataset import generate_dataset
+from memo import results_cache
+
+FACTORS = (1, 10, 50)
+REPEAT = 3
+
+# Fonctions de tables dont le temps est gardé (début du nom)
+FUNCTION_PREFIXES = ('filter_table_', 'summarize_column', 'display_table')
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Une mesure plus lente de 25% que la référence est une régression
+REGRESSION_THRESHOLD = 0.25
+
+# Différence minimale avec la référence, en secondes, pour signaler une régression
+MIN_DIFFERENCE = 0.002
+
+
+def run_report():
+    """
+    Permet de lancer le rapport complet sur les fichiers de tables.DATA_DIRECTORY, en relisant les tables, sans le
+    ramasse-miettes
+    :return dict: les mesures de profiling.get_report
+    """
+    tables._loaded_tables.clear()
+    tables._loaded_column_tables.clear()
+    results_cache.clear()
+    gc.collect()
+    gc.disable()  # Comme timeit : les pauses du ramasse-miettes rendent les mesures moins stables
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            projet.main(profile='')
+    finally:
+        gc.enable()
+    return profiling.get_report()
+
+
+def summarize_runs(reports):
+    """
+    Permet de garder le meilleur temps de chaque question et de chaque fonction sur plusieurs lancements du rapport
+    :param list[dict] reports: les mesures de chaque lancement
+    :return dict: les temps des questions et des fonctions, en secondes
+    """
+    questions = dict()
+    functions = dict()
+    for report in reports:
+        totals = dict()
+        for section in report['sections']:
+            questions[section['name']] = min(questions.get(section['name'], float('inf')), section['wall'])
+            for name, stats in section['functions'].items():
+                if name.startswith(FUNCTION_PREFIXES):
+                    calls, wall = totals.get(name, (0, 0.0))
+                    totals[name] = (calls + stats['calls'], wall + stats['wall'])
+        for name, (calls, wall) in totals.items():
+            if name not in functions or wall < functions[name]['wall']:
+                functions[name] = {'calls': calls, 'wall': wall}
+    questions['Total'] = min(sum(section['wall'] for section in report['sections']) for report in reports)
+    return {'questions': questions, 'functions': functions}
+
+
+def run_suite(factors=FACTORS, repeat=REPEAT):
+    """
+    Permet de mesurer le rapport complet pour chaque facteur
+    :param tuple[int] factors: les facteurs d'agrandissement des fichiers du projet
+    :param int repeat: le nombre de lancements du rapport pour chaque facteur, seul le meilleur temps est gardé
+    :return dict: les résultats, prêts à être écrits en JSON
+    """
+    results = {'python': platform.python_version(), 'machine': platform.machine(), 'repeat': repeat,
+               'factors': dict()}
+    data_directory = tables.DATA_DIRECTORY
+    try:
+        for factor in factors:
+            with tempfile.TemporaryDirectory() as directory:
+                generate_dataset(directory, factor)
+                tables.DATA_DIRECTORY = directory
+                run_report()  # Non mesuré : compile les expressions régulières
+                reports = [run_report() for _ in range(repeat)]
+                result = summarize_runs(reports)
+                result['rows'] = {name: len(tables.get_default_table(name)) for name in tables.DEFAULT_TABLES}
+                results['factors'][str(factor)] = result
+                print('facteur {:>4} : {:>8} villes, rapport en {:.1f} ms'
+                      .format(factor, result['rows']['table_city'], result['questions']['Total'] * 1000))
+    finally:
+        tables.DATA_DIRECTORY = data_directory
+        tables._loaded_tables.clear()
+        tables._loaded_column_tables.clear()
+        results_cache.clear()
+    return results
+
+
+def compare(results, baseline):
+    """
+    Permet de comparer des résultats à la référence, pour les facteurs et les mesures présents dans les deux
+    :param dict results: les résultats de run_suite
+    :param dict baseline: les résultats de référence
+    :return list[tuple]: les régressions (facteur, mesure, temps de référence, temps mesuré)
+    """
+    regressions = list()
+    for factor, result in results['factors'].items():
+        reference = baseline['factors'].get(factor)
+        if reference is None:
+            continue
+        pairs = [(name, wall, reference['questions'].get(name)) for name, wall in result['questions'].items()]
+        pairs.extend(
+            (name, stats['wall'], reference['functions'][name]['wall'] if name in reference['functions'] else None)
+            for name, stats in result['functions'].items()
+        )
+        for name, wall, reference_wall in pairs:
+            if reference_wall is not None and wall > reference_wall * (1 + REGRESSION_THRESHOLD) \
+                    and wall - reference_wall >= MIN_DIFFERENCE:
+                regressions.append((factor, name, reference_wall, wall))
+    return regressions
+
+
+def print_results(results):
+    """
+    Permet d'afficher le temps de chaque question et de chaque fonction, une colone par facteur
+    :param dict results: les résultats de run_suite
+    """
+    factors = list(results['factors'])
+    header = '{:<28}'.format('') + ''.join('{:>14}'.format('x' + factor) for factor in factors)
+    print_list = [header]
+    for kind in ('questions', 'functions'):
+        names = list(dict.fromkeys(name for factor in factors for name in results['factors'][factor][kind]))
+        for name in names:
+            cells = list()
+            for factor in factors:
+                value = results['factors'][factor][kind].get(name)
+                if isinstance(value, dict):
+                    value = value['wall']
+                cells.append('{:>11.2f} ms'.format(value * 1000) if value is not None else '{:>14}'.format('-'))
+            print_list.append('{:<28}'.format(name) + ''.join(cells))
+        print_list.append('')
+    print(*print_list, sep='\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Temps du rapport complet sur des fichiers agrandis')
+    parser.add_argument('--factors', type=int, nargs='+', default=FACTORS, metavar='FACTEUR')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--output', metavar='FICHIER.json', help='écrit les résultats dans un fichier JSON')
+    parser.add_argument('--baseline', default=BASELINE_FILE, metavar='FICHIER.json',
+                        help='la référence à laquelle les résultats sont comparés')
+    parser.add_argument('--save-baseline', action='store_true', help='enregistre les résultats comme référence')
+    arguments = parser.parse_args()
+
+    results = run_suite(arguments.factors, arguments.repeat)
+    print()
+    print_results(results)
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='UTF-8') as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+
+    if arguments.save_baseline:
+        with open(arguments.baseline, 'w', encoding='UTF-8') as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+        print('Référence enregistrée dans', arguments.baseline)
+    elif os.path.exists(arguments.baseline):
+        with open(arguments.baseline, encoding='UTF-8') as file:
+            regressions = compare(results, json.load(file))
+        for factor, name, reference_wall, wall in regressions:
+            print('REGRESSION x{:<4} {:<28} {:>9.2f} ms -> {:>9.2f} ms ({:+.0%})'
+                  .format(factor, name, reference_wall * 1000, wall * 1000, wall / reference_wall - 1))
+        print('{} régression(s) par rapport à {}'.format(len(regressions), arguments.baseline))
+        if regressions:
+            sys.exit(1)
+    else:
+        print('Pas de référence ({}), utiliser --save-baseline pour en enregistrer une'.format(arguments.baseline))
+
+
+if __name__ == '__main__':
+    main()
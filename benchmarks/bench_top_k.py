@@ -0,0 +1,55 @@
+"""
+Comparaison entre un tri complet (order_table_by_column puis [:k]) et top_k pour obtenir les 10 villes les moins
+peuplées, sur des copies agrandies de villes.csv, puis en mode paresseux sur le fichier : mémoire maximale utilisée
+"""
+
+import tempfile
+import tracemalloc
+
+from benchmarks.common import best_time, scale_city_table, write_table
+from tables import convert_column_to_float, get_table_content, order_table_by_column, top_k
+
+FACTORS = (1, 10, 100)
+K = 10
+
+
+def sorted_smallest(table):
+    return order_table_by_column(convert_column_to_float(table, 4), 4)[:K]
+
+
+def peak_memory(function, *args):
+    """
+    :return tuple[int, any]: la mémoire maximale utilisée pendant l'appel, en octets, et le résultat de la fonction
+    """
+    tracemalloc.start()
+    result = function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, result
+
+
+def main():
+    print('{:>8} {:>10} {:>14} {:>14} {:>16} {:>16}'
+          .format('facteur', 'lignes', 'tri complet', 'top_k', 'fichier (Mo)', 'top_k flux (Mo)'))
+    with tempfile.TemporaryDirectory() as directory:
+        for factor in FACTORS:
+            table = scale_city_table(factor)
+            file_name = write_table('{}/villes_x{}.csv'.format(directory, factor), table)
+            sorted_time, sorted_rows = best_time(sorted_smallest, table)
+            top_k_time, top_k_rows = best_time(lambda: top_k(table, 4, K, numeric=True))
+            assert [row[0] for row in sorted_rows] == [row[0] for row in top_k_rows]
+
+            # Table chargée puis top_k, et top_k directement sur le fichier lu ligne par ligne
+            loaded_peak, _ = peak_memory(lambda: top_k(get_table_content(file_name), 4, K, numeric=True))
+            stream_peak, stream_rows = peak_memory(
+                lambda: top_k(get_table_content(file_name, lazy=True), 4, K, numeric=True)
+            )
+            assert stream_rows == top_k_rows
+
+            print('{:>8} {:>10} {:>11.1f} ms {:>11.1f} ms {:>16.2f} {:>16.2f}'
+                  .format(factor, len(table), sorted_time * 1000, top_k_time * 1000,
+                          loaded_peak / 1_000_000, stream_peak / 1_000_000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Fonctions partagées par les benchmarks : mesure du temps et copies agrandies des tables du projet
+"""
+
+import csv
+import os
+import random
+import time
+
+import tables
+
+
+def best_time(function, *args, repeat=3):
+    """
+    Permet de mesurer le temps d'exécution d'une fonction
+    :param function: la fonction à mesurer
+    :param args: les arguments de la fonction
+    :param int repeat: le nombre de mesures, seule la meilleure est gardée
+    :return tuple[float, any]: le meilleur temps en secondes et le résultat du dernier appel
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def scale_table(table, factor, id_column=None):
+    """
+    Permet d'obtenir une copie agrandie d'une table : chaque ligne est répétée factor fois. Si id_column est donné,
+    cette colone est renumérotée pour que chaque copie ait de nouveaux identifiants
+    :param list[tuple] table: la table source
+    :param int factor: le nombre de copies de la table
+    :param int id_column: l'index de la colone d'identifiants numériques, None pour ne rien renuméroter
+    :return list[tuple]: la table agrandie
+    """
+    if id_column is None:
+        return table * factor
+    new_table = list()
+    for copy in range(factor):
+        offset = copy * len(table)
+        for row in table:
+            new_table.append(row[:id_column] + (str(int(row[id_column]) + offset),) + row[id_column + 1:])
+    return new_table
+
+
+def scale_city_table(factor):
+    """
+    Permet d'obtenir une copie de villes.csv agrandie : chaque ville est répétée factor fois avec un nouvel identifiant,
+    les codes de pays et les populations sont gardés
+    :param int factor: le nombre de copies de la table
+    :return list[tuple]: la table agrandie
+    """
+    return scale_table(tables.table_city, factor, 0)
+
+
+def write_table(file_name, table):
+    """
+    Permet d'écrire une table dans un fichier CSV au même format que ceux du projet
+    :param str file_name: l'emplacement du fichier
+    :param list[tuple] table: la table à écrire
+    :return str: l'emplacement du fichier
+    """
+    with open(file_name, 'w', encoding='UTF-8', newline='') as file:
+        csv.writer(file, delimiter=';', lineterminator='\n').writerows(table)
+    return file_name
+
+
+def write_scaled_city_file(directory, factor):
+    """
+    Permet d'écrire dans un dossier une copie de villes.csv agrandie avec scale_city_table
+    :param str directory: le dossier de destination
+    :param int factor: le nombre de copies de la table
+    :return str: l'emplacement du fichier écrit
+    """
+    return write_table(os.path.join(directory, 'villes_x{}.csv'.format(factor)), scale_city_table(factor))
+
+
+def write_synthetic_city_file(file_name, rows, seed=0):
+    """
+    Permet d'écrire un fichier au format de villes.csv avec autant de lignes que voulu, sans le garder en mémoire.
+    Les codes de pays et les districts sont pris dans les tables du projet, les noms et les populations sont tirés
+    au hasard
+    :param str file_name: l'emplacement du fichier
+    :param int rows: le nombre de lignes
+    :param int seed: la graine du générateur aléatoire, pour obtenir toujours le même fichier
+    :return str: l'emplacement du fichier
+    """
+    generator = random.Random(seed)
+    templates = [(row[2], row[3]) for row in tables.table_city]
+    with open(file_name, 'w', encoding='UTF-8', newline='') as file:
+        writer = csv.writer(file, delimiter=';', lineterminator='\n')
+        for city_id in range(1, rows + 1):
+            country_code, district = generator.choice(templates)
+            writer.writerow((city_id, 'Ville {}'.format(generator.randrange(rows)), country_code, district,
+                             int(generator.lognormvariate(11, 1.5))))
+    return file_name
@@ -0,0 +1,131 @@
+"""
+Génération de copies agrandies des trois fichiers du projet (pays.csv, villes.csv et langues.csv), dont les liens
+restent valides :
+- la colone 2 des villes contient un code de pays qui existe
+- la colone 13 des pays (la capitale) contient l'identifiant d'une ville qui existe, ou NULL
+- la colone 0 des langues contient un code de pays qui existe
+
+Avec un facteur n, chaque table est copiée n fois. La copie 0 est identique aux fichiers du projet, les copies
+suivantes ont de nouveaux codes de pays (le code suivi du numéro de la copie, par exemple FRA3 et FR3) et de nouveaux
+identifiants de villes, et chaque copie ne fait référence qu'à elle même. Les noms, les continents et les langues sont
+gardés : les questions gardent la même proportion de lignes à chaque facteur. Les populations des villes des copies
+sont légèrement modifiées au hasard (avec une graine fixe), pour ne pas avoir des copies exactes.
+
+    python -m benchmarks.dataset <facteur> <dossier>
+"""
+
+import csv
+import os
+import random
+import sys
+
+import tables
+
+NULL = 'NULL'
+
+# Dossier des fichiers du projet, copiés par generate_dataset
+SOURCE_DIRECTORY = tables.DATA_DIRECTORY
+
+# Variation maximale de la population des villes copiées (+/- 20%)
+POPULATION_JITTER = 0.2
+
+
+def _copy_code(code, copy):
+    """
+    :param str code: un code de pays (colone 0 ou 14)
+    :param int copy: le numéro de la copie
+    :return str: le code de la copie, le même pour la copie 0
+    """
+    return code if copy == 0 or code == NULL else code + str(copy)
+
+
+def _copy_id(city_id, copy, offset):
+    """
+    :param str city_id: l'identifiant d'une ville, ou NULL
+    :param int copy: le numéro de la copie
+    :param int offset: le décalage entre deux copies, le plus grand identifiant de la table source
+    :return str: l'identifiant de la même ville dans la copie
+    """
+    return city_id if city_id == NULL else str(int(city_id) + copy * offset)
+
+
+def generate_dataset(directory, factor, seed=0):
+    """
+    Permet d'écrire dans un dossier les trois fichiers du projet agrandis factor fois (voir la description du module).
+    Les lignes sont écrites copie par copie, sans garder les tables agrandies en mémoire
+    :param str directory: le dossier de destination
+    :param int factor: le nombre de copies, au moins 1
+    :param int seed: la graine du générateur aléatoire, pour obtenir toujours les mêmes fichiers
+    :return dict[str, str]: l'emplacement de chaque fichier écrit, pour chaque nom de table par défaut
+    """
+    if factor < 1:
+        raise ValueError('The factor must be at least 1')
+    generator = random.Random(seed)
+    source = {name: tables.get_table_content(os.path.join(SOURCE_DIRECTORY, file_name))
+              for name, file_name in tables.DEFAULT_TABLES.items()}
+    id_offset = max(int(row[0]) for row in source['table_city'])
+
+    def copy_city(row, copy):
+        population = row[4]
+        if copy and population != NULL:
+            population = str(round(int(population) * generator.uniform(1 - POPULATION_JITTER, 1 + POPULATION_JITTER)))
+        return _copy_id(row[0], copy, id_offset), row[1], _copy_code(row[2], copy), row[3], population
+
+    def copy_country(row, copy):
+        return ((_copy_code(row[0], copy),) + row[1:13] + (_copy_id(row[13], copy, id_offset),)
+                + (_copy_code(row[14], copy),) + row[15:])
+
+    def copy_lang(row, copy):
+        return (_copy_code(row[0], copy),) + row[1:]
+
+    copy_functions = {'table_lang': copy_lang, 'table_country': copy_country, 'table_city': copy_city}
+    file_names = dict()
+    for name, file_name in tables.DEFAULT_TABLES.items():
+        file_names[name] = os.path.join(directory, file_name)
+        copy_row = copy_functions[name]
+        with open(file_names[name], 'w', encoding='UTF-8', newline='') as file:
+            writer = csv.writer(file, delimiter=tables.CSV_DELIMITER, lineterminator='\n')
+            for copy in range(factor):
+                writer.writerows(copy_row(row, copy) for row in source[name])
+    return file_names
+
+
+def check_dataset(directory):
+    """
+    Permet de vérifier les liens entre les trois fichiers d'un dossier. Les fichiers du projet ont déjà une ville dont
+    le code de pays n'existe pas (4080, le Vatican, dont les colones sont décalées) : elle est copiée telle quelle, les
+    fichiers agrandis ont donc factor liens cassés de ce type
+    :param str directory: le dossier qui contient pays.csv, villes.csv et langues.csv
+    :return dict[str, int]: le nombre de lignes dont le lien est cassé, pour chaque lien
+    """
+    table_lang, table_country, table_city = (
+        tables.get_table_content(os.path.join(directory, tables.DEFAULT_TABLES[name]))
+        for name in ('table_lang', 'table_country', 'table_city')
+    )
+    country_codes = {row[0] for row in table_country}
+    city_ids = {row[0] for row in table_city}
+    if len(country_codes) != len(table_country) or len(city_ids) != len(table_city):
+        raise ValueError('Duplicated country code or city id')
+    return {
+        'villes -> pays': sum(1 for row in table_city if row[2] not in country_codes),
+        'pays -> capitale': sum(1 for row in table_country if row[13] != NULL and row[13] not in city_ids),
+        'langues -> pays': sum(1 for row in table_lang if row[0] not in country_codes),
+    }
+
+
+def main():
+    factor, directory = int(sys.argv[1]), sys.argv[2]
+    os.makedirs(directory, exist_ok=True)
+    for name, file_name in generate_dataset(directory, factor).items():
+        print('{:<14} {:>10} lignes  {}'.format(name, sum(1 for _ in open(file_name, encoding='UTF-8')), file_name))
+
+    # Les liens cassés des fichiers agrandis doivent être exactement ceux des fichiers du projet, copiés
+    expected = check_dataset(SOURCE_DIRECTORY)
+    for link, broken in check_dataset(directory).items():
+        print('{:<18} {:>6} liens cassés (fichiers du projet : {})'.format(link, broken, expected[link]))
+        if broken != expected[link] * factor:
+            raise ValueError('Broken references in the generated files: ' + link)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+----- Ensembles de codes de pays sous forme de bitmaps -----
+
+Un CodeDictionary donne à chaque code de pays un entier dense (sa position dans la table des pays). Un ensemble de
+codes est alors un seul entier python, un bitmap dont le bit n vaut 1 si le pays n est dans l'ensemble :
+
+    french = country_codes.from_column(filter_table_by_value(table_lang, 1, 'French'), 0)
+    english = country_codes.from_column(filter_table_by_value(table_lang, 1, 'English'), 0)
+    french_not_english = french & ~english
+
+Les opérations ensemblistes sont des opérations sur les entiers : & (et), | (ou), & ~ (et non), calculées en C sur
+tous les pays à la fois, quelle que soit la taille des ensembles. Les bitmaps sont construits en un seul passage sur
+une colone, et to_codes renvoie les codes d'un bitmap dans l'ordre de la table des pays : le résultat sert ensuite
+de liste blanche pour un seul filtre (filter_table_by_list) sur les pays ou sur les villes.
+
+Les codes qui ne sont pas dans le dictionnaire (un code de langue sans pays...) sont ignorés. ~x seul est un entier
+négatif (tous les bits au delà des pays valent 1) : to_codes le lit comme le complément dans le dictionnaire, comme
+country_codes.all & ~x.
+"""
+
+from collections import Counter
+from itertools import compress
+from operator import itemgetter
+
+# Conversions entre les octets 0 et 1 (résultats de tests, valeurs pour itertools.compress) et les caractères '0' et
+# '1' d'un bitmap écrit en binaire
+_BIT_CHARACTERS = bytes.maketrans(b'\x00\x01', b'01')
+_BIT_VALUES = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class CodeDictionary:
+    """
+    Dictionnaire des codes de pays : chaque code a un entier dense, sa position
+    """
+
+    def __init__(self, codes):
+        """
+        :param codes: les codes, sans doublon, dans l'ordre voulu pour les résultats
+        """
+        self.codes = list(codes)
+        self.lookup = {code: index for index, code in enumerate(self.codes)}
+        self.all = (1 << len(self.codes)) - 1
+
+    @classmethod
+    def from_table(cls, table, column_index=0):
+        """
+        :param list[tuple] table: une table dont la colone contient des codes sans doublon, comme la table des pays
+        :param int column_index: l'index de la colone des codes
+        :return CodeDictionary: le dictionnaire des codes de la table, dans l'ordre de la table
+        """
+        return cls(row[column_index] for row in table)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def from_codes(self, codes):
+        """
+        :param codes: des codes de pays
+        :return int: le bitmap des codes connus
+        """
+        if not isinstance(codes, (set, frozenset)):
+            codes = set(codes)
+        # Le bitmap est écrit en binaire en un passage sur le dictionnaire, puis converti en entier une seule fois :
+        # ajouter les bits un par un à un grand entier recopierait l'entier à chaque bit
+        bits = bytes(map(codes.__contains__, self.codes)).translate(_BIT_CHARACTERS)
+        return int(bits[::-1], 2) if bits else 0  # Le bit de poids faible est le dernier caractère
+
+    def from_column(self, table, column_index):
+        """
+        Permet d'obtenir en un passage le bitmap des codes présents dans une colone, par exemple après un filtre
+        :param list[tuple] table: la table, ou un générateur de lignes
+        :param int column_index: l'index de la colone qui contient des codes de pays
+        :return int: le bitmap des codes de la colone
+        """
+        return self.from_codes({row[column_index] for row in table})
+
+    def from_counts(self, table, column_index, minimum):
+        """
+        Permet d'obtenir le bitmap des codes présents au moins minimum fois dans une colone
+        :param list[tuple] table: la table, ou un générateur de lignes
+        :param int column_index: l'index de la colone qui contient des codes de pays
+        :param int minimum: le nombre minimal de lignes pour chaque code
+        :return int: le bitmap des codes assez fréquents
+        """
+        counts = Counter(map(itemgetter(column_index), table))
+        return self.from_codes({code for code, count in counts.items() if count >= minimum})
+
+    def to_codes(self, bitmap):
+        """
+        :param int bitmap: un bitmap de ce dictionnaire, éventuellement négatif (~x)
+        :return list[str]: les codes du bitmap, dans l'ordre du dictionnaire
+        """
+        bitmap &= self.all  # Un bitmap négatif s'écrit avec '-0b' et des bits inversés
+        bits = bin(bitmap)[:1:-1].encode('ascii').translate(_BIT_VALUES)  # Du bit de poids faible au plus fort
+        return list(compress(self.codes, bits))
+
+    @staticmethod
+    def count(bitmap):
+        """
+        :param int bitmap: un bitmap positif, country_codes.all & ~x plutôt que ~x
+        :return int: le nombre de codes du bitmap
+        """
+        if bitmap < 0:
+            raise ValueError('A negative bitmap has no code count, mask it with CodeDictionary.all')
+        return bin(bitmap).count('1')
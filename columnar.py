@@ -0,0 +1,474 @@
+"""
+----- Tables typées stockées par colones -----
+
+Une ColumnTable garde chaque colone dans un seul objet, dont le type est donné par un schéma :
+- 'int' : nombres entiers, dans une array('q')
+- 'float' : nombres à virgule, dans une array('d')
+- 'int?' et 'float?' : nombres pouvant valoir NULL, dans une array('d') où NULL devient NaN.
+  Les comparaisons avec NaN sont toujours fausses, les NULL sont donc ignorés par les filtres sans test particulier
+- 'category' : chaines de caractères qui se répètent beaucoup (continent, région, code de pays...), encodées par
+  dictionnaire dans une CategoryColumn : chaque valeur différente est gardée une seule fois, et chaque case n'est qu'un
+  petit entier (array('H'), 2 octets) qui renvoie à cette valeur. Les filtres d'égalité, de liste blanche et les
+  expressions régulières sont traduits en codes, puis comparent des entiers
+- 'str' : chaines de caractères quelconques, dans une liste
+
+Chaque case est convertie une seule fois, au chargement. Les fonctions filter_table_by_*, summarize_column et
+get_unique_values_on_column du module tables reconnaissent une ColumnTable et travaillent directement sur ses colones.
+Une ColumnTable se parcourt aussi comme une table classique : chaque ligne est alors recréée sous forme de tuple.
+
+Les résultats sont ceux des fonctions de tables sur les mêmes lignes sous forme de tuples de strings, en particulier :
+- summarize_column (et summarize_column_by_group) ignore les NULL et les nombres négatifs, comme is_number
+- filter_by_value et filter_by_list avec 'NULL' gardent les NULL (NaN) d'une colone numérique
+Différences qui restent, dues à la conversion des cases au chargement :
+- les valeurs renvoyées (lignes, get_unique_values_on_column) sont des nombres et non des strings
+- un nombre écrit autrement qu'avec des chiffres et un point (1e3, +1) est compté par summarize_column
+- filter_by_regex teste str(valeur) sur une colone numérique, par exemple '1.0' pour la case '1'
+
+Backend NumPy (optionnel) : si NumPy est installé, to_numpy() (ou get_column_table(..., backend='numpy')) renvoie une
+table dont les colones numériques (et les codes des colones 'category') sont des ndarray, sans copie. Les comparaisons
+donnent alors des masques de booléens et les sommes sont vectorisées. Sans NumPy, le calcul en python pur reste
+utilisé. NumPy n'est importé qu'à la première table avec le backend NumPy (voir load_numpy) : importer tables reste
+rapide.
+"""
+
+import math
+import re
+from array import array
+from itertools import compress
+
+from patterns import get_regex_matcher
+
+# Le module NumPy, None tant qu'aucune table n'utilise le backend NumPy
+numpy = None
+
+NULL = 'NULL'
+
+# Schémas des fichiers du projet, une entrée par colone
+COUNTRY_SCHEMA = (
+    'str', 'str', 'category', 'category', 'float', 'int?', 'int', 'float?', 'float', 'float?',
+    'str', 'category', 'str', 'int?', 'str'
+)
+CITY_SCHEMA = ('int', 'str', 'category', 'str', 'int')
+LANG_SCHEMA = ('category', 'category', 'category', 'float')
+
+NUMERIC_TYPES = ('int', 'float', 'int?', 'float?')
+
+
+def load_numpy():
+    """
+    Permet d'importer NumPy, au premier appel seulement
+    :return: le module numpy. Lève ImportError si NumPy n'est pas installé
+    """
+    global numpy
+    if numpy is None:
+        try:
+            import numpy as numpy_module
+        except ImportError:  # NumPy est optionnel
+            raise ImportError('NumPy is required for the numpy backend') from None
+        numpy = numpy_module
+    return numpy
+
+
+def _parse_nullable_float(cell):
+    """
+    Convertis une case en float, NULL devient NaN
+    :param str cell: la case à convertir
+    :return float: la valeur convertie
+    """
+    return math.nan if cell == NULL else float(cell)
+
+
+# Pour chaque type : le type de l'array (None pour une liste) et la fonction de conversion d'une case
+COLUMN_TYPES = {
+    'int': ('q', int),
+    'float': ('d', float),
+    'int?': ('d', _parse_nullable_float),
+    'float?': ('d', _parse_nullable_float),
+    'category': (None, str),  # Stockée dans une CategoryColumn, voir _new_column
+    'str': (None, str),
+}
+
+
+def _new_column(column_type, values=()):
+    """
+    Permet de créer une colone vide (ou remplie avec values) du bon type
+    :param str column_type: le type de la colone, une clé de COLUMN_TYPES
+    :param values: les valeurs de départ, déjà converties
+    :return array | list | CategoryColumn: la colone
+    """
+    if column_type == 'category':
+        return CategoryColumn(values)
+    typecode = COLUMN_TYPES[column_type][0]
+    return list(values) if typecode is None else array(typecode, values)
+
+
+class CategoryColumn:
+    """
+    Colone de strings encodée par dictionnaire : categories contient chaque valeur une seule fois, et codes donne pour
+    chaque case la position de sa valeur dans categories. Elle se lit comme une liste de strings
+    """
+
+    def __init__(self, values=()):
+        """
+        :param values: les valeurs de départ
+        """
+        self.categories = list()
+        self.lookup = dict()  # valeur -> code
+        self.codes = array('H')
+        for value in values:
+            self.append(value)
+
+    def append(self, value):
+        """
+        :param str value: la valeur à ajouter à la fin de la colone
+        """
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            self.categories.append(value)
+            if code > 0xFFFF and self.codes.typecode == 'H':  # Plus de 65536 valeurs : les codes passent à 4 octets
+                self.codes = array('I', self.codes)
+        self.codes.append(code)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return map(self.categories.__getitem__, self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(map(self.categories.__getitem__, self.codes[index]))
+        return self.categories[self.codes[index]]
+
+    def encode(self, values):
+        """
+        :param values: des valeurs
+        :return set[int]: les codes de celles qui sont dans la colone
+        """
+        return {self.lookup[value] for value in values if value in self.lookup}
+
+    def with_codes(self, codes):
+        """
+        :param codes: de nouveaux codes (array ou ndarray), qui renvoient aux mêmes valeurs
+        :return CategoryColumn: une colone qui partage les valeurs de celle ci
+        """
+        column = CategoryColumn()
+        column.categories = self.categories
+        column.lookup = self.lookup
+        column.codes = codes
+        return column
+
+    def nbytes(self):
+        """
+        :return int: la mémoire occupée par les codes, en octets (les valeurs ne sont gardées qu'une fois)
+        """
+        return len(self.codes) * self.codes.itemsize
+
+
+class ColumnTable:
+    """
+    Table stockée par colones, dont chaque colone a un type donné par un schéma.
+
+    Les filtres ne copient pas les colones : ils renvoient une vue qui partage les colones de la table d'origine et
+    garde seulement la liste des lignes sélectionnées (selection). compact() permet de copier une vue dans une table
+    indépendante, par exemple pour libérer la table d'origine.
+    """
+
+    def __init__(self, columns, schema, selection=None, backend='python'):
+        """
+        :param list[array | list] columns: les colones, déjà converties
+        :param tuple[str] schema: le type de chaque colone
+        :param list[int] selection: les index des lignes de la vue, None pour toutes les lignes
+        :param str backend: 'python', ou 'numpy' si les colones numériques sont des ndarray
+        """
+        self.columns = columns
+        self.schema = tuple(schema)
+        self.selection = selection
+        self.backend = backend
+        if backend == 'numpy':
+            load_numpy()
+
+    def __setstate__(self, state):
+        """
+        Une table avec le backend NumPy reçue d'un autre processus importe aussi NumPy
+        """
+        self.__dict__.update(state)
+        if self.backend == 'numpy':
+            load_numpy()
+
+    @classmethod
+    def from_rows(cls, rows, schema):
+        """
+        Permet de construire une table par colones à partir de lignes de strings, par exemple celles d'un fichier CSV
+        :param rows: les lignes, une liste de tuples ou un générateur
+        :param tuple[str] schema: le type de chaque colone
+        :return ColumnTable: la table convertie
+        """
+        columns = [_new_column(column_type) for column_type in schema]
+        appenders = [column.append for column in columns]
+        parsers = [COLUMN_TYPES[column_type][1] for column_type in schema]
+        for row in rows:
+            for append, parse, cell in zip(appenders, parsers, row):
+                append(parse(cell))
+        return cls(columns, schema)
+
+    def __len__(self):
+        if self.selection is not None:
+            return len(self.selection)
+        return len(self.columns[0]) if self.columns else 0
+
+    def __iter__(self):
+        return zip(*[self.values(column_index) for column_index in range(len(self.columns))])
+
+    def __getitem__(self, index):
+        """
+        Une ligne est renvoyée sous forme de tuple, une tranche sous forme de liste de tuples
+        """
+        if isinstance(index, slice):
+            if self.selection is None:
+                return list(zip(*[column[index] for column in self.columns]))
+            return list(zip(*[list(map(column.__getitem__, self.selection[index])) for column in self.columns]))
+        if self.selection is not None:
+            index = self.selection[index]
+        return tuple(column[index] for column in self.columns)
+
+    def values(self, column_index):
+        """
+        Permet de parcourir les valeurs d'une colone, sans copie
+        :param int column_index: l'index de la colone
+        :return: un itérable sur les valeurs de la colone, dans l'ordre des lignes
+        """
+        column = self.columns[column_index]
+        if self.selection is None:
+            return column
+        if self.backend == 'numpy' and isinstance(column, numpy.ndarray):
+            return column[self.selection]
+        return map(column.__getitem__, self.selection)
+
+    def codes(self, column_index):
+        """
+        Permet de parcourir les codes d'une colone 'category', sans copie
+        :param int column_index: l'index de la colone
+        :return: un itérable sur les codes de la colone dans l'ordre des lignes, un ndarray avec le backend NumPy
+        """
+        codes = self.columns[column_index].codes
+        if self.selection is None:
+            return codes
+        if self.backend == 'numpy':
+            return codes[self.selection]
+        return map(codes.__getitem__, self.selection)
+
+    def column(self, column_index):
+        """
+        :param int column_index: l'index de la colone
+        :return array | list: la colone, copiée seulement si la table est une vue
+        """
+        if self.selection is None:
+            return self.columns[column_index]
+        if self.backend == 'numpy' and isinstance(self.columns[column_index], numpy.ndarray):
+            return self.values(column_index)
+        if isinstance(self.columns[column_index], CategoryColumn):  # Les codes sont copiés, pas les valeurs
+            codes = self.codes(column_index)
+            if self.backend != 'numpy' and not isinstance(codes, array):  # Avec NumPy, codes est un ndarray
+                codes = array(self.columns[column_index].codes.typecode, codes)
+            return self.columns[column_index].with_codes(codes)
+        return _new_column(self.schema[column_index], self.values(column_index))
+
+    def to_numpy(self):
+        """
+        Permet d'obtenir la même table avec le backend NumPy : les colones numériques deviennent des ndarray qui
+        partagent la mémoire des array, sans copie, comme les codes des colones 'category'. Les colones de strings
+        restent des listes
+        :return ColumnTable: la table avec le backend NumPy
+        """
+        if self.backend == 'numpy':
+            return self
+        load_numpy()
+        columns = list()
+        for column in self.columns:
+            if isinstance(column, array):
+                column = numpy.frombuffer(column, dtype=column.typecode)
+            elif isinstance(column, CategoryColumn):
+                column = column.with_codes(numpy.frombuffer(column.codes, dtype=column.codes.typecode))
+            columns.append(column)
+        selection = None if self.selection is None else numpy.asarray(self.selection, dtype=numpy.intp)
+        return ColumnTable(columns, self.schema, selection, 'numpy')
+
+    def _numpy_values(self, column_index):
+        """
+        :param int column_index: l'index de la colone
+        :return: les valeurs de la colone sous forme de ndarray avec le backend NumPy, None sinon
+        """
+        if self.backend == 'numpy' and isinstance(self.columns[column_index], numpy.ndarray):
+            return self.values(column_index)
+        return None
+
+    def is_numeric(self, column_index):
+        """
+        :param int column_index: l'index de la colone
+        :return bool: true si la colone contient des nombres
+        """
+        return self.schema[column_index] in NUMERIC_TYPES
+
+    def parse_value(self, column_index, value):
+        """
+        Permet de convertir une valeur donnée sous forme de string dans le type de la colone, pour pouvoir la comparer
+        :param int column_index: l'index de la colone
+        :param value: la valeur à convertir
+        :return: la valeur convertie
+        """
+        if isinstance(value, str) and self.is_numeric(column_index):
+            if value == NULL:
+                return math.nan  # NaN n'est égal à aucune valeur, même à lui même
+            return COLUMN_TYPES[self.schema[column_index]][1](value)
+        return value
+
+    def select_columns(self, column_indexes):
+        """
+        Permet d'obtenir une table qui ne garde que certaines colones. Les colones sont partagées, sans copie
+        :param tuple[int] column_indexes: les index des colones à garder, dans l'ordre voulu
+        :return ColumnTable: la nouvelle table
+        """
+        return ColumnTable(
+            [self.columns[index] for index in column_indexes], [self.schema[index] for index in column_indexes],
+            self.selection, self.backend
+        )
+
+    def compact(self):
+        """
+        Permet de copier une vue dans une table indépendante, qui ne garde que les lignes sélectionnées
+        :return ColumnTable: la nouvelle table
+        """
+        if self.selection is None:
+            return self
+        return ColumnTable(
+            [self.column(column_index) for column_index in range(len(self.columns))], self.schema, None, self.backend
+        )
+
+    def take_mask(self, mask):
+        """
+        Permet de créer une vue avec seulement les lignes pour lesquelles le masque est vrai
+        :param mask: un booléen par ligne de la table, une liste, un itérateur ou un ndarray de booléens
+        :return ColumnTable: la vue filtrée
+        """
+        if self.backend == 'numpy':
+            # Un masque calculé en python est d'abord converti en liste de positions dans la vue
+            positions = mask if isinstance(mask, numpy.ndarray) else list(compress(range(len(self)), mask))
+            if self.selection is None:
+                selection = numpy.flatnonzero(mask) if positions is mask else numpy.asarray(positions, numpy.intp)
+            else:
+                selection = self.selection[positions]
+            return ColumnTable(self.columns, self.schema, selection, self.backend)
+        rows = range(len(self.columns[0])) if self.selection is None else self.selection
+        return ColumnTable(self.columns, self.schema, list(compress(rows, mask)))
+
+    def filter_by_value(self, column_index, value):
+        """
+        Equivalent de tables.filter_table_by_value
+        :param int column_index: l'index de la colone à filtrer
+        :param value: la valeur qui sera comparée
+        :return ColumnTable: la table filtrée
+        """
+        if isinstance(self.columns[column_index], CategoryColumn):
+            return self._filter_by_codes(column_index, self.columns[column_index].encode((value,)))
+        values = self._numpy_values(column_index)
+        if value == NULL and self.is_numeric(column_index):  # Les NULL sont des NaN, NaN != NaN
+            if values is not None:
+                return self.take_mask(numpy.isnan(values))
+            return self.take_mask(cell != cell for cell in self.values(column_index))
+        value = self.parse_value(column_index, value)
+        if values is not None:
+            return self.take_mask(values == value)
+        return self.take_mask(cell == value for cell in self.values(column_index))
+
+    def filter_by_list(self, column_index, whitelist):
+        """
+        Equivalent de tables.filter_table_by_list
+        :param int column_index: l'index de la colone à filtrer
+        :param whitelist: la liste blanche
+        :return ColumnTable: la table filtrée
+        """
+        if isinstance(self.columns[column_index], CategoryColumn):
+            return self._filter_by_codes(column_index, self.columns[column_index].encode(whitelist))
+        keep_null = self.is_numeric(column_index) and NULL in whitelist  # Les NULL sont des NaN, NaN != NaN
+        whitelist = {self.parse_value(column_index, value) for value in whitelist if not keep_null or value != NULL}
+        values = self._numpy_values(column_index)
+        if values is not None:
+            mask = numpy.isin(values, list(whitelist))
+            return self.take_mask(mask | numpy.isnan(values) if keep_null else mask)
+        if keep_null:
+            return self.take_mask(cell in whitelist or cell != cell for cell in self.values(column_index))
+        return self.take_mask(map(whitelist.__contains__, self.values(column_index)))
+
+    def filter_by_comparator(self, column_index, comparator, number):
+        """
+        Equivalent de tables.filter_table_by_comparator. Sur une colone numérique, aucune conversion n'est faite
+        :param int column_index: l'index de la colone à filtrer
+        :param str comparator: le signe qui permet de comparer (< ou >)
+        :param int | float number: le nombre auquel les valeurs sont comparées
+        :return ColumnTable: la table filtrée
+        """
+        number = float(number)
+        values = self._numpy_values(column_index)
+        if values is not None:  # Avec NumPy, la comparaison donne directement le masque
+            if comparator == '<':
+                return self.take_mask(values < number)
+            elif comparator == '>':
+                return self.take_mask(values > number)
+            else:
+                raise ValueError('Unkonw comparator ' + comparator)
+
+        column = self.values(column_index)
+        if not self.is_numeric(column_index):
+            column = map(_parse_nullable_float, column)
+        # number.__gt__(cell) équivaut à cell < number, mais est appelé directement par map, sans boucle python
+        if comparator == '<':
+            return self.take_mask(map(number.__gt__, column))
+        elif comparator == '>':
+            return self.take_mask(map(number.__lt__, column))
+        else:
+            raise ValueError('Unkonw comparator ' + comparator)
+
+    def filter_by_regex(self, column_index, regex):
+        """
+        Equivalent de tables.filter_table_by_regex
+        :param int column_index: l'index de la colone à filtrer
+        :param str regex: l'expression régulière qui sert de filtre
+        :return ColumnTable: la table filtrée
+        """
+        match = get_regex_matcher(regex, re.IGNORECASE)
+        column = self.columns[column_index]
+        if isinstance(column, CategoryColumn):  # L'expression est testée une fois par valeur, pas par ligne
+            return self._filter_by_codes(column_index, {code for code, value in enumerate(column.categories)
+                                                        if match(value)})
+        return self.take_mask(map(match, map(str, self.values(column_index))))
+
+    def _filter_by_codes(self, column_index, codes):
+        """
+        Permet de filtrer une colone 'category' en comparant seulement des entiers
+        :param int column_index: l'index de la colone à filtrer
+        :param set[int] codes: les codes des valeurs à garder
+        :return ColumnTable: la table filtrée
+        """
+        values = self.codes(column_index)
+        if self.backend == 'numpy':
+            return self.take_mask(numpy.isin(values, list(codes)))
+        if len(codes) == 1:
+            return self.take_mask(map(next(iter(codes)).__eq__, values))
+        return self.take_mask(map(codes.__contains__, values))
+
+    def summarize_column(self, column_index):
+        """
+        Equivalent de tables.summarize_column : les NULL et les nombres négatifs sont ignorés
+        :param int column_index: l'index de la colone à traiter
+        :return dict: le nombre total (clé sum) et le nombre de valeurs traitées (clé count)
+        """
+        if not self.is_numeric(column_index):
+            raise ValueError('Column {} is not numeric'.format(column_index))
+        values = self._numpy_values(column_index)
+        if values is not None:
+            values = values[values >= 0]  # Les comparaisons avec NaN sont fausses : les NULL sont aussi retirés
+            return {'sum': float(values.sum()), 'count': int(values.size)}
+        values = [cell for cell in self.values(column_index) if cell >= 0]
+        return {'sum': float(sum(values)), 'count': len(values)}
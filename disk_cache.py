@@ -0,0 +1,93 @@
+"""
+----- Cache sur disque des tables lues -----
+
+Une table lue depuis un fichier CSV peut être enregistrée à côté de celui-ci, dans un fichier <nom>.csv.cache.
+Le fichier de cache contient deux objets pickle : un en-tête qui décrit le fichier CSV (chemin, date de modification,
+taille et délimiteur), puis la table.
+
+Au chargement, l'en-tête est lu en premier : si une de ces informations a changé, le cache est ignoré et sera réécrit.
+Le fichier de cache est lu à travers un mmap, sans copie préalable de son contenu en mémoire. Un cache illisible, quelle
+que soit l'erreur, est ignoré : la table est relue depuis le fichier CSV.
+
+Le cache n'est utilisé que sur demande (get_table_content(..., cache=True), ou tables.DEFAULT_TABLE_CACHE pour les
+tables par défaut) : depuis les moteurs de lecture du module parsers, charger une grande table depuis le cache n'est pas
+plus rapide que relire le CSV, car le temps est surtout passé à créer les strings des cases.
+
+Sécurité : pickle.load peut exécuter du code choisi par l'auteur du fichier. Un fichier de cache doit donc venir d'une
+source aussi sûre que le code lui même : le cache ne doit être activé que dans un dossier où seul l'utilisateur peut
+écrire.
+"""
+
+import mmap
+import os
+import pickle
+
+CACHE_EXTENSION = '.cache'
+CACHE_VERSION = 1
+
+
+def get_cache_file_name(file_name):
+    """
+    :param str file_name: l'emplacement du fichier CSV
+    :return str: l'emplacement de son fichier de cache
+    """
+    return file_name + CACHE_EXTENSION
+
+
+def get_cache_header(file_name, delimiter):
+    """
+    Permet d'obtenir les informations qui identifient une version d'un fichier CSV
+    :param str file_name: l'emplacement du fichier CSV
+    :param str delimiter: le délimiteur utilisé pour lire le fichier
+    :return dict: l'en-tête du cache
+    """
+    stat = os.stat(file_name)
+    return {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(file_name),
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'delimiter': delimiter,
+    }
+
+
+def load_cached_table(file_name, delimiter):
+    """
+    Permet de lire une table depuis le cache d'un fichier CSV
+    :param str file_name: l'emplacement du fichier CSV
+    :param str delimiter: le délimiteur utilisé pour lire le fichier
+    :return list[tuple] | None: la table, ou None si le cache n'existe pas ou n'est plus valide
+    """
+    try:
+        with open(get_cache_file_name(file_name), 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                # Un pickle.load par objet : chaque objet a été écrit par un pickle.dump séparé
+                if pickle.load(content) != get_cache_header(file_name, delimiter):
+                    return None
+                return pickle.load(content)
+    except Exception:  # Cache absent, vide ou abimé : un pickle abimé peut lever presque n'importe quelle exception
+        return None
+
+
+def save_cached_table(file_name, header, table):
+    """
+    Permet d'enregistrer une table dans le cache d'un fichier CSV. Le fichier est écrit sous un nom temporaire puis
+    renommé, pour qu'un cache à moitié écrit ne soit jamais lu. Si le cache ne peut pas être écrit (dossier en
+    lecture seule...), rien ne se passe
+    :param str file_name: l'emplacement du fichier CSV
+    :param dict header: l'en-tête obtenu avec get_cache_header avant de lire le fichier, pour qu'une modification
+        pendant la lecture invalide le cache
+    :param list[tuple] table: la table à enregistrer
+    """
+    cache_file_name = get_cache_file_name(file_name)
+    temporary_file_name = '{}.{}.tmp'.format(cache_file_name, os.getpid())
+    try:
+        with open(temporary_file_name, 'wb') as file:
+            pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(table, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_file_name, cache_file_name)
+    except OSError:
+        try:
+            os.remove(temporary_file_name)
+        except OSError:
+            pass
@@ -0,0 +1,146 @@
+"""
+----- Tri externe des tables trop grandes pour la mémoire -----
+
+external_sort trie une table en ne gardant en mémoire que chunk_size lignes à la fois :
+1. la table (souvent un générateur, voir get_table_content(..., lazy=True)) est lue par morceaux de chunk_size lignes
+2. chaque morceau est trié avec sorted, puis écrit dans un fichier temporaire au format CSV
+3. les fichiers sont relus en même temps et fusionnés avec heapq.merge, qui renvoie les lignes une par une
+
+Si il y a plus de MERGE_WIDTH fichiers, ils sont d'abord fusionnés par groupes dans de nouveaux fichiers, pour ne
+jamais ouvrir trop de fichiers à la fois. Le tri est stable, comme sorted : le résultat est le même que
+sorted(table, key=..., reverse=...). Les fichiers temporaires sont supprimés une fois le résultat entièrement parcouru
+(ou le générateur fermé).
+
+Comme les fichiers temporaires sont au format CSV, les cases doivent être des strings, comme dans une table lue avec
+get_table_content : une case relue depuis un fichier serait une string, et ne serait plus comparée de la même façon.
+Chaque morceau est donc vérifié, même s'il tient en mémoire, et une autre case lève TypeError : le résultat ne dépend
+jamais de chunk_size. numeric_columns permet de trier des colones numériques.
+"""
+
+import csv
+import heapq
+import tempfile
+from itertools import chain, islice
+
+NULL = 'NULL'
+
+# Nombre de lignes triées en mémoire à la fois
+CHUNK_ROWS = 500_000
+
+# Nombre maximal de fichiers fusionnés en même temps
+MERGE_WIDTH = 64
+
+
+def get_sort_key(column_indexes, numeric_columns=(), reverse=False):
+    """
+    Permet d'obtenir la fonction qui donne la clé de tri d'une ligne
+    :param int | tuple[int] column_indexes: la colone, ou les colones dans l'ordre de priorité
+    :param tuple[int] numeric_columns: les colones à comparer comme des nombres. Les NULL sont placés après les
+        nombres, dans les deux sens de tri
+    :param bool reverse: true si la clé sert à un tri dans le sens inverse
+    :return: une fonction qui prend une ligne et renvoie sa clé
+    """
+    if isinstance(column_indexes, int):
+        column_indexes = (column_indexes,)
+    numeric_key = _reversed_numeric_key if reverse else _numeric_key
+    parsers = [numeric_key if index in numeric_columns else None for index in column_indexes]
+    if len(column_indexes) == 1:
+        index, parse = column_indexes[0], parsers[0]
+        if parse is None:
+            return lambda row: row[index]
+        return lambda row: parse(row[index])
+    pairs = list(zip(column_indexes, parsers))
+    return lambda row: tuple(row[index] if parse is None else parse(row[index]) for index, parse in pairs)
+
+
+def _numeric_key(cell):
+    """
+    :param str cell: une case numérique
+    :return tuple: une clé qui classe les nombres dans l'ordre, puis les NULL
+    """
+    return (1, 0.0) if cell == NULL else (0, float(cell))
+
+
+def _reversed_numeric_key(cell):
+    """
+    :param str cell: une case numérique
+    :return tuple: une clé qui, triée dans le sens inverse, classe les nombres dans l'ordre inverse, puis les NULL
+    """
+    return (0, 0.0) if cell == NULL else (1, float(cell))
+
+
+def _check_cells(rows):
+    """
+    Permet de vérifier que toutes les cases d'un morceau sont des strings
+    :param list[tuple] rows: les lignes du morceau
+    """
+    types = set(map(type, chain.from_iterable(rows)))  # Un seul passage en C sur toutes les cases
+    types.discard(str)
+    if types:
+        raise TypeError('external_sort only sorts str cells, not ' + ', '.join(sorted(t.__name__ for t in types)))
+
+
+def _write_chunk(rows, directory):
+    """
+    Permet d'écrire des lignes dans un fichier temporaire, qui sera supprimé à sa fermeture
+    :param list[tuple] rows: les lignes à écrire
+    :param str directory: le dossier des fichiers temporaires, None pour celui du système
+    :return: le fichier, ouvert et replacé au début
+    """
+    file = tempfile.TemporaryFile('w+', encoding='UTF-8', newline='', dir=directory)
+    csv.writer(file, delimiter=';', lineterminator='\n').writerows(rows)
+    file.seek(0)
+    return file
+
+
+def _read_chunk(file):
+    """
+    :param file: un fichier écrit par _write_chunk
+    :return: les lignes du fichier, une par une, sous forme de tuples
+    """
+    return map(tuple, csv.reader(file, delimiter=';'))
+
+
+def external_sort(table, column_indexes, reverse=False, numeric_columns=(), chunk_size=CHUNK_ROWS, directory=None):
+    """
+    Permet de trier une table sans la garder entièrement en mémoire (voir la description du module)
+    :param table: la table à trier, une liste de tuples de strings ou un générateur
+    :param int | tuple[int] column_indexes: la colone qui sert de référence, ou les colones dans l'ordre de priorité
+    :param bool reverse: true si on doit trier la table dans le sens inverse
+    :param tuple[int] numeric_columns: les colones à comparer comme des nombres plutôt que comme des strings, les NULL
+        sont placés après les nombres
+    :param int chunk_size: le nombre de lignes triées en mémoire à la fois
+    :param str directory: le dossier des fichiers temporaires, None pour celui du système
+    :return: un générateur sur les lignes triées
+    """
+    key = get_sort_key(column_indexes, numeric_columns, reverse)
+    rows = iter(table)
+    files = list()
+    try:
+        while True:
+            chunk = sorted(islice(rows, chunk_size), key=key, reverse=reverse)
+            if not chunk:
+                break
+            _check_cells(chunk)
+            if not files and len(chunk) < chunk_size:  # Tout tient dans un seul morceau : rien à écrire
+                yield from chunk
+                return
+            files.append(_write_chunk(chunk, directory))
+            del chunk
+
+        # Les fichiers sont fusionnés par groupes tant qu'il y en a trop, dans l'ordre pour garder un tri stable
+        while len(files) > MERGE_WIDTH:
+            groups = [files[index:index + MERGE_WIDTH] for index in range(0, len(files), MERGE_WIDTH)]
+            files = list()
+            for group in groups:
+                try:
+                    merged = heapq.merge(*map(_read_chunk, group), key=key, reverse=reverse)
+                    files.append(_write_chunk(merged, directory))
+                finally:
+                    for file in group:
+                        file.close()
+
+        yield from heapq.merge(*map(_read_chunk, files), key=key, reverse=reverse)
+    finally:
+        for file in files:
+            file.close()
@@ -0,0 +1,93 @@
+"""
+----- Lecture incrémentale d'un fichier CSV qui grandit -----
+
+Une TailTable suit un fichier CSV auquel des lignes sont ajoutées à la fin au cours de la journée (comme villes.csv
+en production). Elle garde la position du dernier octet lu : refresh() ne lit que les lignes ajoutées depuis le
+dernier appel, et met à jour les agrégats enregistrés avec add_aggregate (minimum, maximum, somme, nombre et moyenne
+par groupe, au format de summarize_column_by_group). Le coût d'un refresh dépend du nombre de nouvelles lignes, pas de
+la taille du fichier.
+
+Seules les lignes complètes (terminées par un retour à la ligne) sont lues : une ligne en cours d'écriture sera lue au
+refresh suivant. Si le fichier est remplacé (autre fichier au même chemin) ou raccourci, tout est relu depuis le début
+et les agrégats sont recalculés. Une modification au milieu du fichier qui ne change pas sa taille n'est pas détectée.
+"""
+
+import os
+
+from loader import parse_bytes
+from tables import CSV_DELIMITER, update_column_summary_by_group
+
+
+class TailTable:
+    """
+    Table lue depuis un fichier CSV auquel des lignes sont ajoutées, avec des agrégats par groupe mis à jour à chaque
+    lecture
+    """
+
+    def __init__(self, file_name, keep_rows=True, delimiter=CSV_DELIMITER):
+        """
+        Le fichier n'est pas lu avant le premier appel à refresh, pour pouvoir enregistrer les agrégats avant
+        :param str file_name: l'emplacement du fichier
+        :param bool keep_rows: true pour garder toutes les lignes lues dans rows, false pour ne garder que les agrégats
+        :param str delimiter: le délimiteur du fichier CSV
+        """
+        self.file_name = file_name
+        self.keep_rows = keep_rows
+        self.delimiter = delimiter
+        self.rows = list()
+        self.offset = 0
+        self.file_id = None
+        self.aggregates = list()
+
+    def add_aggregate(self, key_column, column_index):
+        """
+        Permet d'enregistrer un agrégat, équivalent de summarize_column_by_group(rows, key_column, column_index), qui
+        sera mis à jour à chaque refresh
+        :param int key_column: l'index de la colone qui sert de clé
+        :param int column_index: l'index de la colone à traiter
+        :return dict[str, dict]: l'agrégat, le même dict est mis à jour par les appels suivants à refresh
+        """
+        if self.offset and not self.keep_rows:
+            raise ValueError('Aggregates must be added before the first refresh when rows are not kept')
+        groups = dict()
+        update_column_summary_by_group(groups, self.rows, key_column, column_index)
+        self.aggregates.append((key_column, column_index, groups))
+        return groups
+
+    def reset(self):
+        """
+        Permet d'oublier tout ce qui a été lu : le prochain refresh relira le fichier depuis le début
+        """
+        self.rows.clear()
+        self.offset = 0
+        self.file_id = None
+        for _, _, groups in self.aggregates:
+            groups.clear()
+
+    def refresh(self):
+        """
+        Permet de lire les lignes ajoutées au fichier depuis le dernier appel et de mettre à jour les agrégats
+        :return list[tuple]: les nouvelles lignes
+        """
+        stat = os.stat(self.file_name)
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.offset:  # Fichier remplacé ou raccourci
+            self.reset()
+            self.file_id = file_id
+        if stat.st_size == self.offset:
+            return []
+
+        with open(self.file_name, 'rb') as file:
+            file.seek(self.offset)
+            content = file.read(stat.st_size - self.offset)
+        end = content.rfind(b'\n') + 1  # On s'arrête après la dernière ligne complète
+        if not end:
+            return []
+        new_rows = parse_bytes(content[:end], self.delimiter)
+        self.offset += end
+
+        if self.keep_rows:
+            self.rows.extend(new_rows)
+        for key_column, column_index, groups in self.aggregates:
+            update_column_summary_by_group(groups, new_rows, key_column, column_index)
+        return new_rows
@@ -0,0 +1,248 @@
+"""
+----- Index secondaires sur les colones d'une table -----
+
+Une IndexedTable est une table classique (une liste de tuples) à laquelle sont attachés des index sur certaines
+colones. Elle se manipule exactement comme une liste : les fonctions qui ne connaissent pas les index la parcourent
+normalement.
+
+- Index de hachage : un dict valeur -> positions des lignes, pour les filtres d'égalité (filter_table_by_value) et de
+  liste blanche (filter_table_by_list), sur des colones comme le code de pays ou le continent
+- Index trié : les valeurs converties en float, triées, avec la position de chaque ligne, pour les filtres de
+  comparaison (filter_table_by_comparator) avec bisect, sur des colones comme la population ou la surface. Les NULL
+  ne sont pas dans l'index, comme ils sont ignorés par les filtres
+
+Chaque index est construit lors de la première recherche sur sa colone, puis réutilisé. Les recherches renvoient des
+positions dans l'ordre de la table, pour que les filtres gardent l'ordre des lignes. Remettre les positions dans
+l'ordre coûte plus cher que de parcourir la table quand beaucoup de lignes sont gardées : les filtres n'utilisent un
+index que si au plus INDEX_MAX_SELECTIVITY des lignes sont trouvées (compté avec count_*, sans trier de positions). Les index sont effacés si la
+table est modifiée (append, extend...).
+
+Chaque IndexedTable a aussi une version, un nombre unique qui change à chaque modification de la table. Elle sert de
+clé au cache de résultats (voir le module memo) : un résultat calculé sur une ancienne version n'est jamais réutilisé.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import chain, count
+
+NULL = 'NULL'
+
+# Part maximale des lignes trouvées par un index pour qu'il soit utilisé, au delà un parcours de la table est plus rapide
+INDEX_MAX_SELECTIVITY = 0.1
+
+# Les versions sont uniques pour toutes les tables, même après la suppression d'une table
+_versions = count()
+
+
+class HashIndex:
+    """
+    Index d'égalité sur une colone : les positions des lignes pour chaque valeur
+    """
+
+    def __init__(self, table, column_index):
+        """
+        :param list[tuple] table: la table indexée
+        :param int column_index: l'index de la colone
+        """
+        self.positions = dict()
+        for position, row in enumerate(table):
+            positions = self.positions.get(row[column_index])
+            if positions is None:
+                self.positions[row[column_index]] = [position]
+            else:
+                positions.append(position)
+
+    def find_value(self, value):
+        """
+        :param value: la valeur cherchée
+        :return list[int]: les positions des lignes égales à la valeur, dans l'ordre de la table
+        """
+        return self.positions.get(value, [])
+
+    def count_value(self, value):
+        """
+        :param value: la valeur cherchée
+        :return int: le nombre de lignes égales à la valeur, sans construire la liste des positions
+        """
+        return len(self.positions.get(value, ()))
+
+    def count_list(self, whitelist):
+        """
+        :param whitelist: les valeurs cherchées
+        :return int: le nombre de lignes dont la valeur est dans la liste blanche, sans construire la liste des
+            positions
+        """
+        return sum(len(self.positions[value]) for value in set(whitelist) if value in self.positions)
+
+    def find_list(self, whitelist):
+        """
+        :param whitelist: les valeurs cherchées
+        :return list[int]: les positions des lignes dont la valeur est dans la liste blanche, dans l'ordre de la table
+        """
+        groups = [self.positions[value] for value in set(whitelist) if value in self.positions]
+        if len(groups) == 1:
+            return groups[0]
+        return sorted(chain.from_iterable(groups))
+
+
+class SortedIndex:
+    """
+    Index trié sur une colone numérique : les valeurs et les positions des lignes, dans l'ordre des valeurs
+    """
+
+    def __init__(self, table, column_index):
+        """
+        :param list[tuple] table: la table indexée
+        :param int column_index: l'index de la colone, dont les cases sont des nombres ou NULL
+        """
+        pairs = sorted(
+            (float(row[column_index]), position) for position, row in enumerate(table) if row[column_index] != NULL
+        )
+        self.values = [value for value, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def find_range(self, comparator, number):
+        """
+        :param str comparator: le signe qui permet de comparer (< ou >)
+        :param int | float number: le nombre auquel les valeurs sont comparées
+        :return list[int]: les positions des lignes qui respectent la comparaison, dans l'ordre de la table
+        """
+        number = float(number)
+        if comparator == '<':
+            return sorted(self.positions[:bisect_left(self.values, number)])
+        elif comparator == '>':
+            return sorted(self.positions[bisect_right(self.values, number):])
+        else:
+            raise ValueError('Unkonw comparator ' + comparator)
+
+    def count_range(self, comparator, number):
+        """
+        :param str comparator: le signe qui permet de comparer (< ou >)
+        :param int | float number: le nombre auquel les valeurs sont comparées
+        :return int: le nombre de lignes qui respectent la comparaison, en O(log n)
+        """
+        number = float(number)
+        if comparator == '<':
+            return bisect_left(self.values, number)
+        elif comparator == '>':
+            return len(self.values) - bisect_right(self.values, number)
+        else:
+            raise ValueError('Unkonw comparator ' + comparator)
+
+
+class IndexedTable(list):
+    """
+    Table (liste de tuples) avec des index secondaires sur certaines colones, construits à la demande
+    """
+
+    def __init__(self, rows=(), hash_columns=(), sorted_columns=()):
+        """
+        :param rows: les lignes de la table
+        :param tuple[int] hash_columns: les colones qui peuvent avoir un index de hachage
+        :param tuple[int] sorted_columns: les colones numériques qui peuvent avoir un index trié
+        """
+        super().__init__(rows)
+        self.hash_columns = tuple(hash_columns)
+        self.sorted_columns = tuple(sorted_columns)
+        self.indexes = dict()
+        self.version = next(_versions)
+
+    def get_index(self, index_type, column_index):
+        """
+        Permet d'obtenir un index de la table, construit lors du premier appel
+        :param type index_type: HashIndex ou SortedIndex
+        :param int column_index: l'index de la colone
+        :return HashIndex | SortedIndex | None: l'index, ou None si la colone n'est pas indexée avec ce type d'index
+        """
+        columns = self.hash_columns if index_type is HashIndex else self.sorted_columns
+        if column_index not in columns:
+            return None
+        key = (index_type, column_index)
+        if key not in self.indexes:
+            self.indexes[key] = index_type(self, column_index)
+        return self.indexes[key]
+
+    def _is_selective(self, matches, max_selectivity):
+        """
+        :param int matches: le nombre de lignes trouvées par un index
+        :param float max_selectivity: la part maximale des lignes trouvées, None pour ne pas limiter
+        :return bool: true si l'index doit être utilisé
+        """
+        return max_selectivity is None or matches <= max_selectivity * len(self)
+
+    def find_value(self, column_index, value, max_selectivity=None):
+        """
+        :param float max_selectivity: la part maximale des lignes trouvées pour utiliser l'index, None pour ne pas
+            limiter
+        :return list[int] | None: les positions trouvées par filter_table_by_value, None sans index sur la colone ou
+            si plus de max_selectivity des lignes sont trouvées
+        """
+        index = self.get_index(HashIndex, column_index)
+        if index is None or not self._is_selective(index.count_value(value), max_selectivity):
+            return None
+        return index.find_value(value)
+
+    def find_list(self, column_index, whitelist, max_selectivity=None):
+        """
+        :param float max_selectivity: comme pour find_value
+        :return list[int] | None: les positions trouvées par filter_table_by_list, None sans index sur la colone ou si
+            plus de max_selectivity des lignes sont trouvées
+        """
+        index = self.get_index(HashIndex, column_index)
+        if index is None or not self._is_selective(index.count_list(whitelist), max_selectivity):
+            return None
+        return index.find_list(whitelist)
+
+    def find_range(self, column_index, comparator, number, max_selectivity=None):
+        """
+        :param float max_selectivity: comme pour find_value
+        :return list[int] | None: les positions trouvées par filter_table_by_comparator, None sans index sur la colone
+            ou si plus de max_selectivity des lignes sont trouvées
+        """
+        index = self.get_index(SortedIndex, column_index)
+        if index is None or not self._is_selective(index.count_range(comparator, number), max_selectivity):
+            return None
+        return index.find_range(comparator, number)
+
+    def count_value(self, column_index, value):
+        """
+        :return int | None: le nombre de lignes trouvées par find_value, None sans index sur la colone
+        """
+        index = self.get_index(HashIndex, column_index)
+        return None if index is None else index.count_value(value)
+
+    def count_list(self, column_index, whitelist):
+        """
+        :return int | None: le nombre de lignes trouvées par find_list, None sans index sur la colone
+        """
+        index = self.get_index(HashIndex, column_index)
+        return None if index is None else index.count_list(whitelist)
+
+    def count_range(self, column_index, comparator, number):
+        """
+        :return int | None: le nombre de lignes trouvées par find_range, None sans index sur la colone
+        """
+        index = self.get_index(SortedIndex, column_index)
+        return None if index is None else index.count_range(comparator, number)
+
+    def __reduce_ex__(self, protocol):
+        # Les index ne sont pas enregistrés avec la table, ils seront reconstruits à la demande
+        return IndexedTable, (list(self), self.hash_columns, self.sorted_columns)
+
+
+def _clearing_indexes(method):
+    """
+    :param method: une méthode de list qui modifie la liste
+    :return: la même méthode, qui efface aussi les index de la table et change sa version
+    """
+    def wrapper(self, *args, **kwargs):
+        self.indexes.clear()
+        self.version = next(_versions)
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+for _name in ('append', 'extend', 'insert', 'pop', 'remove', 'sort', 'reverse', 'clear',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(IndexedTable, _name, _clearing_indexes(getattr(list, _name)))
+del _name
@@ -0,0 +1,112 @@
+"""
+----- Chargement de plusieurs fichiers CSV en parallèle -----
+
+get_tables_content lit un ou plusieurs fichiers (une liste de chemins ou un motif glob comme 'villes_*.csv') avec un
+ProcessPoolExecutor. Chaque fichier est découpé en morceaux d'environ chunk_size octets, dont les limites sont
+placées au début d'une ligne : un gros fichier est donc lu par plusieurs processus, et plusieurs petits fichiers sont
+lus en même temps.
+
+Le résultat est la même table que get_table_content (ou la concaténation des tables des fichiers, dans l'ordre des
+chemins) : les morceaux sont remis dans l'ordre. Les fichiers ne doivent pas contenir de retour à la ligne entre
+guillemets, puisque les morceaux sont coupés sur les retours à la ligne.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from parsers import decode_block, split_block
+from tables import CSV_DELIMITER
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def get_file_names(paths):
+    """
+    Permet d'obtenir la liste des fichiers à lire
+    :param str | list[str] paths: un chemin, un motif glob, ou une liste de chemins ou de motifs
+    :return list[str]: les chemins des fichiers, les motifs glob étant remplacés par les fichiers triés par nom
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    file_names = list()
+    for path in paths:
+        if glob.has_magic(path):
+            file_names.extend(sorted(glob.glob(path)))
+        else:
+            file_names.append(path)
+    return file_names
+
+
+def get_byte_ranges(file_name, chunk_size=CHUNK_SIZE):
+    """
+    Permet de découper un fichier en morceaux d'environ chunk_size octets, qui commencent tous au début d'une ligne
+    :param str file_name: l'emplacement du fichier
+    :param int chunk_size: la taille visée pour chaque morceau, en octets
+    :return list[tuple[int, int]]: le début et la fin de chaque morceau
+    """
+    size = os.path.getsize(file_name)
+    limits = [0]
+    with open(file_name, 'rb') as file:
+        while limits[-1] + chunk_size < size:
+            # On se place juste avant la limite visée, puis on va au bout de la ligne en cours
+            file.seek(limits[-1] + chunk_size - 1)
+            file.readline()
+            if file.tell() >= size:
+                break
+            limits.append(file.tell())
+    limits.append(size)
+    return list(zip(limits, limits[1:]))
+
+
+def parse_byte_range(file_name, start, end, delimiter=CSV_DELIMITER):
+    """
+    Permet de lire les lignes d'un morceau de fichier, comme get_table_content
+    :param str file_name: l'emplacement du fichier
+    :param int start: la position du premier octet du morceau
+    :param int end: la position qui suit le dernier octet du morceau
+    :param str delimiter: le délimiteur du fichier CSV
+    :return list[tuple]: les lignes du morceau
+    """
+    with open(file_name, 'rb') as file:
+        file.seek(start)
+        return parse_bytes(file.read(end - start), delimiter)
+
+
+def parse_bytes(content, delimiter=CSV_DELIMITER):
+    """
+    Permet de lire des lignes CSV complètes encodées en UTF-8
+    :param bytes content: les lignes
+    :param str delimiter: le délimiteur du fichier CSV
+    :return list[tuple]: les lignes lues
+    """
+    return split_block(decode_block(content), delimiter)
+
+
+def get_tables_content(paths, workers=None, chunk_size=CHUNK_SIZE, delimiter=CSV_DELIMITER):
+    """
+    Permet de lire un ou plusieurs fichiers CSV en parallèle et d'obtenir une seule table
+    :param str | list[str] paths: un chemin, un motif glob, ou une liste de chemins ou de motifs
+    :param int workers: le nombre de processus, None pour le nombre de processeurs. Avec 1, tout est lu dans le
+        processus courant
+    :param int chunk_size: la taille visée pour chaque morceau de fichier, en octets
+    :param str delimiter: le délimiteur des fichiers CSV
+    :return list[tuple]: les lignes de tous les fichiers, dans l'ordre
+    """
+    tasks = [
+        (file_name, start, end)
+        for file_name in get_file_names(paths)
+        for start, end in get_byte_ranges(file_name, chunk_size)
+    ]
+    file_names, starts, ends = zip(*tasks) if tasks else ((), (), ())
+    delimiters = [delimiter] * len(tasks)
+
+    if workers == 1 or len(tasks) <= 1:
+        chunks = map(parse_byte_range, file_names, starts, ends, delimiters)
+        return [row for chunk in chunks for row in chunk]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        table = list()
+        for chunk in executor.map(parse_byte_range, file_names, starts, ends, delimiters):  # Dans l'ordre des tâches
+            table.extend(chunk)
+        return table
@@ -0,0 +1,190 @@
+"""
+----- Cache des résultats des opérations sur les tables -----
+
+Plusieurs questions refont les mêmes calculs : les pays d'Europe, ceux d'Amérique du Sud, les pays où l'on parle
+français ou le nombre de villes par pays. Les fonctions de tables décorées avec memoized gardent leur résultat dans un
+cache LRU de taille limitée, indexé par (version de la table, nom de l'opération, arguments) : le deuxième appel
+identique renvoie directement le résultat du premier.
+
+Seules les IndexedTable (voir le module indexes) sont mises en cache, car leur version change à chaque modification :
+une table modifiée ou rechargée n'a plus la même clé. Une table résultat est elle même renvoyée sous forme
+d'IndexedTable, pour que les opérations enchainées sur un résultat soient aussi mises en cache. Les appels en mode
+paresseux (lazy vrai, donné par son nom ou par sa position), sur une liste classique ou avec des arguments qui ne
+peuvent pas servir de clé (une liste de listes...) ne passent pas par le cache.
+
+Une table résultat en cache est partagée par tous les appels : si elle est modifiée, elle change de version et n'est
+plus renvoyée par le cache. Les résultats de type dict (summarize_column, group_by, summarize_column_by_group) sont
+copiés sur deux niveaux à chaque appel : le dict, et ses valeurs qui sont des dict ou des listes. Un appelant peut
+donc les modifier sans changer le résultat des appels suivants.
+"""
+
+import inspect
+from collections import OrderedDict
+from functools import wraps
+
+from indexes import IndexedTable
+
+RESULT_CACHE_SIZE = 128
+
+_MISSING = object()
+
+
+def _freeze(value):
+    """
+    Permet de transformer un argument en une valeur utilisable dans une clé de dict
+    :param value: l'argument
+    :return: l'argument, avec les listes remplacées par des tuples et les sets par des frozensets
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def _copy_result(result):
+    """
+    Permet de copier un résultat de type dict avant de le renvoyer, pour que le résultat gardé ne soit jamais modifié
+    :param result: le résultat gardé
+    :return: une copie du dict et de ses valeurs modifiables (dict, listes), ou le résultat lui même
+    """
+    if not isinstance(result, dict):
+        return result
+    return {key: value.copy() if isinstance(value, (dict, list)) else value for key, value in result.items()}
+
+
+class ResultCache:
+    """
+    Cache LRU des résultats, avec le nombre de résultats trouvés (hits) et non trouvés (misses)
+    """
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE):
+        """
+        :param int maxsize: le nombre maximal de résultats gardés, les moins récemment utilisés sont retirés
+        """
+        self.maxsize = maxsize
+        self.enabled = True
+        self.entries = OrderedDict()  # clé -> (résultat, version du résultat)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        :param tuple key: la clé du résultat
+        :return: le résultat, ou _MISSING s'il n'est pas dans le cache ou a été modifié
+        """
+        entry = self.entries.get(key)
+        if entry is None or (isinstance(entry[0], IndexedTable) and entry[0].version != entry[1]):
+            self.misses += 1
+            return _MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, result):
+        """
+        :param tuple key: la clé du résultat
+        :param result: le résultat à garder
+        """
+        self.entries[key] = (result, result.version if isinstance(result, IndexedTable) else None)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, version):
+        """
+        Permet de retirer tous les résultats calculés à partir d'une version d'une table, y compris ceux calculés à
+        partir de ces résultats
+        :param int version: la version de la table
+        """
+        versions = [version]
+        while versions:
+            version = versions.pop()
+            for key in [key for key in self.entries if key[0] == version]:
+                result_version = self.entries.pop(key)[1]  # La version du résultat quand il a été gardé
+                if result_version is not None:
+                    versions.append(result_version)
+
+    def clear(self):
+        """
+        Permet de vider le cache et de remettre les statistiques à zéro
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self):
+        """
+        :return dict: les statistiques du cache (hits, misses, size et maxsize)
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'maxsize': self.maxsize}
+
+
+results_cache = ResultCache()
+
+
+def get_key(table, name, args, kwargs):
+    """
+    :param IndexedTable table: la table passée en premier argument
+    :param str name: le nom de la fonction
+    :param tuple args: les autres arguments
+    :param dict kwargs: les arguments nommés
+    :return tuple: la clé du résultat dans results_cache. Lève TypeError si un argument ne peut pas servir de clé
+    """
+    key = (table.version, name, _freeze(args), _freeze(sorted(kwargs.items())))
+    hash(key)
+    return key
+
+
+def store_result(key, result):
+    """
+    Permet de garder un résultat dans results_cache, comme le fait memoized
+    :param tuple key: la clé du résultat, voir get_key
+    :param result: le résultat
+    :return: le résultat gardé, une IndexedTable si c'est une liste
+    """
+    if type(result) is list:
+        result = IndexedTable(result)
+    results_cache.put(key, result)
+    return result
+
+
+def cached_result(table, name, args, kwargs, compute):
+    """
+    Permet de passer par results_cache pour un calcul sur une table, comme le fait memoized
+    :param IndexedTable table: la table
+    :param str name: le nom du calcul
+    :param tuple args: les arguments du calcul, qui servent de clé avec la table et le nom
+    :param dict kwargs: les arguments nommés du calcul
+    :param compute: une fonction sans argument qui fait le calcul
+    :return: le résultat, depuis le cache si possible
+    """
+    if not results_cache.enabled or not isinstance(table, IndexedTable):
+        return compute()
+    try:
+        key = get_key(table, name, args, kwargs)
+    except TypeError:  # Un argument ne peut pas servir de clé
+        return compute()
+    result = results_cache.get(key)
+    if result is _MISSING:
+        result = store_result(key, compute())
+    return _copy_result(result)
+
+
+def memoized(function):
+    """
+    Décorateur qui garde les résultats d'une fonction de tables dans results_cache. Le premier argument de la fonction
+    doit être la table
+    :param function: la fonction à décorer
+    :return: la fonction décorée
+    """
+    parameters = list(inspect.signature(function).parameters)
+    # Position de lazy parmi les arguments qui suivent la table, None si la fonction n'a pas de paramètre lazy
+    lazy_position = parameters.index('lazy') - 1 if 'lazy' in parameters else None
+
+    @wraps(function)
+    def wrapper(table, *args, **kwargs):
+        if lazy_position is not None and (kwargs.get('lazy') or (len(args) > lazy_position and args[lazy_position])):
+            return function(table, *args, **kwargs)
+        return cached_result(table, function.__name__, args, kwargs, lambda: function(table, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,271 @@
+"""
+----- Moteurs de lecture des fichiers CSV -----
+
+get_table_content peut lire un fichier avec trois moteurs, qui renvoient exactement les mêmes lignes :
+- 'csv' : codecs.open et csv.reader, ligne par ligne
+- 'split' : le fichier est lu par blocs de BLOCK_SIZE caractères (open(..., newline='')), coupés au dernier retour
+  à la ligne. Chaque bloc est découpé avec str.split('\\n') puis str.split(';'), sans passer par csv
+- 'bytes' : comme 'split', mais les blocs sont lus en octets et décodés en une fois, après avoir été coupés au dernier
+  retour à la ligne (un caractère UTF-8 n'est donc jamais coupé). Un bloc sans caractère non ASCII, comme la plupart
+  des blocs de villes.csv, est décodé en ASCII
+
+Les fichiers du projet ne contiennent aucun guillemet. Dans un bloc qui contient un guillemet ou un \\r, seules les
+lignes concernées sont lues avec csv.reader, comme avec le moteur 'csv' : les guillemets et les retours à la ligne
+entre guillemets sont gérés. Comme pour csv.reader, un guillemet n'ouvre une case entre guillemets qu'au début d'une
+case (en début de ligne ou après le délimiteur) : ailleurs, comme dans O"Brien, c'est un caractère comme un autre.
+Un bloc n'est jamais coupé au milieu d'une case entre guillemets : la fin du bloc est gardée pour être lue avec le
+suivant. Au delà de MAX_CARRY_BLOCKS blocs gardés (une case entre guillemets jamais fermée), le reste du fichier est
+lu avec csv.reader, sans garder plus de texte en mémoire.
+"""
+
+import codecs
+import csv
+import io
+import re
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+PARSE_ENGINES = ('csv', 'split', 'bytes')
+
+# Taille des blocs lus par les moteurs 'split' et 'bytes', en caractères ou en octets
+BLOCK_SIZE = 1024 * 1024
+
+# Nombre maximal de blocs gardés pour être lus avec le bloc suivant, au delà la lecture continue avec csv.reader
+MAX_CARRY_BLOCKS = 4
+
+# Caractères qui demandent csv.reader pour lire une ligne
+_SPECIAL_CHARS = re.compile('["\r]')
+
+# Nombre de caractères ou d'octets parcourus à la fois pour trouver les cases entre guillemets d'un bloc
+_QUOTE_SCAN_SIZE = 8 * 1024
+
+
+@lru_cache(maxsize=None)
+def _get_quote_patterns(delimiter, binary):
+    """
+    Une case entre guillemets commence par un guillemet en début de ligne ou après le délimiteur, et se termine par un
+    guillemet qui n'est pas suivi d'un autre ("" est un guillemet dans la case). Les autres guillemets sont des
+    caractères comme les autres, comme pour csv.reader
+    :param str delimiter: le délimiteur du fichier CSV
+    :param bool binary: true pour des expressions sur des bytes
+    :return tuple: l'expression qui va jusqu'à la première case entre guillemets non fermée (ou jusqu'à la fin), celle
+        qui va jusqu'à la fin d'une ligne avec ses cases entre guillemets, et celle d'une case entre guillemets
+    """
+    quoted_field = '(?<![^\r\n{0}])"[^"]*(?:""[^"]*)*"(?!")'.format(re.escape(delimiter))
+    other_quote = '(?<=[^\r\n{0}])"'.format(re.escape(delimiter))
+    patterns = ('(?:[^"]+|{}|{})*'.format(quoted_field, other_quote),
+                '(?:[^"\n]+|{}|{})*'.format(quoted_field, other_quote),
+                quoted_field)
+    return tuple(re.compile(pattern.encode() if binary else pattern) for pattern in patterns)
+
+
+def _get_block_end(text, delimiter, end):
+    """
+    :param str | bytes text: des lignes, qui commencent au début d'une ligne
+    :param str delimiter: le délimiteur du fichier CSV
+    :param int end: la position qui suit le dernier retour à la ligne de text
+    :return int: la position qui suit le dernier retour à la ligne avant end qui n'est pas dans une case entre
+        guillemets, 0 s'il n'y en a pas
+    """
+    prefix, _, quoted_field = _get_quote_patterns(delimiter, isinstance(text, bytes))
+    newline = b'\n' if isinstance(text, bytes) else '\n'
+    position = 0
+    block_end = 0  # Dernière coupure possible déjà trouvée
+    while position < end:
+        # Le texte est parcouru par morceaux de lignes complètes : la mémoire utilisée par une expression régulière
+        # grandit avec le texte parcouru
+        window = min(text.rfind(newline, position, position + _QUOTE_SCAN_SIZE) + 1 or end, end)
+        stop = prefix.match(text, position, window).end()
+        if stop == window:
+            position = block_end = window
+            continue
+        field = quoted_field.match(text, stop, end)  # Case qui commence à stop, fermée après le morceau ?
+        if field is not None:
+            position = field.end()
+            continue
+        # Case non fermée avant end : coupure au dernier retour à la ligne qui n'est pas entre guillemets avant stop
+        while True:
+            cut = text.rfind(newline, position, stop) + 1
+            if cut <= position:
+                return block_end
+            stop = prefix.match(text, position, cut).end()
+            if stop == cut:
+                return cut
+    return block_end
+
+
+def _get_record_end(text, delimiter, start):
+    """
+    :param str text: des lignes
+    :param str delimiter: le délimiteur du fichier CSV
+    :param int start: le début d'une ligne
+    :return int: la position qui suit le retour à la ligne qui termine cette ligne, en comptant les retours à la ligne
+        entre guillemets, ou la fin de text
+    """
+    end = _get_quote_patterns(delimiter, False)[1].match(text, start).end()
+    if end == len(text) or text[end] == '"':  # Case entre guillemets fermée après la fin de text
+        return len(text)
+    return end + 1
+
+
+def iter_blocks(file, delimiter, block_size=BLOCK_SIZE):
+    """
+    Permet de lire un fichier par blocs de lignes complètes
+    :param file: un fichier ouvert, en mode texte (avec newline='') ou binaire
+    :param str delimiter: le délimiteur du fichier CSV
+    :param int block_size: le nombre de caractères ou d'octets lus à la fois
+    :return: les blocs, str ou bytes. Chaque bloc se termine par un retour à la ligne, sauf le dernier si le fichier ne
+        se termine pas par un retour à la ligne, et ne coupe jamais une case entre guillemets. Si plus de
+        MAX_CARRY_BLOCKS blocs sont gardés sans pouvoir être coupés, le générateur s'arrête et renvoie (StopIteration)
+        le texte gardé, dont la lecture est à continuer avec le fichier
+    """
+    rest = None
+    while True:
+        block = file.read(block_size)
+        if not block:
+            break
+        if rest:
+            block = rest + block  # rest est limité à MAX_CARRY_BLOCKS blocs
+        binary = isinstance(block, bytes)
+        newline = b'\n' if binary else '\n'
+        end = block.rfind(newline) + 1
+        if end and (b'"' if binary else '"') in block:
+            end = _get_block_end(block, delimiter, end)  # Coupure avant la ligne de la case entre guillemets
+        if end == 0:  # Pas de ligne complète
+            if len(block) > MAX_CARRY_BLOCKS * block_size:
+                return block
+            rest = block
+            continue
+        rest = block[end:]
+        yield block[:end]
+    if rest:
+        yield rest
+
+
+def iter_block_rows(file, delimiter, block_size=BLOCK_SIZE, columns=None):
+    """
+    Permet de lire les lignes d'un fichier par blocs, pour les moteurs 'split' et 'bytes'
+    :param file: un fichier ouvert, en mode texte (avec newline='') ou binaire
+    :param str delimiter: le délimiteur du fichier CSV
+    :param int block_size: le nombre de caractères ou d'octets lus à la fois
+    :param tuple[int] columns: les index des colones à garder, dans l'ordre voulu. None pour garder toutes les colones
+    :return: les lignes du fichier, une par une, sous forme de tuples de cases
+    """
+    blocks = iter_blocks(file, delimiter, block_size)
+    while True:
+        try:
+            block = next(blocks)
+        except StopIteration as stop:
+            rest = stop.value
+            break
+        yield from split_block(decode_block(block) if isinstance(block, bytes) else block, delimiter, columns)
+    if rest is None:
+        return
+    # Case entre guillemets jamais fermée : la ligne en cours est complétée, puis csv.reader lit la suite du fichier
+    # au fil de l'eau, sans recopier le texte déjà lu
+    rest += file.readline()
+    if isinstance(rest, bytes):
+        rest = rest.decode('UTF-8')
+        file = io.TextIOWrapper(file, encoding='UTF-8', newline='')
+    lines = chain(io.StringIO(rest, newline=''), file)
+    yield from map(get_projection(columns), csv.reader(lines, delimiter=delimiter))
+
+
+def decode_block(block):
+    """
+    :param bytes block: des lignes complètes encodées en UTF-8
+    :return str: les lignes décodées
+    """
+    return block.decode('ascii') if block.isascii() else block.decode('UTF-8')
+
+
+def get_projection(columns):
+    """
+    Permet d'obtenir la fonction qui ne garde que certaines colones d'une ligne
+    :param tuple[int] columns: les index des colones à garder, dans l'ordre voulu. None pour toutes les colones
+    :return: une fonction qui prend une ligne (tuple ou liste) et renvoie un tuple
+    """
+    if columns is None:
+        return tuple
+    if len(columns) == 1:  # itemgetter avec un seul index renvoie la case, pas un tuple
+        column_index = columns[0]
+        return lambda row: (row[column_index],)
+    return itemgetter(*columns)
+
+
+def split_block(block, delimiter, columns=None):
+    """
+    Permet de découper des lignes complètes en cases, comme csv.reader
+    :param str block: les lignes, en général un bloc renvoyé par iter_blocks
+    :param str delimiter: le délimiteur du fichier CSV
+    :param tuple[int] columns: les index des colones à garder, dans l'ordre voulu. None pour garder toutes les colones
+    :return list[tuple[str]]: les lignes, un tuple de cases par ligne
+    """
+    if '"' in block or '\r' in block:
+        return _split_special_block(block, delimiter, columns)
+    lines = block.split('\n')
+    if not lines[-1]:  # Le bloc se termine par un retour à la ligne
+        lines.pop()
+    if columns is None:
+        # Les tuples sont créés directement : une liste par ligne ferait travailler le ramasse-miettes pour rien.
+        # csv.reader renvoie une ligne sans case pour une ligne vide, et non ('',)
+        return [tuple(line.split(delimiter)) if line else () for line in lines]
+    # Les cases après la dernière colone gardée restent ensemble dans la dernière case de la liste, qui n'est pas
+    # gardée : une seule liste par ligne, et le seul tuple créé est celui de la projection
+    projection = get_projection(columns)
+    max_split = max(columns) + 1
+    return [projection(line.split(delimiter, max_split) if line else ()) for line in lines]
+
+
+def _split_special_block(block, delimiter, columns):
+    """
+    split_block pour un bloc qui contient des guillemets ou des \\r : seules les lignes qui en contiennent sont lues
+    avec csv.reader (avec les lignes suivantes pour une case entre guillemets sur plusieurs lignes)
+    :return list[tuple[str]]: les lignes, un tuple de cases par ligne
+    """
+    projection = get_projection(columns)
+    rows = list()
+    position = 0
+    while position < len(block):
+        special = _SPECIAL_CHARS.search(block, position)
+        if special is None:
+            rows.extend(split_block(block[position:], delimiter, columns))
+            break
+        start = max(block.rfind('\n', position, special.start()) + 1, position)
+        if start > position:
+            rows.extend(split_block(block[position:start], delimiter, columns))
+        end = _get_record_end(block, delimiter, start)
+        # Les lignes suivantes qui demandent aussi csv.reader sont lues avec la même
+        special = _SPECIAL_CHARS.search(block, end)
+        while special is not None and block.find('\n', end, special.start()) == -1:
+            end = _get_record_end(block, delimiter, end)
+            special = _SPECIAL_CHARS.search(block, end)
+        rows.extend(map(projection, csv.reader(io.StringIO(block[start:end], newline=''), delimiter=delimiter)))
+        position = end
+    return rows
+
+
+def iter_rows(file_name, delimiter, engine='csv', block_size=BLOCK_SIZE, columns=None):
+    """
+    Permet de lire les lignes d'un fichier CSV encodé en UTF-8 avec un des moteurs de PARSE_ENGINES
+    :param str file_name: l'emplacement du fichier
+    :param str delimiter: le délimiteur du fichier CSV
+    :param str engine: le moteur de lecture, 'csv', 'split' ou 'bytes'
+    :param int block_size: la taille des blocs pour les moteurs 'split' et 'bytes'
+    :param tuple[int] columns: les index des colones à garder, dans l'ordre voulu. None pour garder toutes les colones
+    :return: les lignes du fichier, une par une, sous forme de tuples de cases, ou de listes avec le moteur 'csv' et
+        sans columns
+    """
+    if engine == 'csv':
+        with codecs.open(file_name, encoding='UTF-8') as file:
+            rows = csv.reader(file, delimiter=delimiter)
+            yield from rows if columns is None else map(get_projection(columns), rows)
+    elif engine == 'split':
+        with open(file_name, encoding='UTF-8', newline='') as file:
+            yield from iter_block_rows(file, delimiter, block_size, columns)
+    elif engine == 'bytes':
+        with open(file_name, 'rb') as file:
+            yield from iter_block_rows(file, delimiter, block_size, columns)
+    else:
+        raise ValueError('Unkonw parse engine ' + engine)
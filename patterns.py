@@ -0,0 +1,107 @@
+"""
+----- Expressions régulières et validation des nombres -----
+
+Les expressions régulières sont compilées une seule fois et gardées dans un cache LRU de taille limitée, indexé par
+(expression, flags).
+
+get_regex_matcher reconnait les expressions simples et les remplace par des opérations sur les strings, plus rapides
+qu'une expression régulière :
+- '^pa' ou 'pa' (re.match cherche toujours au début) : str.startswith
+- '.*Republic.*' ou '.*Republic' : l'opérateur in
+- '^Paris$' : l'égalité
+Avec re.IGNORECASE, les deux côtés sont mis en minuscules avec str.lower(). Quelques caractères Unicode particuliers
+(le signe Kelvin, le s long...) sont considérés égaux à une lettre ASCII par re mais pas par str.lower().
+Comme les cases des fichiers CSV ne contiennent pas de retour à la ligne, le cas où '.' ne reconnait pas '\\n' n'est
+pas traité.
+"""
+
+import re
+from functools import lru_cache
+
+REGEX_CACHE_SIZE = 256
+
+# Caractères qui ont un sens particulier dans une expression régulière
+REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(regex, flags=0):
+    """
+    Permet d'obtenir une expression régulière compilée, gardée en cache
+    :param str regex: l'expression régulière
+    :param int flags: les flags du module re
+    :return re.Pattern: l'expression compilée
+    """
+    return re.compile(regex, flags)
+
+
+def _is_literal(text):
+    """
+    :param str text: le texte à tester
+    :return bool: true si le texte ne contient aucun caractère spécial d'expression régulière
+    """
+    return not REGEX_SPECIAL_CHARACTERS.intersection(text)
+
+
+def classify_regex(regex):
+    """
+    Permet de reconnaitre les expressions régulières qui peuvent être remplacées par une opération sur les strings,
+    en gardant le comportement de re.match
+    :param str regex: l'expression régulière
+    :return tuple[str, str]: le type ('prefix', 'contains', 'exact' ou 'regex') et le texte à chercher
+    """
+    body = regex[1:] if regex.startswith('^') else regex
+    if body.startswith('.*'):
+        body = body[2:]
+        if body.endswith('.*'):
+            body = body[:-2]
+        if body and _is_literal(body):
+            return 'contains', body
+    else:
+        if body.endswith('.*'):
+            body = body[:-2]
+        if _is_literal(body):
+            return 'prefix', body
+        if body.endswith('$') and not body.endswith('\\$') and _is_literal(body[:-1]):
+            return 'exact', body[:-1]
+    return 'regex', regex
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def get_regex_matcher(regex, flags=0):
+    """
+    Permet d'obtenir une fonction qui teste si une string respecte l'expression régulière, comme re.match.
+    Les expressions simples sont remplacées par des opérations sur les strings (voir classify_regex)
+    :param str regex: l'expression régulière
+    :param int flags: les flags du module re, seul re.IGNORECASE est accepté pour les expressions simples
+    :return: une fonction qui prend une string et renvoie un booléen
+    """
+    kind, text = classify_regex(regex)
+    if kind == 'regex' or flags & ~re.IGNORECASE:
+        match = compile_regex(regex, flags).match
+        return lambda cell: match(cell) is not None
+
+    if flags & re.IGNORECASE:
+        text = text.lower()
+        if kind == 'prefix':
+            return lambda cell: cell.lower().startswith(text)
+        elif kind == 'contains':
+            return lambda cell: text in cell.lower()
+        return lambda cell: cell.lower() == text
+
+    if kind == 'prefix':
+        return lambda cell: cell.startswith(text)
+    elif kind == 'contains':
+        return lambda cell: text in cell
+    return lambda cell: cell == text
+
+
+def is_number(cell):
+    """
+    Permet de tester si une string est un nombre positif, entier ou à virgule, sans expression régulière.
+    Equivalent de re.match('^\\d+(\\.\\d+)?$', cell), sauf pour un retour à la ligne final (accepté par $)
+    :param str cell: la string à tester
+    :return bool: true si la string est un nombre
+    """
+    integer, dot, decimal = cell.partition('.')
+    return integer.isdecimal() and (not dot or decimal.isdecimal())
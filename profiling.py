@@ -0,0 +1,233 @@
+"""
+----- Mesure du temps passé dans chaque opération sur les tables -----
+
+Les fonctions principales de tables (lecture, filtres, jointures, résumés, affichage...) sont décorées avec profiled.
+Tant que la mesure n'est pas activée, le décorateur ne fait qu'un test sur un booléen avant d'appeler la fonction.
+
+Une fois activée avec enable(), chaque appel enregistre :
+- le temps écoulé (wall time)
+- le nombre de lignes reçues (premier argument) et renvoyées, quand ce sont des tables (None pour un générateur ou
+  un autre résultat, affiché '-' dans le rapport et dans le JSON)
+- la mémoire allouée et encore occupée après l'appel, avec enable(memory=True) (tracemalloc, beaucoup plus lent)
+
+Les mesures sont regroupées par section : start_section est appelée par print_state dans projet.py, chaque question
+est donc une section. Le temps d'une section qui n'est passé dans aucune fonction mesurée est compté dans 'autre'.
+Les appels imbriqués (un filtre appelé par une jointure...) sont comptés dans leur fonction, mais seuls les appels de
+premier niveau sont comptés dans le temps mesuré de la section.
+
+    python projet.py --profile               # affiche le rapport de mesure après le rapport
+    python projet.py --profile mesures.json  # et l'écrit au format JSON
+"""
+
+import json
+import time
+import tracemalloc
+from functools import wraps
+
+# Nombre de fonctions affichées par section dans print_report
+REPORT_TOP_FUNCTIONS = 5
+
+_enabled = False
+_trace_memory = False
+_depth = 0
+_sections = list()
+_current_section = None
+
+
+def enable(memory=False):
+    """
+    Permet d'activer la mesure, et d'oublier les mesures précédentes
+    :param bool memory: true pour mesurer aussi la mémoire allouée (tracemalloc)
+    """
+    global _enabled, _trace_memory
+    reset()
+    _enabled = True
+    _trace_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    start_section('Début')
+
+
+def disable():
+    """
+    Permet d'arrêter la mesure. Les mesures déjà faites sont gardées
+    """
+    global _enabled
+    _close_section()
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled():
+    """
+    :return bool: true si la mesure est activée
+    """
+    return _enabled
+
+
+def reset():
+    """
+    Permet d'oublier toutes les mesures
+    """
+    global _current_section
+    _sections.clear()
+    _current_section = None
+
+
+def start_section(name):
+    """
+    Permet de commencer une nouvelle section : les appels suivants lui sont attribués. Ne fait rien si la mesure n'est
+    pas activée
+    :param str name: le nom de la section
+    """
+    global _current_section
+    if not _enabled:
+        return
+    _close_section()
+    _current_section = {'name': name, 'start': time.perf_counter(), 'wall': 0.0, 'measured': 0.0, 'functions': dict()}
+    _sections.append(_current_section)
+
+
+def _close_section():
+    """
+    Permet de terminer la section en cours, en calculant son temps total
+    """
+    global _current_section
+    if _current_section is not None:
+        _current_section['wall'] = time.perf_counter() - _current_section.pop('start')
+        _current_section = None
+
+
+def _count_rows(table):
+    """
+    :param table: un argument ou un résultat d'une fonction
+    :return int | None: le nombre de lignes si c'est une table de taille connue, None sinon
+    """
+    if isinstance(table, (str, bytes, dict)) or not hasattr(table, '__len__'):
+        return None
+    return len(table)
+
+
+def _add_rows(total, rows):
+    """
+    :param int | None total: le nombre de lignes déjà compté, None si aucun appel n'a reçu ou renvoyé de table
+    :param int | None rows: le nombre de lignes de l'appel, None si ce n'est pas une table
+    :return int | None: le nouveau total
+    """
+    if rows is None:
+        return total
+    return rows if total is None else total + rows
+
+
+def _format_rows(rows):
+    """
+    :param int | None rows: un nombre de lignes
+    :return int | str: le nombre, ou '-' s'il n'y a pas de table
+    """
+    return '-' if rows is None else rows
+
+
+def _record(name, wall, rows_in, rows_out, allocated, top_level):
+    """
+    Permet d'ajouter un appel aux mesures de la section en cours
+    """
+    if _current_section is None:
+        start_section('Début')
+    stats = _current_section['functions'].get(name)
+    if stats is None:
+        stats = _current_section['functions'][name] = {
+            'calls': 0, 'wall': 0.0, 'rows_in': None, 'rows_out': None, 'allocated': 0
+        }
+    stats['calls'] += 1
+    stats['wall'] += wall
+    stats['rows_in'] = _add_rows(stats['rows_in'], rows_in)
+    stats['rows_out'] = _add_rows(stats['rows_out'], rows_out)
+    stats['allocated'] += allocated or 0
+    if top_level:
+        _current_section['measured'] += wall
+
+
+def profiled(function):
+    """
+    Décorateur qui mesure les appels d'une fonction quand la mesure est activée
+    :param function: la fonction à mesurer, dont le premier argument est en général une table
+    :return: la fonction décorée
+    """
+    name = function.__name__
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        global _depth
+        if not _enabled:
+            return function(*args, **kwargs)
+
+        allocated_before = tracemalloc.get_traced_memory()[0] if _trace_memory else None
+        _depth += 1
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - start
+            _depth -= 1
+        allocated = tracemalloc.get_traced_memory()[0] - allocated_before if _trace_memory else None
+        _record(name, wall, _count_rows(args[0]) if args else None, _count_rows(result), allocated, _depth == 0)
+        return result
+    return wrapper
+
+
+def get_report():
+    """
+    :return dict: les mesures de chaque section, dans l'ordre, prêtes à être exportées en JSON
+    """
+    sections = list()
+    for section in _sections:
+        wall = section['wall'] if 'start' not in section else time.perf_counter() - section['start']
+        sections.append({
+            'name': section['name'],
+            'wall': wall,
+            'measured': section['measured'],
+            'other': max(0.0, wall - section['measured']),
+            'functions': {name: dict(stats) for name, stats in section['functions'].items()},
+        })
+    return {'memory': _trace_memory, 'sections': sections}
+
+
+def export_json(file_name):
+    """
+    Permet d'écrire les mesures dans un fichier JSON
+    :param str file_name: l'emplacement du fichier
+    """
+    report = get_report()
+    for section in report['sections']:
+        for stats in section['functions'].values():
+            stats['rows_in'] = _format_rows(stats['rows_in'])
+            stats['rows_out'] = _format_rows(stats['rows_out'])
+    with open(file_name, 'w', encoding='UTF-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+def print_report(top=REPORT_TOP_FUNCTIONS):
+    """
+    Permet d'afficher les mesures : pour chaque section, son temps total et les fonctions qui ont pris le plus de temps
+    :param int top: le nombre de fonctions affichées par section
+    """
+    report = get_report()
+    total = sum(section['wall'] for section in report['sections']) or 1.0
+    print_list = ['----- Mesures -----']
+    for section in report['sections']:
+        wall = section['wall'] or 1.0
+        print_list.append('{} : {:.2f} ms ({:.0%} du total)'.format(section['name'], section['wall'] * 1000,
+                                                                   section['wall'] / total))
+        functions = sorted(section['functions'].items(), key=lambda item: item[1]['wall'], reverse=True)
+        for name, stats in functions[:top]:
+            line = '    {:<28} {:>4} appels {:>9.2f} ms {:>4.0%}  lignes {:>8} -> {:<8}'.format(
+                name, stats['calls'], stats['wall'] * 1000, stats['wall'] / wall,
+                _format_rows(stats['rows_in']), _format_rows(stats['rows_out'])
+            )
+            if report['memory']:
+                line += ' {:>10.1f} Ko'.format(stats['allocated'] / 1000)
+            print_list.append(line)
+        print_list.append('    {:<28} {:>16.2f} ms {:>4.0%}'.format('autre', section['other'] * 1000,
+                                                                    section['other'] / wall))
+    print(*print_list, sep='\n')
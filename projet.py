@@ -1,17 +1,21 @@
-import codecs
-import csv
-import re
-
 """
 ----- Tache finale sur le python : manipuler des tableaux -----
 
 Structure :
 - Les noms de fonctions sont en anglais, mais sont documentées en français avec une docstring de style Sphinx
-- Le code est découpé avec des commentaires pour séparer les différentes questions.
-    - Les fonctions sont écrites au fur et à mesure de leur besoin
-- Des variables sont fréquemment supprimées lorsqu'elles ne sont plus utiles avec le mot clé del,
- afin de libérer de la ram
- 
+- Les fonctions de manipulation de tables sont dans le module tables, qui peut être importé sans lancer le rapport
+- Chaque question est une fonction question_<n>, le rapport complet est lancé par main()
+    - python projet.py ou python -m projet
+    - python projet.py --profile [fichier.json] mesure aussi le temps passé dans chaque fonction de tables, question par
+      question (voir le module profiling)
+    - python projet.py --shared-scan lit les villes une seule fois pour toutes les questions (voir get_city_scan) :
+      les résultats sur les villes sont donnés aux questions par leurs derniers arguments, optionnels
+    - python projet.py --jobs [n] exécute les questions dans n processus, en suivant REPORT_TASKS (voir le module
+      runner)
+- Les valeurs dérivées partagées entre plusieurs questions sont renvoyées par la question qui les calcule
+- Les questions qui combinent plusieurs critères sur les pays (23, 24, 25 et 28) utilisent des bitmaps de codes de
+  pays (voir le module bitsets)
+
 Vocabulaire :
 - Une liste de tuples contanant les données sera appelée table
 - Une ligne d'une table sera appelée row
@@ -21,6 +25,30 @@ Vocabulaire :
 Code entièrement rédigé par Julien Wolff, aucun copié collé d'internet n'a été réalisé
 """
 
+import argparse
+from functools import partial
+
+import profiling
+import tables
+from bitsets import CodeDictionary
+from tables import (
+    argmin,
+    display_table,
+    filter_table_by_comparator,
+    filter_table_by_list,
+    filter_table_by_regex,
+    filter_table_by_value,
+    get_unique_values_on_column,
+    group_by,
+    join_on,
+    summarize_column,
+    summarize_column_by_group,
+    top_k,
+)
+from query import Query
+from runner import Task, run_tasks
+from shared_scan import SharedScan
+
 
 def print_state(title, body):
     """
@@ -28,780 +56,711 @@ def print_state(title, body):
     :param str title: le titre de l'exercice
     :param str body: le sous titre, le plus souvent un résumé de l'énoncé
     """
+    profiling.start_section(title)  # Ne fait rien si la mesure n'est pas activée
     print('\n\n-------------------- {} --------------------\n{}\n'
           .format(title.upper(), body))
 
 
-# ---------- INTRO -----------
-print_state('Intro', 'Définition des fonctions principales')
-
-
-def get_table_content(file_name):
-    """
-    Permet d'obtenir les données d'un fichier CSV sous la forme le tuples dans une liste
-    :param str file_name: l'emplacement du fichier
-    :return: le contenu du fichier
-    """
-    file = codecs.open(file_name, encoding='UTF-8')
-    content = csv.reader(file, delimiter=';')
-    content = [tuple(x) for x in content]
-    file.close()
-    return content
-
-
-def display_table(table, start=0, end=None):
-    """
-    Permet d'afficher le contenu d'une table proprement dans la console
-    :param list[tuple] table: la table à afficher
-    :param int start: l'index de la permière ligne d'ou démarrer l'affichage
-    :param int end: l'index de la dernière ligne d'ou arreter l'affichage
-    """
-    stats = {
-        'rows': len(table),
-        'displayed_rows': end if end and end < len(table) else len(table) - start,
-        'columns': len(table[0])
-    }
-    print_list = list()  # Print toutes les lignes d'un coup pour une meilleure performance
-
-    print_list.append('{} lignes ({} affichées), {} colones, {} cellules ({} affichées)'
-                      .format(stats['rows'], stats['displayed_rows'], stats['columns'],
-                              stats['rows'] * stats['columns'],
-                              stats['displayed_rows'] * stats['columns']))
-
-    new_table = table[start:end]
-    row_max_length = get_rows_max_length(new_table)
-
-    for row in new_table:
-        print_list.append('+' + '+'.join(['-' * (length + 2) for length in row_max_length]) + '+')
-        print_list.append(
-            '| ' + ' | '.join(
-                [str(cell) + ' ' * (row_max_length[index] - len(str(cell))) for index, cell in enumerate(row)]
-            ) + ' |')
-
-    print_list.append('+' + '+'.join(['-' * (length + 2) for length in row_max_length]) + '+')
-
-    print(*print_list, sep='\n')  # print toutes les lignes
-
-
-def filter_table_columns(table, *columns):
-    """
-    Permet de ne garder que les colones spécifiées
-    :param list[tuple] table: la table à filtrer
-    :param int columns: numéros des colones à garder
-    :return list[tuple]: la table filtrée
-    """
-    if not columns:
-        return table
-    else:
-        new_table = []
-        for index, row in enumerate(table):
-            new_table.append([
-                cell
-                for cell_index, cell
-                in enumerate(row)
-                if cell_index in columns
-            ])
-        return new_table
-
-
-def change_table_direction(table):
-    """
-    Permet de "tourner la table de 45°".
-    Cette fonction convertis une liste contenant les lignes dans des tuples en une liste contenant les colones dans des
-    tuples
-
-    :param list[tuple] table: la table à convertir
-    :return list[tuple]: la table convertie
-    """
-    new_table = [[] for x in table[0]]
-    for row in table:
-        for index, cell in enumerate(row):
-            new_table[index].append(cell)
-    new_table = [tuple(x) for x in new_table]
-    return new_table
-
-
-def get_rows_max_length(table):
-    """
-    Permet de calculer le nombre de caractères de la plus longue valeur de chaque colone d'une table
-    :param list[tuple] table: la table source
-    :return list[int]: une liste contenant la longueur maximale de chaque colone
-    """
-    new_table = change_table_direction(table)
-    row_max_length = [0 for i in table[0]]
-    for index, row in enumerate(new_table):
-        row_max_length[index] = max([len(str(cell)) for cell in row])
-    return row_max_length
-
-
-def join_tables(table1, table2):
-    """
-    Permet d'effectuer le produit cartésien de deux tables
-    :param list[tuple] table1: permière table
-    :param list[tuple] table2: seconde table
-    :return list[tuple]: le produit cartésien des deux tables
-    """
-    new_table = list()
-    for row1 in table1:
-        for row2 in table2:
-            new_table.append(row1 + row2)
-    new_table = [tuple(row) for row in new_table]
-    return new_table
-
-
-table_lang = get_table_content('langues.csv')
-table_country = get_table_content('pays.csv')
-table_city = get_table_content('villes.csv')
-
 # ---------- Question 1 ----------
-print_state('Question 1', 'Les villes qui commencent par "pa"')
+def question_1(table_city, pa_cities=None):
+    print_state('Question 1', 'Les villes qui commencent par "pa"')
 
+    if pa_cities is None:  # Sinon, déjà calculées par get_city_scan
+        pa_cities = filter_table_by_regex(table_city, 1, '^pa')
 
-def filter_table_by_regex(table, column_index, regex):
-    """
-    Permet de filter une table en regardant si les valeurs de la colone spécifiée respectent l'expression régulière
-    :param list[tuple] table: la table source
-    :param int column_index: l'index de la colone à filtrer
-    :param str regex: l'expression régulière qui sert de filtre
-    :return list[tuple]: la table filtrée
-    """
-    return [row for row in table if re.match(regex, row[column_index], flags=re.IGNORECASE)]
+    display_table(pa_cities, 0, 10)
 
 
-display_table(
-    filter_table_by_regex(table_city, 1, '^pa'),
-    0, 10
-)
-
 # ---------- Question 2 ----------
-print_state('Question 2', 'Les pays d\'Amérique du Sud')
-
-
-def filter_table_by_value(table, column_index, value):
-    """
-    Permet de filter une table en regardant si les valeurs de la colone spécifiée respectent l'expression régulière
-    :param list[tuple] table: la table source
-    :param int column_index: l'index de la colone à filtrer
-    :param str value: la valeur qui sera comparée
-    :return list[tuple]: la table filtrée
-    """
-    return [row for row in table if value == row[column_index]]
+def question_2(table_country):
+    print_state('Question 2', 'Les pays d\'Amérique du Sud')
 
+    display_table(
+        filter_table_by_regex(table_country, 2, 'South America'),
+        0, 10
+    )
 
-display_table(
-    filter_table_by_regex(table_country, 2, 'South America'),
-    0, 10
-)
 
 # ---------- Question 3 ----------
-print_state('Question 3', 'Les villes d\'Europe qui commencent par "pa"')
-
-
-def filter_table_by_list(table, column_index, whitelist):
-    """
-    Permet de filtrer une table en regardant si les valeurs de la colone spécifiée sont dans une liste blanche
-    :param list[tuple] table: la table source
-    :param int column_index: l'index de la colone à filtrer
-    :param tuple[str] | list[str] | set[str] whitelist: la liste blanche
-    :return list[tuple]: la table filtrée
-    """
-    return [row for row in table if row[column_index] in whitelist]
+def question_3(table_country, table_city, europe_cities=None):
+    print_state('Question 3', 'Les villes d\'Europe qui commencent par "pa"')
 
+    if europe_cities is None:
+        europe_country_codes = [row[0] for row in filter_table_by_value(table_country, 2, 'Europe')]
+        europe_cities = filter_table_by_list(table_city, 2, europe_country_codes)
 
-europe_country_codes = [row[0] for row in filter_table_by_value(table_country, 2, 'Europe')]
-europe_cities = filter_table_by_list(table_city, 2, europe_country_codes)
+    display_table(
+        filter_table_by_regex(europe_cities, 1, '^pa'),
+        0, 10
+    )
 
-del europe_country_codes
+    return europe_cities
 
-display_table(
-    filter_table_by_regex(europe_cities, 1, '^pa'),
-    0, 10
-)
 
 # ---------- Question 4 ----------
-print_state('Question 4', 'Villes d\'Europe de plus de 100k habitants')
-
-
-def filter_table_by_comparator(table, column_index, comparator, number):
-    """
-    Permet de filtrer une table en regardant si les valeurs de la colone spécifiée sont supérieurs, inférieurs, ou
-    égaux au nombre spécifié
-    :param list[tuple] table: la table source
-    :param int column_index: l'index de la colone à filtrer
-    :param str comparator: le signe qui permet de comparer (>, <=, == et autres)
-    :param int | float number: le nombre auquel les valeurs sont comparées
-    :return list[tuple]: la table filtrée
-    """
-    if comparator == '<':
-        return [row for row in table if row[column_index] != 'NULL' and float(row[column_index]) < float(number)]
-    elif comparator == '>':
-        return [row for row in table if row[column_index] != 'NULL' and float(row[column_index]) > float(number)]
-    else:
-        raise ValueError('Unkonw comparator ' + comparator)
+def question_4(europe_cities):
+    print_state('Question 4', 'Villes d\'Europe de plus de 100k habitants')
 
+    display_table(
+        filter_table_by_comparator(europe_cities, 4, '>', 100_000),
+        0, 10
+    )
 
-display_table(
-    filter_table_by_comparator(europe_cities, 4, '>', 100_000),
-    0, 10
-)
-
-del europe_cities
 
 # ---------- Question 5 ----------
-print_state('Question 5', 'Nombre de formes de gouvernements')
-
-
-def get_unique_values_on_column(table, column_index):
-    """
-    Permet de récupérer une tuple contenant toutes les valeurs de la colone spécifiée, en évitant les doublons
-    :param list[tuple] table: la table source
-    :param column_index: l'index de la colone à récupérer
-    :return tuple[str]: tuple contenant les valeurs uniques
-    """
-    # Mettre les valeurs désirées dans un set permet de retirer les doublons
-    return tuple(set([cell[column_index] for cell in table]))
+def question_5(table_country):
+    print_state('Question 5', 'Nombre de formes de gouvernements')
 
+    print('Il y a {} formes différentes de gouvernements'.format(len(get_unique_values_on_column(table_country, 11))))
 
-print('Il y a {} formes différentes de gouvernements'.format(len(get_unique_values_on_column(table_country, 11))))
 
 # ----------- Question 6 ----------
-print_state('Question 6', 'Nombre de pays dans la base')
+def question_6(table_country):
+    print_state('Question 6', 'Nombre de pays dans la base')
+
+    print('Il y a {} pays dans la base'.format(len(get_unique_values_on_column(table_country, 1))))
 
-print('Il y a {} pays dans la base'.format(len(get_unique_values_on_column(table_country, 1))))
 
 # ---------- Question 7 ----------
-print_state('Question 7', 'Pays on l\'on parle français')
+def question_7(table_lang, table_country):
+    print_state('Question 7', 'Pays on l\'on parle français')
 
+    french_lang_countries = filter_table_by_value(table_lang, 1, 'French')
 
-def filter_duplicated_rows(table, column_index):
-    """
-    Permet retirer les lignes dupliquées en prenant pour échantillon la colone spécifiée.
-    Seul la première ligne de chaque doublons sera gardée
-    :param list[tuple] table: la table source
-    :param int column_index: l'index de la colone servant d'échantillon
-    :return list[tuple]: la liste filtrée
-    """
-    column_data = list()
-    new_table = list()
-    for row in table:
-        if not row[column_index] in column_data:
-            new_table.append(row)
-            column_data.append(row[column_index])
-    return new_table
+    display_table(
+        filter_table_by_list(
+            table_country,
+            0,
+            get_unique_values_on_column(
+                french_lang_countries, 0
+            )
+        ), 0, 10
+    )
+
+    return french_lang_countries
 
 
-french_lang_countries = filter_table_by_value(table_lang, 1, 'French')
+# ---------- Question 8 ----------
+def question_8(table_country, french_lang_countries):
+    print_state('Question 8', 'Pays ou le français est la langue officielle')
 
-display_table(
-    filter_table_by_list(
+    french_official_lang_countries = filter_table_by_list(
         table_country,
         0,
         get_unique_values_on_column(
-            french_lang_countries, 0
+            filter_table_by_value(
+                french_lang_countries,
+                2,
+                'T'
+            ), 0
         )
-    ), 0, 10
-)
+    )
 
-# ---------- Question 8 ----------
-print_state('Question 8', 'Pays ou le français est la langue officielle')
+    display_table(french_official_lang_countries, 0, 10)
 
-french_official_lang_countries = filter_table_by_list(
-    table_country,
-    0,
-    get_unique_values_on_column(
-        filter_table_by_value(
-            french_lang_countries,
-            2,
-            'T'
-        ), 0
+    return french_official_lang_countries
+
+
+# ---------- Question 9 ----------
+def get_question_9_country_codes(french_official_lang_countries):
+    """
+    :param list[tuple] french_official_lang_countries: les pays où le français est une langue officielle (question 8)
+    :return tuple[str]: les codes des pays d'Afrique de moins de 100k habitants où le français est langue officielle
+    """
+    return get_unique_values_on_column(
+        Query(french_official_lang_countries)
+        .where_lt(6, 100_000)  # On ne garde que les pays de moins de 100k habitants
+        .where_eq(2, 'Africa')  # On ne garde que les pays d'Afrique
+        .all(),
+        0
     )
-)
 
-del french_lang_countries
 
-display_table(french_official_lang_countries, 0, 10)
+def question_9(table_city, french_official_lang_countries, africa_french_cities=None):
+    print_state('Question 9', 'Villes d\'Afrique de moins de 100k habitants ayant pour langue officielle le français')
 
-# ---------- Question 9 ----------
-print_state('Question 9', 'Villes d\'Afrique de moins de 100k habitants ayant pour langue officielle le français')
+    if africa_french_cities is None:
+        africa_french_lang_official_codes = get_question_9_country_codes(french_official_lang_countries)
 
-africa_french_lang_official_codes = get_unique_values_on_column(
-    filter_table_by_value(  # On ne garde que les villes d'Afrique
-        # On ne garde que les villes de moins de 100k habitants
-        filter_table_by_comparator(french_official_lang_countries, 6, '<', 100_000),
-        2,
-        'Africa'
-    ),
-    0
-)
+        africa_french_cities = filter_table_by_list(  # On ne garde que les villes qui ont le code de pays trouvé
+            table_city,
+            2,
+            africa_french_lang_official_codes
+        )
 
-display_table(
-    filter_table_by_list(  # On ne garde que les villes qui ont le code de pays trouvé ci-dessus
-        table_city,
-        2,
-        africa_french_lang_official_codes
-    ),
-    0, 10
-)
+    display_table(africa_french_cities, 0, 10)
 
-del africa_french_lang_official_codes
 
 # ---------- Question 10 ----------
-print_state('Question 10', 'Pays d\'Amérique du Sud de plus de 10m habitants ayant un régime républicain')
-
-display_table(
-    filter_table_by_regex(  # Filtre : régime républicain
-        filter_table_by_comparator(  # Filtre : plus de 10m d'habitants
-            filter_table_by_value(table_country, 2, 'South America'),  # Filtre : Amérique du Sud
-            6, '>', 10_000_000
-        ), 11, '.*Republic.*'),
-    0, 10
-)
+def question_10(table_country):
+    print_state('Question 10', 'Pays d\'Amérique du Sud de plus de 10m habitants ayant un régime républicain')
+
+    display_table(
+        Query(table_country)
+        .where_eq(2, 'South America')  # Filtre : Amérique du Sud
+        .where_gt(6, 10_000_000)  # Filtre : plus de 10m d'habitants
+        .where_regex(11, '.*Republic.*')  # Filtre : régime républicain
+        .all(),
+        0, 10
+    )
 
-# ---------- Question 11 ----------
-print_state('Question 11', 'Villes Nord-Américaines de plus de 100k habitants ou l\'on parle espagnol')
-
-spanish_country_codes = get_unique_values_on_column(
-    filter_table_by_value(
-        table_lang,
-        1,
-        'Spanish'
-    ), 0
-)
 
-north_american_country_codes = get_unique_values_on_column(
-    filter_table_by_value(
-        table_country,
-        2,
-        'North America'
-    ), 0
-)
+# ---------- Question 11 ----------
+def question_11(table_lang, table_country, table_city):
+    print_state('Question 11', 'Villes Nord-Américaines de plus de 100k habitants ou l\'on parle espagnol')
 
-display_table(
-    filter_table_by_list(  # Filtre : Nord-Américain
-        filter_table_by_list(  # Filtre : parle espagnol
-            filter_table_by_comparator(  # Filtre : plus de 100K habitants
-                table_city,
-                4,
-                '>',
-                100_000
-            ), 2, spanish_country_codes
-        ), 2, north_american_country_codes
-    ), 0, 10
-)
+    spanish_country_codes = get_unique_values_on_column(
+        filter_table_by_value(
+            table_lang,
+            1,
+            'Spanish'
+        ), 0
+    )
 
-del spanish_country_codes, north_american_country_codes
+    north_american_country_codes = get_unique_values_on_column(
+        filter_table_by_value(
+            table_country,
+            2,
+            'North America'
+        ), 0
+    )
 
-# ---------- Question 12 ----------
-print_state('Question 12', 'Surface de l\'Europe')
+    # Les trois filtres sont appliqués en un seul passage, dans l'ordre choisi par la requête
+    display_table(
+        Query(table_city)
+        .where_gt(4, 100_000)  # Filtre : plus de 100K habitants
+        .where_in(2, spanish_country_codes)  # Filtre : parle espagnol
+        .where_in(2, north_american_country_codes)  # Filtre : Nord-Américain
+        .all(),
+        0, 10
+    )
 
 
-def summarize_column(table, column_index):
-    """
-    Permet de faire le total des nombres de la colone d'un tableau
-    :param list[tuple] table: la table source
-    :param int column_index: l'index de la colone à traiter
-    :return : un objet dans lequel se trouve le nombre total (clé sum) et le nombre de valeurs traitées (clé count)
-    """
-    total = float()
-    matches = 0
-    for row in table:
-        if re.match('^\\d+(\\.\\d+)?$', row[column_index]):  # On teste si c'est un nombre pour éviter les erreurs
-            total += float(row[column_index])
-            matches += 1
-    return {'sum': total, 'count': matches}
+# ---------- Question 12 ----------
+def question_12(table_country):
+    print_state('Question 12', 'Surface de l\'Europe')
 
+    europe_countries = filter_table_by_value(table_country, 2, 'Europe')
 
-europe_countries = filter_table_by_value(table_country, 2, 'Europe')
+    print('L\'Europe a une surface de {} km².'.format(summarize_column(europe_countries, 4)['sum']))
 
-print('L\'Europe a une surface de {} km².'.format(summarize_column(europe_countries, 4)['sum']))
+    return europe_countries
 
-# del europe_countries
 
 # ---------- Question 13 ----------
-print_state('Question 13', 'Surface de la polynésie')
+def question_13(table_country):
+    print_state('Question 13', 'Surface de la polynésie')
 
-polynesia_countries = filter_table_by_value(table_country, 3, 'Polynesia')
+    polynesia_countries = filter_table_by_value(table_country, 3, 'Polynesia')
 
-print('La polynésie a une surface de {} km².'.format(summarize_column(polynesia_countries, 4)['sum']))
+    print('La polynésie a une surface de {} km².'.format(summarize_column(polynesia_countries, 4)['sum']))
 
-del polynesia_countries
 
 # ---------- Question 14 ----------
-print_state('Question 14', 'Pays en Océanie de plus de 10k km²')
+def question_14(table_country):
+    print_state('Question 14', 'Pays en Océanie de plus de 10k km²')
 
-oceania_countries = filter_table_by_value(table_country, 2, 'Oceania')
-large_oceania_coutries = filter_table_by_comparator(oceania_countries, 8, '>', 10_000)
+    oceania_countries = filter_table_by_value(table_country, 2, 'Oceania')
+    large_oceania_coutries = filter_table_by_comparator(oceania_countries, 8, '>', 10_000)
 
-print('En Océanie, il y a {} pays qui font plus de 10 000 km².'
-      .format(len(large_oceania_coutries)))
+    print('En Océanie, il y a {} pays qui font plus de 10 000 km².'
+          .format(len(large_oceania_coutries)))
 
-del oceania_countries, large_oceania_coutries
 
 # ---------- Question 15 ----------
-print_state('Question 15', "Langues officielles des pays de l'Europe de l'Est")
+def question_15(table_lang, table_country):
+    print_state('Question 15', "Langues officielles des pays de l'Europe de l'Est")
 
-est_europe_country_codes = get_unique_values_on_column(  # On récupère les codes des pays
-    filter_table_by_value(table_country, 3, 'Eastern Europe'),  # On récupère les pays
-    0
-)
+    est_europe_country_codes = get_unique_values_on_column(  # On récupère les codes des pays
+        filter_table_by_value(table_country, 3, 'Eastern Europe'),  # On récupère les pays
+        0
+    )
 
-est_europe_langs = get_unique_values_on_column(  # On récupère les langues
-    filter_table_by_list(  # On filtre les langues en fonction des codes des pays
-        table_lang,
-        0,
-        est_europe_country_codes
-    ),
-    1
-)
+    est_europe_langs = get_unique_values_on_column(  # On récupère les langues
+        filter_table_by_list(  # On filtre les langues en fonction des codes des pays
+            table_lang,
+            0,
+            est_europe_country_codes
+        ),
+        1
+    )
 
-print("Langues des pays d'Europe de l'Est :", (', '.join(est_europe_langs)))
+    print("Langues des pays d'Europe de l'Est :", (', '.join(est_europe_langs)))
 
-del est_europe_langs, est_europe_country_codes
 
 # ---------- Question 16 ----------
-print_state('Question 16', 'Population moyenne des pays d\'Asie')
+def question_16(table_country):
+    print_state('Question 16', 'Population moyenne des pays d\'Asie')
 
-asia_countries = filter_table_by_value(  # On filtre la table en ne gardant que les pays d'Asie
-    table_country,
-    2,
-    'Asia'
-)
+    asia_countries = filter_table_by_value(  # On filtre la table en ne gardant que les pays d'Asie
+        table_country,
+        2,
+        'Asia'
+    )
 
-asia_population = summarize_column(asia_countries, 6)
+    asia_population = summarize_column(asia_countries, 6)
 
-print('En Asie, la population moyenne des {} pays est de {} habitants'
-      .format(asia_population['count'], round(asia_population['sum'] / asia_population['count'], 1)))
+    print('En Asie, la population moyenne des {} pays est de {} habitants'
+          .format(asia_population['count'], round(asia_population['sum'] / asia_population['count'], 1)))
+
+    return asia_countries
 
-del asia_population
 
 # ---------- Question 17 ----------
-print_state('Question 17', 'Population moyenne des villes d\'Asie')
+def question_17(table_city, asia_countries, asia_cities=None):
+    print_state('Question 17', 'Population moyenne des villes d\'Asie')
 
-asia_country_codes = get_unique_values_on_column(asia_countries, 0)  # On récupère les codes des pays d'Asie
+    if asia_cities is None:
+        asia_country_codes = get_unique_values_on_column(asia_countries, 0)  # On récupère les codes des pays d'Asie
 
-asia_cities = filter_table_by_list(  # On filtre la table en ne gardant que les villes d'Asie
-    table_city,
-    2,
-    asia_country_codes
-)
+        asia_cities = filter_table_by_list(  # On filtre la table en ne gardant que les villes d'Asie
+            table_city,
+            2,
+            asia_country_codes
+        )
 
-asia_cities_pop = summarize_column(asia_cities, 4)
+    asia_cities_pop = summarize_column(asia_cities, 4)
 
-print('En Asie, la population moyenne des {} villes est de {} habitants'
-      .format(asia_cities_pop['count'], round(asia_cities_pop['sum'] / asia_cities_pop['count'], 1)))
+    print('En Asie, la population moyenne des {} villes est de {} habitants'
+          .format(asia_cities_pop['count'], round(asia_cities_pop['sum'] / asia_cities_pop['count'], 1)))
 
-del asia_cities, asia_country_codes, asia_cities_pop
 
 # ---------- Question 18 ----------
-print_state('Question 18', 'Capitales d\'Europe ordonnées par ordre alphabétique')
+def question_18(table_city, europe_countries, europe_capitales_cities=None):
+    print_state('Question 18', 'Capitales d\'Europe ordonnées par ordre alphabétique')
+
+    if europe_capitales_cities is None:
+        # On garde les villes dont l'identifiant est la capitale d'un pays d'Europe
+        europe_capitales_cities = join_on(table_city, europe_countries, 0, 13, how='semi')
+
+    # Seules les 10 premières capitales sont affichées : pas besoin de trier toute la table. Le nombre de capitales
+    # annoncé reste celui de toute la table
+    display_table(
+        top_k(europe_capitales_cities, 1, 10),
+        0, 10,
+        total_rows=len(europe_capitales_cities)
+    )
 
 
-def order_table_by_column(table, column_index, reverse=False):
-    """
-    Permet de trier une table à partir de la colone spécifiée
-    :param list[tuple] table: la table à trier
-    :param int column_index: l'index de la colone qui sert de référence
-    :param boolean reverse: true si on doit trier la table dans le sens inverse
-    :return list[tuple]: la table triée
-    """
-    return sorted(table, key=lambda value: value[column_index], reverse=reverse)
+# ---------- Question 19 ----------
+def question_19(table_country, table_city, africa_capitales=None):
+    print_state('Question 19', 'Villes d\'Afrique ou la capitale a plus de 3m habitants')
 
+    if africa_capitales is None:
+        africa_capitales = join_on(  # On récupère les capitales d'Afrique
+            table_city,
+            filter_table_by_value(table_country, 2, 'Africa'),  # On récupère les pays d'Afrique
+            0, 13, how='semi'
+        )
 
-europe_capitales_ids = get_unique_values_on_column(
-    europe_countries,
-    13
-)
+    # On filtre celles qui ont moins de 3m habitants
+    africa_big_capitales = filter_table_by_comparator(africa_capitales, 4, '>', 3_000_000)
 
-europe_capitales_cities = filter_table_by_list(
-    table_city,
-    0,
-    europe_capitales_ids
-)
+    display_table(
+        join_on(  # On récupère les villes qui ont le code de pays d'une des capitales trouvées au dessus
+            table_city,
+            africa_big_capitales,
+            2, 2, how='semi'
+        ), 0, 10
+    )
 
-display_table(
-    order_table_by_column(europe_capitales_cities, 1),
-    0, 10
-)
 
-del europe_capitales_ids, europe_countries, europe_capitales_cities
+# ---------- Question 20 ----------
+def question_20(table_lang, table_country, table_city, cities_by_country_code=None):
+    print_state('Question 20',
+                'Pays d\'Amérique du Nord avec indépendance avant 1912, on parle Portugais et ou il y a plus de 49 '
+                'villes')
+
+    na_countries_independance_1912 = filter_table_by_comparator(  # Filtre : indépendance avant 1912
+        filter_table_by_value(table_country, 2, 'North America'),  # Filtre : pays d'Amérique du Nord
+        5, '<', 1912
+    )
 
-# ---------- Question 19 ----------
-print_state('Question 19', 'Villes d\'Afrique ou la capitale a plus de 3m habitants')
+    portugese_speaking_country_codes = get_unique_values_on_column(  # On récupère les codes des pays
+        filter_table_by_value(table_lang, 1, 'Portuguese'),  # Filtre : pays ou l'on parle portugais
+        0
+    )
 
-africa_capitales_ids = get_unique_values_on_column(  # On récupère les identifiants des capitales
-    filter_table_by_value(  # On récupère les pays d'Afrique
-        table_country,
-        2,
-        'Africa'
-    ),
-    13
-)
+    if cities_by_country_code is None:
+        cities_by_country_code = group_by(table_city, 2)  # Un seul passage sur les villes
 
-africa_big_population_countries_codes = get_unique_values_on_column(  # On récupère les codes des pays
-    filter_table_by_comparator(  # On filtre celles qui ont moins de 3m habitants
-        filter_table_by_list(  # On récupère les capitales d'Afrique
-            table_city,
+    portugese_and_more_49_cities_country_code = list()
+
+    for country_code in portugese_speaking_country_codes:
+        # On ne garde que les pays qui parlent portugais et ou il y a plus de 49 villes
+        if len(cities_by_country_code.get(country_code, ())) > 49:
+            portugese_and_more_49_cities_country_code.append(country_code)
+
+    display_table(
+        filter_table_by_list(  # Filtre : on ne garde que les pays ou l'on parle portugais et ou il y a plus de 49 états
+            na_countries_independance_1912,
             0,
-            africa_capitales_ids
+            portugese_and_more_49_cities_country_code
         ),
-        4, '>', 3_000_000
-    ),
-    2
-)
-
-display_table(
-    filter_table_by_list(  # On récupère les villes d'après les codes trouvés au dessus
-        table_city,
-        2,
-        africa_big_population_countries_codes
-    ), 0, 10
-)
+        0, 10
+    )
 
-del africa_capitales_ids, africa_big_population_countries_codes
 
-# ---------- Question 20 ----------
-print_state('Question 20',
-            'Pays d\'Amérique du Nord avec indépendance avant 1912, on parle Portugais et ou il y a plus de 49 villes')
+# ---------- Question 21 ----------
+def question_21(table_country, table_city, population_by_country_code=None):
+    print_state('Question 21', 'Pays ou toutes le villes ont plus de 100k habitants')
 
-na_countries_independance_1912 = filter_table_by_comparator(  # Filtre : indépendance avant 1912
-    filter_table_by_value(table_country, 2, 'North America'),  # Filtre : pays d'Amérique du Nord
-    5, '<', 1912
-)
+    if population_by_country_code is None:
+        population_by_country_code = summarize_column_by_group(table_city, 2, 4)
 
-portugese_speaking_country_codes = get_unique_values_on_column(  # On récupère les codes des pays
-    filter_table_by_value(table_lang, 1, 'Portuguese'),  # Filtre : pays ou l'on parle portugais
-    0
-)
+    more_100k_country_codes = list()
+    # Pour chaque code de pays des villes, on regarde la plus petite population
+    for country_code, population in population_by_country_code.items():
+        if population['min'] > 100_000:
+            more_100k_country_codes.append(country_code)
 
-portugese_and_more_49_cities_country_code = list()
+    display_table(
+        filter_table_by_list(table_country, 0, more_100k_country_codes),
+        0, 10
+    )
 
-for country_code in portugese_speaking_country_codes:
-    # On ne garde que les pays qui parlent espagnol et ou il y a plus de 49 états
-    if len(
-            filter_table_by_list(
-                table_city,
-                2,
-                country_code
-            )
-    ) > 49:
-        portugese_and_more_49_cities_country_code.append(country_code)
 
-display_table(
-    filter_table_by_list(  # Filtre : on ne garde que les pays ou l'on parle portugais et ou il y a plus de 49 états
-        na_countries_independance_1912,
-        0,
-        portugese_and_more_49_cities_country_code
-    ),
-    0, 10
-)
+# ---------- Question 22 ----------
+def question_22(table_country, table_city, population_by_country_code=None):
+    print_state('Question 22', 'Pays dont toutes les villes ont plus d\'habitants que le ville la plus peuplée du Népal')
 
-del na_countries_independance_1912, portugese_speaking_country_codes, portugese_and_more_49_cities_country_code
+    if population_by_country_code is None:
+        # Population minimale et maximale des villes de chaque pays, en un seul passage
+        population_by_country_code = summarize_column_by_group(table_city, 2, 4)
 
-# ---------- Question 21 ----------
-print_state('Question 21', 'Pays ou toutes le villes ont plus de 100k habitants')
-
-more_100k_country_codes = list()
-for country_code in get_unique_values_on_column(table_city, 2):  # Pour chaque code de ville différent
-    if min(  # On regarde la plus petite valeur
-            # On récupère le nombre d'habitant de chaque ville d'un code de pays
-            [int(row[4]) for row in filter_table_by_value(table_city, 2, country_code)]
-    ) > 100_000:
-        more_100k_country_codes.append(country_code)
-
-display_table(
-    filter_table_by_list(table_country, 0, more_100k_country_codes),
-    0, 10
-)
+    nepal_max_pop = population_by_country_code['NPL']['max']  # Population de la plus grande ville au nepal
 
-del more_100k_country_codes
+    more_nepal_country_codes = list()
+    for country_code, population in population_by_country_code.items():
+        if population['min'] > nepal_max_pop:  # On regarde la plus petite valeur
+            more_nepal_country_codes.append(country_code)
 
-# ---------- Question 22 ----------
-print_state('Question 22', 'Pays dont toutes les villes ont plus d\'habitants que le ville la plus peuplée du Népal')
-
-nepal_max_pop = max(  # Population de la plus grande ville au nepal
-    [int(value) for value in  # Convertir chaque str en int
-     get_unique_values_on_column(  # On recupère le nombre d'habitants
-         filter_table_by_value(table_city, 2, 'NPL'),  # On récupère les villes du népal
-         4
-     )]
-)
-
-more_nepal_country_codes = list()
-for country_code in get_unique_values_on_column(table_city, 2):  # Pour chaque code de ville différent
-    if min(  # On regarde la plus petite valeur
-            # On récupère le nombre d'habitant de chaque ville d'un code de pays
-            [int(row[4]) for row in filter_table_by_value(table_city, 2, country_code)]
-    ) > nepal_max_pop:
-        more_nepal_country_codes.append(country_code)
-
-display_table(
-    filter_table_by_list(table_country, 0, more_nepal_country_codes),
-    0, 10
-)
+    display_table(
+        filter_table_by_list(table_country, 0, more_nepal_country_codes),
+        0, 10
+    )
 
-del nepal_max_pop, more_nepal_country_codes
 
 # ---------- Question 23 ----------
-print_state('Question 23', 'Pays ou l\'on parle français mais pas anglais')
-
-french_speaking_country_codes = set(get_unique_values_on_column(
-    filter_table_by_value(table_lang, 1, 'French'),
-    0
-))
+def question_23(table_lang, table_country, country_codes):
+    print_state('Question 23', 'Pays ou l\'on parle français mais pas anglais')
 
-english_speaking_country_codes = set(get_unique_values_on_column(
-    filter_table_by_value(table_lang, 1, 'English'),
-    0
-))
+    french_speaking_countries = country_codes.from_column(filter_table_by_value(table_lang, 1, 'French'), 0)
+    english_speaking_countries = country_codes.from_column(filter_table_by_value(table_lang, 1, 'English'), 0)
 
-display_table(
-    filter_table_by_list(
-        table_country,
-        0,
-        # On filtre la table en ne gardant que les codes des pays qui parlent français mais pas anglais
-        french_speaking_country_codes - english_speaking_country_codes
-    ),
-    0, 10
-)
+    display_table(
+        filter_table_by_list(
+            table_country,
+            0,
+            # On filtre la table en ne gardant que les codes des pays qui parlent français mais pas anglais
+            country_codes.to_codes(french_speaking_countries & ~english_speaking_countries)
+        ),
+        0, 10
+    )
 
-del french_speaking_country_codes, english_speaking_country_codes
 
 # ---------- Question 24 ----------
-print_state('Question 24', 'Pays pour lequels au moins une ville est dans la base')
+def question_24(table_country, table_city, country_codes, city_country_codes=None):
+    print_state('Question 24', 'Pays pour lequels au moins une ville est dans la base')
 
-cities_country_codes = get_unique_values_on_column(table_city, 2)  # Codes des pays dans la base "villes.csv"
+    if city_country_codes is None:
+        city_country_codes = country_codes.to_codes(country_codes.from_column(table_city, 2))
 
-# Pays qui ont leur code dans la variable cities_country_codes
-countries_in_cities_table = filter_table_by_list(
-    table_country,
-    0,
-    cities_country_codes
-)
+    # Pays qui ont leur code dans la base "villes.csv"
+    countries_in_cities_table = filter_table_by_list(table_country, 0, city_country_codes)
 
-display_table(countries_in_cities_table, 0, 10)
+    display_table(countries_in_cities_table, 0, 10)
 
-del cities_country_codes, countries_in_cities_table
 
 # ---------- Question 25 ----------
-print_state('Question 25', 'Pays pour lesquels aucune langue n\'est répertoriée')
+def question_25(table_lang, table_country, country_codes):
+    print_state('Question 25', 'Pays pour lesquels aucune langue n\'est répertoriée')
 
-lang_country_codes = get_unique_values_on_column(table_lang, 0)  # Codes des pays dans la base "villes.csv"
-
-# Pays qui n'ont pas leur code dans la variable lang_country_codes
-countries_not_in_lang_table = [row for row in table_country if row[0] not in lang_country_codes]
+    # Pays qui n'ont pas leur code dans la base "langues.csv" : tous les pays, sauf ceux de la table des langues
+    countries_not_in_lang_table = filter_table_by_list(
+        table_country,
+        0,
+        country_codes.to_codes(country_codes.all & ~country_codes.from_column(table_lang, 0))
+    )
 
-display_table(countries_not_in_lang_table, 0, 10)
+    display_table(countries_not_in_lang_table, 0, 10)
 
-del lang_country_codes, countries_not_in_lang_table
 
 # ---------- Question 26 ----------
-print_state('Question 26', 'Pays pour lesquels la somme du nombre d\'habitants de ses villes est supérieur à 10m')
-
-filtered_26_countries_codes = list()
-for country_code in get_unique_values_on_column(table_country, 0):
-    cities_with_country_code = filter_table_by_value(table_city, 2, country_code)
-    if len(cities_with_country_code) > 0:
-        pop_sum = summarize_column(cities_with_country_code, 4)
-        if pop_sum['sum'] > 10_000_000:
-            filtered_26_countries_codes.append(country_code)
+def question_26(table_country, table_city, population_by_country_code=None):
+    print_state('Question 26', 'Pays pour lesquels la somme du nombre d\'habitants de ses villes est supérieur à 10m')
 
-display_table(
-    filter_table_by_list(
-        table_country,
-        0,
-        filtered_26_countries_codes
-    ),
-    0, 10
-)
-
-if 'FRA' in filtered_26_countries_codes:
-    print('La france est dans le liste')
-else:
-    print('La france n\'est pas dans la liste')
+    if population_by_country_code is None:
+        population_by_country_code = summarize_column_by_group(table_city, 2, 4)  # Un seul passage sur les villes
 
-del filtered_26_countries_codes
+    filtered_26_countries_codes = list()
+    for country_code in get_unique_values_on_column(table_country, 0):
+        pop_sum = population_by_country_code.get(country_code)
+        if pop_sum is not None and pop_sum['sum'] > 10_000_000:
+            filtered_26_countries_codes.append(country_code)
 
-# ---------- Question 27 ----------
-print_state('Question 27', 'Le pays asiatique ayant l\'espérance de vie la plus courte')
+    display_table(
+        filter_table_by_list(
+            table_country,
+            0,
+            filtered_26_countries_codes
+        ),
+        0, 10
+    )
 
+    if 'FRA' in filtered_26_countries_codes:
+        print('La france est dans le liste')
+    else:
+        print('La france n\'est pas dans la liste')
 
-def convert_column_to_float(table, colomn_index):
-    """
-    Convertis une colone de strings dans une table en une colone de floats
-    :param list[tuple] table: la table source
-    :param int colomn_index:
-    :return list[tuple]: la table avec la colone convertie
-    """
-    return [
-        tuple(
-            list(row[:colomn_index]) + [float(row[colomn_index])] + list(row[colomn_index + 1:])
-        )
-        for row in table
-    ]
 
+# ---------- Question 27 ----------
+def question_27(asia_countries):
+    print_state('Question 27', 'Le pays asiatique ayant l\'espérance de vie la plus courte')
 
-asia_countries = convert_column_to_float(asia_countries, 7)
-shortest_life_asia = order_table_by_column(asia_countries, 7)[0]
+    shortest_life_asia = argmin(asia_countries, 7, numeric=True)
 
-print('Le pays d\'Asie avec l\'espérance de vie la plus courte : {} ({} ans)'
-      .format(shortest_life_asia[1], shortest_life_asia[7]))
+    print('Le pays d\'Asie avec l\'espérance de vie la plus courte : {} ({} ans)'
+          .format(shortest_life_asia[1], shortest_life_asia[7]))
 
-del asia_countries, shortest_life_asia
 
 # ---------- Question 28 ----------
-print_state('Question 28', 'La question abusée')
+def get_question_28_country_codes(table_lang, table_country, french_official_lang_countries, country_codes):
+    """
+    :param list[tuple] table_lang: la table des langues
+    :param list[tuple] table_country: la table des pays
+    :param list[tuple] french_official_lang_countries: les pays où le français est une langue officielle (question 8)
+    :param CodeDictionary country_codes: le dictionnaire des codes de pays
+    :return list[str]: les codes des pays qui remplissent les conditions de la question 28
+    """
+    sa_life_expectancy_sum = summarize_column(
+        filter_table_by_value(table_country, 3, 'South America'),
+        7
+    )
 
-sa_life_expectancy_sum = summarize_column(
-    filter_table_by_value(table_country, 3, 'South America'),
-    7
-)
+    sa_life_expectancy = sa_life_expectancy_sum['sum'] / sa_life_expectancy_sum['count']
 
-sa_life_expectancy = sa_life_expectancy_sum['sum'] / sa_life_expectancy_sum['count']
+    # Chaque critère est un bitmap de codes de pays
+    more_3_langs_countries = country_codes.from_counts(table_lang, 0, 3)  # Pays qui parlent au moins 3 langues
+    french_official_countries = country_codes.from_column(french_official_lang_countries, 0)
+    # Pays qui ont une espérance de vie supérieure à celle des pays d'Amérique du Sud
+    long_life_countries = country_codes.from_column(
+        filter_table_by_comparator(table_country, 7, '>', sa_life_expectancy),
+        0
+    )
 
-# On récupère les codes des pays avec le nombre de langues parlées
-lang_count_by_country_codes = dict()
-for row in table_lang:
-    x = lang_count_by_country_codes.get(row[0], 0) + 1
-    lang_count_by_country_codes[row[0]] = x
+    return country_codes.to_codes(more_3_langs_countries & french_official_countries & long_life_countries)
 
-# Si le nombre de langues parlées est supérieur à 3, on ajoute le code du pays à la variable more_3_langs_country_codes
-more_3_langs_country_codes = list()
-for key in lang_count_by_country_codes:
-    if lang_count_by_country_codes[key] >= 3:
-        more_3_langs_country_codes.append(key)
 
-more_3_langs_countries = filter_table_by_list(  # On enlève les pays qui parlent moins de 3 langues
-    table_country,
-    0,
-    more_3_langs_country_codes
-)
+def question_28(table_lang, table_country, table_city, french_official_lang_countries, country_codes,
+                filtered_28_cities=None):
+    print_state('Question 28', 'La question abusée')
 
-filtered_28_countries = filter_table_by_list(  # On retire les pays qui n'ont pas le français comme langue officielle
-    more_3_langs_countries,
-    0,
-    get_unique_values_on_column(  # On reprend les codes des pays qui ont le français comme langue officielle
-        french_official_lang_countries, 0
-    )
-)
+    if filtered_28_cities is None:
+        # On filtre les villes en une seule fois, en ne gardant que celles dont le pays remplit les trois critères
+        filtered_28_cities = filter_table_by_list(
+            table_city,
+            2,
+            get_question_28_country_codes(table_lang, table_country, french_official_lang_countries, country_codes)
+        )
 
-# On retire les pays qui ont une espérance de vie inférieure à celle des pays d'Amérique du Sud
-filtered_28_countries = filter_table_by_comparator(
-    filtered_28_countries,
-    7, '>', sa_life_expectancy
-)
+    print('Il y a {} villes qui remplissent les conditions de la question 28'
+          .format(len(filtered_28_cities)))
 
-# On récupère les codes des pays
-filtered_28_countries_codes = get_unique_values_on_column(
-    filtered_28_countries,
-    0
-)
 
-# On filtre les villes en ne gardant que celles qui ont un code de pays dans la variable filtered_28_countries_codes
-filtered_28_cities = filter_table_by_list(
-    table_city,
-    2,
-    filtered_28_countries_codes
-)
+def get_city_scan(table_lang, table_country, country_codes):
+    """
+    Permet d'obtenir les filtres et les résumés des villes utilisés par les questions, à calculer en un seul passage
+    sur les villes (voir le module shared_scan). Chaque appel doit renvoyer ce que calculerait la question : ses
+    arguments sont obtenus avec les mêmes fonctions que dans la question (ou les mêmes filtres sur les pays).
+    Ne sont pas prévus : la Query de la question 11, et le deuxième filtre de la question 19, qui dépend du premier
+    :param list[tuple] table_lang: la table des langues
+    :param list[tuple] table_country: la table des pays
+    :param CodeDictionary country_codes: le dictionnaire des codes de pays
+    :return tuple[SharedScan, dict[str, int]]: les appels sur la table des villes, et pour chaque argument optionnel
+        des questions qui reçoit un résultat, la position de ce résultat dans la liste renvoyée par SharedScan.run
+    """
+    french_official_lang_countries = filter_table_by_list(  # Comme les questions 7 et 8
+        table_country,
+        0,
+        get_unique_values_on_column(filter_table_by_value(filter_table_by_value(table_lang, 1, 'French'), 2, 'T'), 0)
+    )
 
-print('Il y a {} villes qui remplissent les conditions de la question 28'
-      .format(len(filtered_28_cities)))
+    scan = SharedScan()
+    positions = {
+        'pa_cities': scan.add(filter_table_by_regex, 1, '^pa'),  # Question 1
+        'europe_cities': scan.add(  # Question 3
+            filter_table_by_list, 2, [row[0] for row in filter_table_by_value(table_country, 2, 'Europe')]
+        ),
+        'africa_french_cities': scan.add(  # Question 9
+            filter_table_by_list, 2, get_question_9_country_codes(french_official_lang_countries)
+        ),
+        'asia_cities': scan.add(  # Question 17
+            filter_table_by_list, 2, get_unique_values_on_column(filter_table_by_value(table_country, 2, 'Asia'), 0)
+        ),
+        'europe_capitales_cities': scan.add(  # Question 18, avec les pays de la question 12
+            join_on, filter_table_by_value(table_country, 2, 'Europe'), 0, 13, 'semi'
+        ),
+        'africa_capitales': scan.add(  # Question 19
+            join_on, filter_table_by_value(table_country, 2, 'Africa'), 0, 13, 'semi'
+        ),
+        'cities_by_country_code': scan.add(group_by, 2),  # Question 20
+        'population_by_country_code': scan.add(summarize_column_by_group, 2, 4),  # Questions 21, 22 et 26
+        'city_country_codes': scan.add(get_unique_values_on_column, 2),  # Question 24
+        'filtered_28_cities': scan.add(  # Question 28
+            filter_table_by_list, 2,
+            get_question_28_country_codes(table_lang, table_country, french_official_lang_countries, country_codes)
+        ),
+    }
+    return scan, positions
+
+
+def run_city_scan(table_lang, table_country, table_city, country_codes):
+    """
+    Permet de calculer en un seul passage sur les villes les résultats de get_city_scan
+    :param list[tuple] table_lang: la table des langues
+    :param list[tuple] table_country: la table des pays
+    :param list[tuple] table_city: la table des villes
+    :param CodeDictionary country_codes: le dictionnaire des codes de pays
+    :return dict: le résultat pour chaque argument optionnel des questions, par nom
+    """
+    scan, positions = get_city_scan(table_lang, table_country, country_codes)
+    results = scan.run(table_city)
+    return {name: results[position] for name, position in positions.items()}
+
+
+def get_country_codes():
+    """
+    :return CodeDictionary: le dictionnaire des codes de pays, pour les questions 23, 24, 25 et 28
+    """
+    return CodeDictionary.from_table(tables.table_country, 0)
+
+
+# Valeurs lues ou calculées dans chaque processus par run_tasks
+REPORT_SOURCES = {
+    'table_lang': partial(tables.get_default_table, 'table_lang'),
+    'table_country': partial(tables.get_default_table, 'table_country'),
+    'table_city': partial(tables.get_default_table, 'table_city'),
+    'country_codes': get_country_codes,
+}
+
+# Les questions et leurs entrées, dans l'ordre du rapport. Les valeurs dérivées partagées sont les sorties des
+# questions qui les calculent : run_tasks lance une question dès que ses entrées sont calculées
+REPORT_TASKS = [
+    Task('Question 1', question_1, ('table_city',)),
+    Task('Question 2', question_2, ('table_country',)),
+    Task('Question 3', question_3, ('table_country', 'table_city'), 'europe_cities'),
+    Task('Question 4', question_4, ('europe_cities',)),
+    Task('Question 5', question_5, ('table_country',)),
+    Task('Question 6', question_6, ('table_country',)),
+    Task('Question 7', question_7, ('table_lang', 'table_country'), 'french_lang_countries'),
+    Task('Question 8', question_8, ('table_country', 'french_lang_countries'), 'french_official_lang_countries'),
+    Task('Question 9', question_9, ('table_city', 'french_official_lang_countries')),
+    Task('Question 10', question_10, ('table_country',)),
+    Task('Question 11', question_11, ('table_lang', 'table_country', 'table_city')),
+    Task('Question 12', question_12, ('table_country',), 'europe_countries'),
+    Task('Question 13', question_13, ('table_country',)),
+    Task('Question 14', question_14, ('table_country',)),
+    Task('Question 15', question_15, ('table_lang', 'table_country')),
+    Task('Question 16', question_16, ('table_country',), 'asia_countries'),
+    Task('Question 17', question_17, ('table_city', 'asia_countries')),
+    Task('Question 18', question_18, ('table_city', 'europe_countries')),
+    Task('Question 19', question_19, ('table_country', 'table_city')),
+    Task('Question 20', question_20, ('table_lang', 'table_country', 'table_city')),
+    Task('Question 21', question_21, ('table_country', 'table_city')),
+    Task('Question 22', question_22, ('table_country', 'table_city')),
+    Task('Question 23', question_23, ('table_lang', 'table_country', 'country_codes')),
+    Task('Question 24', question_24, ('table_country', 'table_city', 'country_codes')),
+    Task('Question 25', question_25, ('table_lang', 'table_country', 'country_codes')),
+    Task('Question 26', question_26, ('table_country', 'table_city')),
+    Task('Question 27', question_27, ('asia_countries',)),
+    Task('Question 28', question_28,
+         ('table_lang', 'table_country', 'table_city', 'french_official_lang_countries', 'country_codes')),
+]
+
+
+def main(profile=None, shared_scan=False, jobs=None):
+    """
+    Lance le rapport complet, question par question, dans l'ordre du sujet
+    :param str profile: None pour ne rien mesurer, '' pour afficher les mesures à la fin du rapport, ou l'emplacement
+        d'un fichier JSON où les écrire en plus
+    :param bool shared_scan: true pour calculer les résultats sur les villes en un seul passage avant les questions,
+        qui les reçoivent en argument (voir get_city_scan)
+    :param int jobs: None pour exécuter les questions l'une après l'autre, ou le nombre de processus qui exécutent
+        les questions de REPORT_TASKS (0 pour le nombre de processeurs). Ne peut pas être combiné avec profile ni
+        shared_scan, qui ne concernent que le processus principal
+    """
+    if jobs is not None and (profile is not None or shared_scan):
+        raise ValueError('The questions can not be profiled nor prepared with a shared scan in several processes')
+    if profile is not None:
+        profiling.enable()
+
+    print_state('Intro', 'Définition des fonctions principales')
+
+    if jobs is not None:  # Les tables sont lues par run_tasks
+        run_tasks(REPORT_TASKS, REPORT_SOURCES, jobs or None)
+        return
+
+    # Les tables ne sont lues qu'ici, au premier accès
+    table_lang = tables.table_lang
+    table_country = tables.table_country
+    table_city = tables.table_city
+    country_codes = get_country_codes()  # Pour les questions 23, 24, 25 et 28
+    # Résultats sur les villes déjà calculés, donnés aux questions. Sans shared_scan, chaque question les calcule
+    city_results = run_city_scan(table_lang, table_country, table_city, country_codes) if shared_scan else dict()
+
+    question_1(table_city, city_results.get('pa_cities'))
+    question_2(table_country)
+    # Retirées de city_results pour être libérées par del europe_cities
+    europe_cities = question_3(table_country, table_city, city_results.pop('europe_cities', None))
+    question_4(europe_cities)
+    del europe_cities
+    question_5(table_country)
+    question_6(table_country)
+    french_lang_countries = question_7(table_lang, table_country)
+    french_official_lang_countries = question_8(table_country, french_lang_countries)
+    del french_lang_countries
+    question_9(table_city, french_official_lang_countries, city_results.get('africa_french_cities'))
+    question_10(table_country)
+    question_11(table_lang, table_country, table_city)
+    europe_countries = question_12(table_country)
+    question_13(table_country)
+    question_14(table_country)
+    question_15(table_lang, table_country)
+    asia_countries = question_16(table_country)
+    question_17(table_city, asia_countries, city_results.get('asia_cities'))
+    question_18(table_city, europe_countries, city_results.get('europe_capitales_cities'))
+    del europe_countries
+    question_19(table_country, table_city, city_results.get('africa_capitales'))
+    question_20(table_lang, table_country, table_city, city_results.get('cities_by_country_code'))
+    question_21(table_country, table_city, city_results.get('population_by_country_code'))
+    question_22(table_country, table_city, city_results.get('population_by_country_code'))
+    question_23(table_lang, table_country, country_codes)
+    question_24(table_country, table_city, country_codes, city_results.get('city_country_codes'))
+    question_25(table_lang, table_country, country_codes)
+    question_26(table_country, table_city, city_results.get('population_by_country_code'))
+    question_27(asia_countries)
+    del asia_countries
+    question_28(table_lang, table_country, table_city, french_official_lang_countries, country_codes,
+                city_results.get('filtered_28_cities'))
+
+    if profile is not None:
+        profiling.disable()
+        print()
+        profiling.print_report()
+        if profile:
+            profiling.export_json(profile)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rapport sur les tables de pays, de villes et de langues')
+    parser.add_argument('--profile', nargs='?', const='', metavar='FICHIER.json',
+                        help='mesure le temps passé dans chaque fonction, et écrit les mesures dans un fichier JSON')
+    parser.add_argument('--shared-scan', action='store_true',
+                        help='calcule les filtres et les résumés sur les villes en un seul passage')
+    parser.add_argument('--jobs', nargs='?', type=int, const=0, metavar='N',
+                        help='exécute les questions dans N processus (par défaut, un par processeur)')
+    arguments = parser.parse_args()
+    if arguments.jobs is not None and (arguments.profile is not None or arguments.shared_scan):
+        parser.error('--jobs ne peut pas être combiné avec --profile ni --shared-scan')
+    main(arguments.profile, arguments.shared_scan, arguments.jobs)
@@ -0,0 +1,358 @@
+"""
+----- Requêtes paresseuses avec plan d'exécution -----
+
+Une Query remplace les appels imbriqués de filter_table_by_* :
+
+    Query(table_city).where_gt(4, 100_000).where_in(2, spanish_codes).where_in(2, north_american_codes).all()
+
+Les méthodes where_* ne parcourent pas la table : elles ajoutent un prédicat au plan. Au moment de l'exécution
+(all, rows, count...), les prédicats sont réordonnés puis appliqués en un seul passage, sans table intermédiaire :
+chaque ligne passe par tous les prédicats, et s'arrête au premier qui la rejette.
+
+L'ordre choisi est celui qui rejette le plus de lignes pour le plus petit coût : les prédicats sont triés par
+coût / (1 - sélectivité), où le coût est une estimation relative du prix d'un test (voir PREDICATE_COSTS) et la
+sélectivité la part des lignes gardées, mesurée sur un échantillon de SAMPLE_SIZE lignes de la table. Sur une table
+de moins de MIN_SAMPLED_ROWS lignes, l'échantillon coûterait presque autant que la requête, et sur un générateur, qui
+ne peut être parcouru qu'une fois, aucun échantillon n'est pris : des sélectivités par défaut sont utilisées. Sur une
+ColumnTable, les prédicats sont appliqués dans le même ordre avec ses filtres par colones.
+
+Sur une IndexedTable (voir le module indexes), les prédicats dont la colone a un index donnent le nombre exact de
+lignes gardées, et donc leur sélectivité, sans parcourir la table. Si le plus sélectif garde moins de
+INDEX_MAX_SELECTIVITY des lignes, son index donne les positions de départ : seules ces lignes passent par les autres
+prédicats. Au delà, parcourir toute la table coûte moins cher que d'aller chercher les lignes une par une. Le résultat
+est aussi gardé dans le cache de résultats (voir le module memo).
+
+Les prédicats ont le même comportement que les fonctions filter_table_by_* : l'ordre des lignes est conservé, et
+le résultat ne dépend pas de l'ordre des prédicats. explain() affiche le plan choisi.
+"""
+
+import random
+import re
+
+from columnar import ColumnTable
+from indexes import INDEX_MAX_SELECTIVITY, IndexedTable
+from memo import cached_result
+from patterns import classify_regex, get_regex_matcher
+
+# Nombre maximal de lignes utilisées pour estimer la sélectivité des prédicats
+SAMPLE_SIZE = 1000
+
+# Nombre minimal de lignes d'une table pour en prendre un échantillon
+MIN_SAMPLED_ROWS = 10 * SAMPLE_SIZE
+
+# Coût relatif d'un test sur une ligne, pour chaque type de prédicat
+PREDICATE_COSTS = {
+    'eq': 1.0,
+    'in': 1.2,  # Recherche dans un set
+    'gt': 3.0,  # Conversion en float
+    'lt': 3.0,
+    'regex': 2.0,  # Opération sur les strings (voir patterns.classify_regex)
+    'regex_full': 8.0,  # Vraie expression régulière
+}
+
+# Sélectivité supposée de chaque type de prédicat quand la table ne peut pas être échantillonnée
+DEFAULT_SELECTIVITIES = {
+    'eq': 0.1,
+    'in': 0.25,
+    'gt': 0.5,
+    'lt': 0.5,
+    'regex': 0.25,
+    'regex_full': 0.25,
+}
+
+OPERATOR_SYMBOLS = {'eq': '==', 'in': 'in', 'gt': '>', 'lt': '<', 'regex': '~', 'regex_full': '~'}
+
+
+class Predicate:
+    """
+    Un test sur une colone, équivalent d'un appel à une fonction filter_table_by_*
+    """
+
+    def __init__(self, kind, column_index, value, position):
+        """
+        :param str kind: le type de test, une clé de PREDICATE_COSTS
+        :param int column_index: l'index de la colone testée
+        :param value: la valeur, la liste blanche, le nombre ou l'expression régulière
+        :param int position: la position du prédicat dans l'ordre d'écriture
+        """
+        self.kind = kind
+        self.column_index = column_index
+        self.value = value
+        self.position = position
+        self.cost = PREDICATE_COSTS[kind]
+        self.selectivity = DEFAULT_SELECTIVITIES[kind]
+        self.test = self._make_test()
+
+    def _make_test(self):
+        """
+        :return: une fonction qui prend une ligne et renvoie true si elle est gardée
+        """
+        index = self.column_index
+        value = self.value
+        if self.kind == 'eq':
+            return lambda row: row[index] == value
+        elif self.kind == 'in':
+            return lambda row: row[index] in value
+        elif self.kind == 'gt':
+            return lambda row: row[index] != 'NULL' and float(row[index]) > value
+        elif self.kind == 'lt':
+            return lambda row: row[index] != 'NULL' and float(row[index]) < value
+        match = get_regex_matcher(value, re.IGNORECASE)
+        return lambda row: match(row[index])
+
+    def rank(self):
+        """
+        :return float: le rang du prédicat dans le plan, les plus petits sont appliqués en premier
+        """
+        rejected = 1 - self.selectivity
+        return self.cost / rejected if rejected > 0 else float('inf')
+
+    def count_positions(self, table):
+        """
+        :param IndexedTable table: la table
+        :return int | None: le nombre de lignes gardées, donné par un index de la table, None si la colone n'a pas
+            d'index pour ce type de prédicat
+        """
+        if self.kind == 'eq':
+            return table.count_value(self.column_index, self.value)
+        elif self.kind == 'in':
+            return table.count_list(self.column_index, self.value)
+        elif self.kind == 'gt':
+            return table.count_range(self.column_index, '>', self.value)
+        elif self.kind == 'lt':
+            return table.count_range(self.column_index, '<', self.value)
+        return None
+
+    def find_positions(self, table):
+        """
+        Permet d'utiliser un index de la table à la place du test
+        :param IndexedTable table: la table
+        :return list[int]: les positions des lignes gardées dans l'ordre de la table, voir count_positions
+        """
+        if self.kind == 'eq':
+            return table.find_value(self.column_index, self.value)
+        elif self.kind == 'in':
+            return table.find_list(self.column_index, self.value)
+        elif self.kind == 'gt':
+            return table.find_range(self.column_index, '>', self.value)
+        elif self.kind == 'lt':
+            return table.find_range(self.column_index, '<', self.value)
+        return None
+
+    def apply(self, table):
+        """
+        Permet d'appliquer le prédicat à une ColumnTable, avec ses filtres par colones
+        :param ColumnTable table: la table à filtrer
+        :return ColumnTable: la vue filtrée
+        """
+        if self.kind == 'eq':
+            return table.filter_by_value(self.column_index, self.value)
+        elif self.kind == 'in':
+            return table.filter_by_list(self.column_index, self.value)
+        elif self.kind == 'gt':
+            return table.filter_by_comparator(self.column_index, '>', self.value)
+        elif self.kind == 'lt':
+            return table.filter_by_comparator(self.column_index, '<', self.value)
+        return table.filter_by_regex(self.column_index, self.value)
+
+    def describe(self):
+        """
+        :return str: le prédicat sous forme lisible, par exemple 'colone 4 > 100000.0'
+        """
+        if self.kind == 'in':
+            value = '{{{} valeurs}}'.format(len(self.value))
+        else:
+            value = repr(self.value)
+        return 'colone {} {} {}'.format(self.column_index, OPERATOR_SYMBOLS[self.kind], value)
+
+
+class Query:
+    """
+    Requête sur une table, construite en enchainant les méthodes where_*. Chaque méthode renvoie la requête elle même
+    """
+
+    def __init__(self, table):
+        """
+        :param list[tuple] | ColumnTable table: la table source, ou un générateur de lignes
+        """
+        self.table = table
+        self.predicates = list()
+        self._planned = False
+        self._planned_version = None  # La version de l'IndexedTable pour laquelle le plan a été fait
+        self.index_predicate = None  # Le prédicat dont l'index donne les lignes de départ
+        self._positions = None
+
+    def _add(self, kind, column_index, value):
+        self.predicates.append(Predicate(kind, column_index, value, len(self.predicates)))
+        self._planned = False
+        return self
+
+    def where_eq(self, column_index, value):
+        """
+        Equivalent de filter_table_by_value
+        :param int column_index: l'index de la colone à filtrer
+        :param str value: la valeur qui sera comparée
+        :return Query: la requête
+        """
+        return self._add('eq', column_index, value)
+
+    def where_in(self, column_index, whitelist):
+        """
+        Equivalent de filter_table_by_list. La liste blanche est convertie en set
+        :param int column_index: l'index de la colone à filtrer
+        :param tuple[str] | list[str] | set[str] whitelist: la liste blanche
+        :return Query: la requête
+        """
+        return self._add('in', column_index, frozenset(whitelist))
+
+    def where_gt(self, column_index, number):
+        """
+        Equivalent de filter_table_by_comparator avec '>'
+        :param int column_index: l'index de la colone à filtrer
+        :param int | float number: le nombre auquel les valeurs sont comparées
+        :return Query: la requête
+        """
+        return self._add('gt', column_index, float(number))
+
+    def where_lt(self, column_index, number):
+        """
+        Equivalent de filter_table_by_comparator avec '<'
+        :param int column_index: l'index de la colone à filtrer
+        :param int | float number: le nombre auquel les valeurs sont comparées
+        :return Query: la requête
+        """
+        return self._add('lt', column_index, float(number))
+
+    def where_regex(self, column_index, regex):
+        """
+        Equivalent de filter_table_by_regex
+        :param int column_index: l'index de la colone à filtrer
+        :param str regex: l'expression régulière qui sert de filtre
+        :return Query: la requête
+        """
+        kind = 'regex_full' if classify_regex(regex)[0] == 'regex' else 'regex'
+        return self._add(kind, column_index, regex)
+
+    def _sample(self):
+        """
+        :return list[tuple] | ColumnTable | None: des lignes réparties sur toute la table, None si la table est un
+            générateur ou a moins de MIN_SAMPLED_ROWS lignes
+        """
+        if not isinstance(self.table, (list, tuple, ColumnTable)) or len(self.table) < MIN_SAMPLED_ROWS:
+            return None
+        # Positions tirées au hasard (mais toujours les mêmes) : un pas fixe tomberait sur les mêmes lignes dans une
+        # table faite de copies répétées
+        positions = range(len(self.table))
+        if len(self.table) > SAMPLE_SIZE:
+            positions = sorted(random.Random(0).sample(positions, SAMPLE_SIZE))
+        if isinstance(self.table, ColumnTable):  # Une vue, les colones ne sont pas copiées
+            positions = set(positions)
+            return self.table.take_mask(index in positions for index in range(len(self.table)))
+        return [self.table[index] for index in positions]
+
+    def plan(self):
+        """
+        Permet d'obtenir les prédicats dans l'ordre où ils seront appliqués. Les sélectivités sont données par les index
+        ou mesurées sur un échantillon de la table lors du premier appel, et après chaque modification d'une
+        IndexedTable
+        :return list[Predicate]: les prédicats, du plus intéressant au moins intéressant. Le premier est index_predicate
+            s'il y en a un
+        """
+        version = self.table.version if isinstance(self.table, IndexedTable) else None
+        if not self._planned or version != self._planned_version:
+            self.index_predicate = None
+            self._positions = None
+            counted = set()  # Les prédicats dont la sélectivité exacte est donnée par un index
+            if version is not None and self.table:
+                for predicate in self.predicates:
+                    count = predicate.count_positions(self.table)
+                    if count is not None:
+                        counted.add(predicate)
+                        predicate.selectivity = count / len(self.table)
+                        if self.index_predicate is None or predicate.selectivity < self.index_predicate.selectivity:
+                            self.index_predicate = predicate
+                if self.index_predicate is not None and self.index_predicate.selectivity > INDEX_MAX_SELECTIVITY:
+                    self.index_predicate = None
+                if self.index_predicate is not None:
+                    self._positions = self.index_predicate.find_positions(self.table)
+            sample = self._sample() if self.index_predicate is None else None
+            if sample:
+                for predicate in self.predicates:
+                    if predicate in counted:
+                        continue
+                    if isinstance(sample, ColumnTable):
+                        kept = len(predicate.apply(sample))
+                    else:
+                        kept = sum(1 for row in sample if predicate.test(row))
+                    predicate.selectivity = kept / len(sample)
+            self._planned = True
+            self._planned_version = version
+        # sorted est stable : à rang égal, l'ordre d'écriture est gardé
+        plan = sorted((predicate for predicate in self.predicates if predicate is not self.index_predicate),
+                      key=Predicate.rank)
+        return plan if self.index_predicate is None else [self.index_predicate] + plan
+
+    def explain(self):
+        """
+        Permet d'obtenir une description du plan choisi : les prédicats dans l'ordre d'exécution, avec leur coût et
+        leur sélectivité estimée
+        :return str: le plan, une ligne par prédicat
+        """
+        plan = self.plan()
+        if isinstance(self.table, (list, tuple, ColumnTable)):
+            source = '{} {} lignes'.format(type(self.table).__name__, len(self.table))
+        else:
+            source = 'générateur (sélectivités par défaut)'
+        lines = ['Query sur {}, {} prédicats en un passage'.format(source, len(plan))]
+        rows = 1.0
+        for step, predicate in enumerate(plan, 1):
+            rows *= predicate.selectivity
+            lines.append('{}. {:<32} coût {:>4.1f}  sélectivité {:>6.1%}  lignes restantes {:>6.1%}  (écrit en {}){}'
+                         .format(step, predicate.describe(), predicate.cost, predicate.selectivity, rows,
+                                 predicate.position + 1, '  [index]' if predicate is self.index_predicate else ''))
+        return '\n'.join(lines)
+
+    def rows(self):
+        """
+        Permet d'exécuter la requête en un seul passage, sans table intermédiaire
+        :return: un itérateur sur les lignes gardées, dans l'ordre de la table
+        """
+        if isinstance(self.table, ColumnTable):
+            return iter(self.all())
+        plan = self.plan()
+        if self.index_predicate is not None:
+            rows = map(self.table.__getitem__, self._positions)
+            plan = plan[1:]
+        else:
+            rows = iter(self.table)
+        for predicate in plan:
+            # filter est paresseux : les filtres imbriqués ne font qu'un seul passage sur la table
+            rows = filter(predicate.test, rows)
+        return rows
+
+    def all(self):
+        """
+        :return list[tuple] | ColumnTable: les lignes gardées, une vue si la table source est une ColumnTable
+        """
+        if isinstance(self.table, ColumnTable):
+            table = self.table
+            for predicate in self.plan():
+                table = predicate.apply(table)
+            return table
+        if isinstance(self.table, IndexedTable):
+            signature = tuple((predicate.kind, predicate.column_index, predicate.value)
+                              for predicate in self.predicates)
+            return cached_result(self.table, 'Query.all', (signature,), {}, lambda: list(self.rows()))
+        return list(self.rows())
+
+    def count(self):
+        """
+        :return int: le nombre de lignes gardées
+        """
+        if isinstance(self.table, ColumnTable):
+            return len(self.all())
+        return sum(1 for _ in self.rows())
+
+    def __iter__(self):
+        return self.rows()
+
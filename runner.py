@@ -0,0 +1,151 @@
+"""
+----- Exécution de tâches indépendantes dans plusieurs processus -----
+
+Une Task est une fonction (une question du rapport) avec ses entrées déclarées par leur nom. Une entrée est :
+- une source : une valeur calculée dans chaque processus par une fonction sans argument, comme une des tables du
+  projet, qui n'est jamais envoyée d'un processus à l'autre
+- la sortie d'une autre tâche (son output), comme les pays d'Europe renvoyés par la question 12 pour la question 18
+
+run_tasks exécute les tâches avec un ProcessPoolExecutor, en suivant les dépendances entre les tâches : une tâche est
+lancée dès que toutes ses entrées sont calculées, et une sortie est oubliée quand toutes les tâches qui l'utilisent
+sont terminées. Ce que chaque tâche affiche est gardé, puis affiché dans l'ordre des tâches, dès que toutes les tâches
+précédentes sont affichées : la sortie est la même qu'en exécutant les tâches l'une après l'autre.
+
+Les sources sont calculées dans le processus principal avant de créer les processus : avec fork (Linux), elles sont
+héritées sans être recalculées. Sinon, chaque processus les calcule au premier usage.
+"""
+
+import contextlib
+import io
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+# Sources du processus courant, et leurs valeurs déjà calculées
+_sources = dict()
+_source_values = dict()
+
+
+class Task:
+    """
+    Fonction à exécuter, avec ses entrées et le nom de sa sortie
+    """
+
+    def __init__(self, name, function, inputs=(), output=None):
+        """
+        :param str name: le nom de la tâche
+        :param function: la fonction, définie au niveau d'un module pour être envoyée aux processus
+        :param tuple[str] inputs: les noms des arguments de la fonction, des sources ou des sorties d'autres tâches
+        :param str output: le nom sous lequel le résultat de la fonction est donné aux autres tâches, None s'il n'est
+            pas utilisé
+        """
+        self.name = name
+        self.function = function
+        self.inputs = tuple(inputs)
+        self.output = output
+
+
+def _set_sources(sources):
+    """
+    Permet de donner les sources à un processus, au démarrage
+    :param dict sources: une fonction sans argument pour chaque nom de source
+    """
+    _sources.update(sources)
+
+
+def _get_source(name):
+    """
+    :param str name: le nom d'une source
+    :return: la valeur de la source, calculée au premier appel dans le processus courant
+    """
+    if name not in _source_values:
+        _source_values[name] = _sources[name]()
+    return _source_values[name]
+
+
+def _run_task(function, inputs, values):
+    """
+    Permet d'exécuter une tâche en gardant ce qu'elle affiche
+    :param function: la fonction de la tâche
+    :param tuple[str] inputs: les noms des entrées
+    :param dict values: les sorties des autres tâches utilisées par la tâche, les autres entrées sont des sources
+    :return tuple[str, any]: ce qui a été affiché, et le résultat de la fonction
+    """
+    arguments = [values[name] if name in values else _get_source(name) for name in inputs]
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function(*arguments)
+    return output.getvalue(), result
+
+
+def _submit(executor, function, *args):
+    """
+    :param ProcessPoolExecutor executor: les processus, ou None pour exécuter la fonction dans le processus courant
+    :return Future: le résultat de l'appel
+    """
+    if executor is not None:
+        return executor.submit(function, *args)
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+
+def run_tasks(tasks, sources, workers=None):
+    """
+    Permet d'exécuter des tâches dans plusieurs processus, et d'afficher ce qu'elles affichent dans leur ordre
+    :param list[Task] tasks: les tâches, dans l'ordre d'affichage
+    :param dict sources: une fonction sans argument pour chaque nom de source
+    :param int workers: le nombre de processus, None pour le nombre de processeurs. Avec 1, les tâches sont exécutées
+        dans le processus courant
+    """
+    producers = {task.output: task for task in tasks if task.output is not None}
+    for task in tasks:
+        for name in task.inputs:
+            if name not in sources and name not in producers:
+                raise ValueError('Unkonw input ' + name + ' for task ' + task.name)
+    # Nombre de tâches qui attendent encore chaque sortie
+    consumers = Counter(name for task in tasks for name in task.inputs if name in producers)
+
+    # Les sources sont recalculées à chaque appel, par exemple après le changement d'une table
+    _source_values.clear()
+    _set_sources(sources)
+    for name in sources:
+        _get_source(name)
+
+    values = dict()
+    outputs = [None] * len(tasks)
+    waiting = list(range(len(tasks)))
+    running = dict()
+    printed = 0
+    if workers == 1:
+        executor_context = contextlib.nullcontext()
+    else:
+        executor_context = ProcessPoolExecutor(max_workers=workers, initializer=_set_sources, initargs=(sources,))
+    with executor_context as executor:
+        while waiting or running:
+            for position in list(waiting):
+                task = tasks[position]
+                if all(name in sources or name in values for name in task.inputs):
+                    waiting.remove(position)
+                    task_values = {name: values[name] for name in task.inputs if name in producers}
+                    running[_submit(executor, _run_task, task.function, task.inputs, task_values)] = position
+            if not running:
+                raise ValueError('Circular dependencies between the tasks ' +
+                                 ', '.join(tasks[position].name for position in waiting))
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = running.pop(future)
+                task = tasks[position]
+                outputs[position], result = future.result()
+                if consumers[task.output]:  # Sortie utilisée par d'autres tâches
+                    values[task.output] = result
+                for name in task.inputs:
+                    if name in producers:
+                        consumers[name] -= 1
+                        if not consumers[name]:
+                            del values[name]
+
+            while printed < len(tasks) and outputs[printed] is not None:
+                print(outputs[printed], end='')
+                outputs[printed] = ''
+                printed += 1
@@ -0,0 +1,227 @@
+"""
+----- Plusieurs requêtes sur une même table en un seul passage -----
+
+Un SharedScan reçoit plusieurs appels de fonctions de tables (filtres et résumés), enregistrés sans la table, puis
+les exécute tous en parcourant la table une seule fois :
+
+    scan = SharedScan()
+    scan.add(filter_table_by_regex, 1, '^pa')
+    scan.add(summarize_column_by_group, 2, 4)
+    paris_cities, population_by_country_code = scan.run(table_city)
+
+La table est lue par morceaux de chunk_size lignes, et chaque morceau est passé à toutes les requêtes avant de lire
+le suivant : un générateur (get_table_content(..., lazy=True)) n'est donc lu qu'une fois, sans garder le fichier en
+mémoire, et un morceau reste dans le cache du processeur pendant que les requêtes le parcourent. Chaque requête
+renvoie exactement le résultat de l'appel équivalent sur toute la table.
+
+La table est une table de tuples de strings (une liste, une IndexedTable) ou un générateur de telles lignes, comme
+un fichier lu avec get_table_content(..., lazy=True). Une ColumnTable est refusée : ses cases sont déjà converties,
+et les fonctions de tables la traitent directement par colones.
+
+C'est ce qu'utilise python projet.py --shared-scan pour lire les villes une seule fois pour tout le rapport : les
+résultats sont donnés aux questions, qui ne parcourent plus les villes (voir projet.get_city_scan).
+"""
+
+from inspect import unwrap
+from itertools import islice
+from operator import itemgetter
+
+from columnar import ColumnTable
+from patterns import is_number
+from tables import update_column_summary_by_group
+
+# Nombre de lignes passées à toutes les requêtes à la fois
+SCAN_CHUNK_ROWS = 10_000
+
+
+class _RowsAccumulator:
+    """
+    Filtre (filter_table_by_*) : les lignes gardées de chaque morceau sont ajoutées au résultat
+    """
+
+    def __init__(self, function, *args):
+        self.function = unwrap(function)  # Sans la mesure ni le cache, inutiles pour un morceau
+        if self.function.__name__ == 'filter_table_by_list':
+            args = (args[0], frozenset(args[1])) + args[2:]  # Convertie une seule fois, et non pour chaque morceau
+        self.args = args
+        self.rows = list()
+
+    def update(self, chunk):
+        self.rows.extend(self.function(chunk, *self.args))
+
+    def result(self):
+        return self.rows
+
+
+class _SemiJoinAccumulator:
+    """
+    join_on en semi ou anti : les clés de la table de droite sont lues une seule fois, puis les lignes de chaque
+    morceau qui ont (ou n'ont pas) leur clé dans la table de droite sont ajoutées au résultat
+    """
+
+    def __init__(self, function, right, left_col, right_col, how='inner', right_width=None):
+        if how not in ('semi', 'anti'):  # Les autres jointures ne gardent pas seulement des lignes de la table
+            raise ValueError('Unsupported join type ' + how)
+        self.right_keys = frozenset(row[right_col] for row in right)
+        self.left_col = left_col
+        self.keep_matches = how == 'semi'
+        self.rows = list()
+
+    def update(self, chunk):
+        left_col, right_keys = self.left_col, self.right_keys
+        if self.keep_matches:
+            self.rows.extend(row for row in chunk if row[left_col] in right_keys)
+        else:
+            self.rows.extend(row for row in chunk if row[left_col] not in right_keys)
+
+    def result(self):
+        return self.rows
+
+
+class _UniqueValuesAccumulator:
+    """
+    get_unique_values_on_column : les valeurs dans l'ordre de leur première apparition
+    """
+
+    def __init__(self, function, column_index):
+        self.column_index = column_index
+        self.values = dict()
+
+    def update(self, chunk):
+        self.values.update(dict.fromkeys(map(itemgetter(self.column_index), chunk)))
+
+    def result(self):
+        return tuple(self.values)
+
+
+class _SummaryAccumulator:
+    """
+    summarize_column : la somme est faite dans l'ordre des lignes, pour obtenir exactement le même total
+    """
+
+    def __init__(self, function, column_index):
+        self.column_index = column_index
+        self.total = float()
+        self.matches = 0
+
+    def update(self, chunk):
+        column_index = self.column_index
+        for row in chunk:
+            if is_number(row[column_index]):
+                self.total += float(row[column_index])
+                self.matches += 1
+
+    def result(self):
+        return {'sum': self.total, 'count': self.matches}
+
+
+class _GroupsAccumulator:
+    """
+    group_by : les groupes de chaque morceau sont ajoutés à la suite des groupes déjà trouvés
+    """
+
+    def __init__(self, function, key_column):
+        self.function = unwrap(function)
+        self.key_column = key_column
+        self.groups = dict()
+
+    def update(self, chunk):
+        for key, rows in self.function(chunk, self.key_column).items():
+            group = self.groups.get(key)
+            if group is None:
+                self.groups[key] = rows
+            else:
+                group.extend(rows)
+
+    def result(self):
+        return self.groups
+
+
+class _GroupSummaryAccumulator:
+    """
+    summarize_column_by_group : le résumé de chaque groupe est mis à jour avec update_column_summary_by_group
+    """
+
+    def __init__(self, function, key_column, column_index):
+        self.key_column = key_column
+        self.column_index = column_index
+        self.groups = dict()
+
+    def update(self, chunk):
+        update_column_summary_by_group(self.groups, chunk, self.key_column, self.column_index)
+
+    def result(self):
+        return self.groups
+
+
+class _CountAccumulator:
+    """
+    count_rows : le nombre de lignes
+    """
+
+    def __init__(self, function):
+        self.count = 0
+
+    def update(self, chunk):
+        self.count += len(chunk)
+
+    def result(self):
+        return self.count
+
+
+# Accumulateur de chaque fonction de tables qui peut être ajoutée à un SharedScan
+ACCUMULATORS = {
+    'filter_table_by_value': _RowsAccumulator,
+    'filter_table_by_list': _RowsAccumulator,
+    'filter_table_by_comparator': _RowsAccumulator,
+    'filter_table_by_regex': _RowsAccumulator,
+    'join_on': _SemiJoinAccumulator,
+    'get_unique_values_on_column': _UniqueValuesAccumulator,
+    'summarize_column': _SummaryAccumulator,
+    'group_by': _GroupsAccumulator,
+    'summarize_column_by_group': _GroupSummaryAccumulator,
+    'count_rows': _CountAccumulator,
+}
+
+
+class SharedScan:
+    """
+    Liste d'appels de fonctions de tables, exécutés ensemble en un seul passage sur une table
+    """
+
+    def __init__(self):
+        self.calls = list()
+
+    def add(self, function, *args):
+        """
+        Permet d'ajouter un appel, sans la table
+        :param function: une fonction de tables, une clé de ACCUMULATORS
+        :param args: les arguments qui suivent la table
+        :return int: la position du résultat dans la liste renvoyée par run
+        """
+        if function.__name__ not in ACCUMULATORS:
+            raise ValueError('Unsupported function ' + function.__name__)
+        self.calls.append((function, args))
+        return len(self.calls) - 1
+
+    def __len__(self):
+        return len(self.calls)
+
+    def run(self, table, chunk_size=SCAN_CHUNK_ROWS):
+        """
+        Permet d'exécuter tous les appels en un seul passage
+        :param list[tuple] table: la table de tuples de strings, ou un générateur de lignes
+        :param int chunk_size: le nombre de lignes passées à tous les appels à la fois
+        :return list: le résultat de chaque appel, dans l'ordre des ajouts
+        """
+        if isinstance(table, ColumnTable):
+            raise TypeError('SharedScan runs on tuple rows, not on a ColumnTable')
+        accumulators = [ACCUMULATORS[function.__name__](function, *args) for function, args in self.calls]
+        rows = iter(table)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            for accumulator in accumulators:
+                accumulator.update(chunk)
+        return [accumulator.result() for accumulator in accumulators]
@@ -0,0 +1,730 @@
+"""
+----- Fonctions de manipulation de tables -----
+
+Ce module regroupe les fonctions réutilisables du projet. Il peut être importé sans effet de bord : aucun fichier
+CSV n'est lu tant qu'une table n'est pas demandée.
+
+Les tables du projet (table_lang, table_country, table_city) sont chargées à la demande lors du premier accès,
+par exemple avec ``tables.table_city`` ou ``get_default_table('table_city')``.
+
+Le vocabulaire est le même que dans projet.py : une table est une liste de tuples, row une ligne, column une colone
+et cell une case.
+
+Mode paresseux : get_table_content et les fonctions filter_table_by_* acceptent lazy=True. Elles renvoient alors un
+générateur au lieu d'une liste, et les filtres s'enchainent sans copier la table. Seule l'étape finale (display_table,
+count_rows, summarize_column...) parcourt les lignes, une seule fois, ce qui garde la mémoire utilisée constante
+quelle que soit la taille du fichier. Un générateur ne peut être parcouru qu'une fois.
+
+Tables typées : get_column_table charge un fichier dans une ColumnTable (voir le module columnar), dont chaque colone
+est convertie une seule fois dans le type donné par un schéma. Les filtres et summarize_column l'utilisent directement.
+
+Index : les tables par défaut sont des IndexedTable (voir le module indexes). filter_table_by_value,
+filter_table_by_list et filter_table_by_comparator utilisent un index quand la colone filtrée en a un, au lieu de
+parcourir toute la table.
+
+Lecture : get_table_content lit les fichiers avec le moteur PARSE_ENGINE, qui découpe de gros blocs avec str.split au
+lieu de passer par csv.reader ligne par ligne (voir le module parsers). engine='csv' garde l'ancienne lecture.
+
+Mesures : les fonctions principales sont décorées avec profiling.profiled, qui ne mesure rien tant que
+profiling.enable() n'est pas appelée (voir le module profiling et python projet.py --profile).
+
+Cache de résultats : les filtres, get_unique_values_on_column, summarize_column, group_by et
+summarize_column_by_group gardent leurs résultats sur les tables par défaut (voir le module memo). Un appel répété
+avec les mêmes arguments est gratuit ; reload_default_table relit un fichier et retire les résultats qui en dépendent.
+"""
+
+import heapq
+import os
+import re
+import sys
+from itertools import chain
+from operator import itemgetter
+
+from columnar import CITY_SCHEMA, COUNTRY_SCHEMA, LANG_SCHEMA, ColumnTable, load_numpy
+from disk_cache import get_cache_header, load_cached_table, save_cached_table
+from external_sort import external_sort, get_sort_key
+from indexes import INDEX_MAX_SELECTIVITY, IndexedTable
+from memo import memoized, results_cache
+from parsers import get_projection, iter_rows
+from patterns import get_regex_matcher, is_number
+from profiling import profiled
+
+DATA_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+CSV_DELIMITER = ';'
+
+# Moteur de lecture utilisé par get_table_content, voir parsers.PARSE_ENGINES
+PARSE_ENGINE = 'bytes'
+
+# True pour que get_default_table utilise le cache sur disque (voir le module disk_cache). Désactivé par défaut : il
+# n'accélère plus le chargement depuis le moteur 'bytes'
+DEFAULT_TABLE_CACHE = False
+
+# Nombre maximal de caractères d'une case affichée par display_table
+MAX_CELL_WIDTH = 60
+
+# Nom des tables par défaut et fichier CSV associé
+DEFAULT_TABLES = {
+    'table_lang': 'langues.csv',
+    'table_country': 'pays.csv',
+    'table_city': 'villes.csv',
+}
+
+# Schéma de chaque table par défaut, pour get_default_column_table
+DEFAULT_SCHEMAS = {
+    'table_lang': LANG_SCHEMA,
+    'table_country': COUNTRY_SCHEMA,
+    'table_city': CITY_SCHEMA,
+}
+
+# Colones indexées de chaque table par défaut : index de hachage (égalité, liste blanche) et index triés (comparaisons)
+DEFAULT_INDEXES = {
+    'table_lang': {'hash_columns': (0, 1), 'sorted_columns': (3,)},
+    'table_country': {'hash_columns': (0, 2, 3), 'sorted_columns': (4, 5, 6, 7)},
+    'table_city': {'hash_columns': (0, 2), 'sorted_columns': (4,)},
+}
+
+_loaded_tables = dict()
+_loaded_column_tables = dict()
+
+
+@profiled
+def get_table_content(file_name, lazy=False, cache=False, columns=None, engine=PARSE_ENGINE):
+    """
+    Permet d'obtenir les données d'un fichier CSV sous la forme le tuples dans une liste
+    :param str file_name: l'emplacement du fichier
+    :param bool lazy: true pour obtenir un générateur qui lit le fichier ligne par ligne
+    :param bool cache: true pour utiliser le cache sur disque (voir le module disk_cache). Ignoré en mode paresseux
+        et avec columns
+    :param tuple[int] columns: les index des colones à garder, dans l'ordre voulu. None pour garder toutes les colones
+    :param str engine: le moteur de lecture, 'csv', 'split' ou 'bytes' (voir le module parsers)
+    :return: le contenu du fichier
+    """
+    if lazy:
+        return _iter_table_content(file_name, columns, engine)
+    if cache and columns is None:
+        content = load_cached_table(file_name, CSV_DELIMITER)
+        if content is not None:
+            return content
+        header = get_cache_header(file_name, CSV_DELIMITER)  # Avant la lecture, voir save_cached_table
+    # Les colones non gardées ne sont jamais copiées dans les tuples, et sont libérées aussitôt
+    content = list(_read_rows(file_name, columns, engine))
+    if cache and columns is None:
+        save_cached_table(file_name, header, content)
+    return content
+
+
+def _iter_table_content(file_name, columns=None, engine=PARSE_ENGINE):
+    """
+    Générateur utilisé par get_table_content en mode paresseux. Le fichier est fermé une fois la dernière ligne lue
+    :param str file_name: l'emplacement du fichier
+    :param tuple[int] columns: les index des colones à garder, None pour toutes les colones
+    :param str engine: le moteur de lecture (voir le module parsers)
+    :return: les lignes du fichier, une par une
+    """
+    yield from _read_rows(file_name, columns, engine)
+
+
+def _read_rows(file_name, columns, engine):
+    """
+    :param str file_name: l'emplacement du fichier
+    :param tuple[int] columns: les index des colones à garder, None pour toutes les colones
+    :param str engine: le moteur de lecture (voir le module parsers)
+    :return: les lignes du fichier sous forme de tuples. La projection est faite pendant le découpage des lignes
+    """
+    rows = iter_rows(file_name, CSV_DELIMITER, engine, columns=columns)
+    # Le moteur 'csv' renvoie des listes quand toutes les colones sont gardées, tuple ne copie pas un tuple
+    return rows if columns is not None else map(tuple, rows)
+
+
+def get_default_table(name):
+    """
+    Permet d'obtenir une des tables du projet. Le fichier n'est lu qu'au premier appel, les appels suivants
+    renvoient la même table. Le cache sur disque est utilisé si DEFAULT_TABLE_CACHE est vrai, et les colones de
+    DEFAULT_INDEXES sont indexées
+    :param str name: le nom de la table (table_lang, table_country ou table_city)
+    :return IndexedTable: le contenu de la table
+    """
+    if name not in _loaded_tables:
+        _loaded_tables[name] = IndexedTable(
+            get_table_content(os.path.join(DATA_DIRECTORY, DEFAULT_TABLES[name]), cache=DEFAULT_TABLE_CACHE),
+            **DEFAULT_INDEXES[name]
+        )
+    return _loaded_tables[name]
+
+
+def reload_default_table(name):
+    """
+    Permet de relire une des tables du projet, par exemple après une modification du fichier. Les résultats gardés
+    en cache pour l'ancienne table sont retirés
+    :param str name: le nom de la table (table_lang, table_country ou table_city)
+    :return IndexedTable: le nouveau contenu de la table
+    """
+    old_table = _loaded_tables.pop(name, None)
+    _loaded_column_tables.pop(name, None)
+    if old_table is not None:
+        results_cache.invalidate(old_table.version)
+    return get_default_table(name)
+
+
+def get_column_table(file_name, schema, backend='python'):
+    """
+    Permet d'obtenir les données d'un fichier CSV sous la forme d'une table typée stockée par colones
+    :param str file_name: l'emplacement du fichier
+    :param tuple[str] schema: le type de chaque colone (voir le module columnar)
+    :param str backend: 'python', ou 'numpy' pour que les colones numériques soient des ndarray (NumPy requis)
+    :return ColumnTable: le contenu du fichier
+    """
+    if backend == 'numpy':
+        load_numpy()  # Avant la lecture du fichier, pour une erreur immédiate sans NumPy
+    table = ColumnTable.from_rows(get_table_content(file_name, lazy=True), schema)
+    return table.to_numpy() if backend == 'numpy' else table
+
+
+def get_default_column_table(name):
+    """
+    Equivalent de get_default_table, qui renvoie une table typée stockée par colones
+    :param str name: le nom de la table (table_lang, table_country ou table_city)
+    :return ColumnTable: le contenu de la table
+    """
+    if name not in _loaded_column_tables:
+        _loaded_column_tables[name] = get_column_table(
+            os.path.join(DATA_DIRECTORY, DEFAULT_TABLES[name]), DEFAULT_SCHEMAS[name]
+        )
+    return _loaded_column_tables[name]
+
+
+def __getattr__(name):
+    """
+    Chargement paresseux des tables par défaut : ``tables.table_city`` ne lit villes.csv qu'au premier accès
+    :param str name: le nom de l'attribut demandé
+    :return list[tuple]: la table demandée
+    """
+    if name in DEFAULT_TABLES:
+        return get_default_table(name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+@profiled
+def display_table(table, start=0, end=None, file=None, max_width=MAX_CELL_WIDTH, total_rows=None):
+    """
+    Permet d'afficher le contenu d'une table proprement dans la console.
+    Seules les lignes affichées sont converties en strings, une seule fois par case. Les cases trop longues sont
+    coupées et terminées par '…'
+    :param list[tuple] | ColumnTable table: la table à afficher
+    :param int start: l'index de la permière ligne d'ou démarrer l'affichage
+    :param int end: l'index de la dernière ligne d'ou arreter l'affichage
+    :param file: le flux où écrire la table (un fichier ouvert, io.StringIO...), None pour sys.stdout
+    :param int max_width: le nombre maximal de caractères d'une case, les cases plus longues sont coupées. None pour
+        ne jamais couper
+    :param int total_rows: le nombre de lignes annoncé, quand la table n'est qu'une partie d'une table plus grande (les
+        lignes gardées par top_k...). None pour le nombre de lignes de la table
+    """
+    if isinstance(table, (list, tuple, ColumnTable)):
+        new_table = table[start:end]
+        rows = len(table)
+    else:  # Générateur : on ne garde que les lignes affichées, les autres sont seulement comptées
+        new_table = list()
+        rows = 0
+        for row in table:
+            if rows >= start and (end is None or rows < end):
+                new_table.append(row)
+            rows += 1
+    if total_rows is not None:
+        rows = total_rows
+
+    cells = [list(map(str, row)) for row in new_table]  # Chaque case est convertie une seule fois
+    columns = len(cells[0]) if cells else 0
+    row_max_length = [max(map(len, column)) for column in zip(*cells)]
+    for index, length in enumerate(row_max_length):
+        if max_width is not None and length > max_width:  # On ne coupe que les colones trop larges
+            for row in cells:
+                if len(row[index]) > max_width:
+                    row[index] = row[index][:max_width - 1] + '…'
+            row_max_length[index] = max_width
+
+    # Le séparateur et le format d'une ligne sont les mêmes pour toutes les lignes
+    separator = '+' + '+'.join(['-' * (length + 2) for length in row_max_length]) + '+\n'
+    row_format = '| ' + ' | '.join(['{:<%d}' % length for length in row_max_length]) + ' |\n'
+
+    lines = ['{} lignes ({} affichées), {} colones, {} cellules ({} affichées)\n'
+             .format(rows, len(cells), columns, rows * columns, len(cells) * columns)]
+    for row in cells:
+        lines.append(separator)
+        lines.append(row_format.format(*row))
+    if cells:
+        lines.append(separator)
+
+    # Ecris toutes les lignes d'un coup pour une meilleure performance
+    (sys.stdout if file is None else file).writelines(lines)
+
+
+def filter_table_columns(table, *columns, lazy=False):
+    """
+    Permet de ne garder que les colones spécifiées
+    :param list[tuple] | ColumnTable table: la table à filtrer
+    :param int columns: numéros des colones à garder, dans l'ordre voulu
+    :param bool lazy: true pour obtenir un générateur au lieu d'une liste
+    :return list[tuple]: la table filtrée
+    """
+    if not columns:
+        return table
+    if isinstance(table, ColumnTable):  # Les colones sont partagées, sans copie
+        return table.select_columns(columns)
+    rows = map(get_projection(columns), table)
+    return rows if lazy else list(rows)
+
+
+def change_table_direction(table):
+    """
+    Permet de "tourner la table de 45°".
+    Cette fonction convertis une liste contenant les lignes dans des tuples en une liste contenant les colones dans des
+    tuples
+
+    :param list[tuple] table: la table à convertir
+    :return list[tuple]: la table convertie
+    """
+    new_table = [[] for x in table[0]]
+    for row in table:
+        for index, cell in enumerate(row):
+            new_table[index].append(cell)
+    new_table = [tuple(x) for x in new_table]
+    return new_table
+
+
+def get_rows_max_length(table):
+    """
+    Permet de calculer le nombre de caractères de la plus longue valeur de chaque colone d'une table
+    :param list[tuple] table: la table source
+    :return list[int]: une liste contenant la longueur maximale de chaque colone
+    """
+    # zip(*table) parcourt la table colone par colone, sans construire de table intermédiaire
+    return [max(map(len, map(str, column))) for column in zip(*table)]
+
+
+@profiled
+def join_tables(table1, table2):
+    """
+    Permet d'effectuer le produit cartésien de deux tables
+    :param list[tuple] table1: permière table
+    :param list[tuple] table2: seconde table
+    :return list[tuple]: le produit cartésien des deux tables
+    """
+    new_table = list()
+    for row1 in table1:
+        for row2 in table2:
+            new_table.append(row1 + row2)
+    new_table = [tuple(row) for row in new_table]
+    return new_table
+
+
+@profiled
+def join_on(left, right, left_col, right_col, how='inner', right_width=None):
+    """
+    Permet de faire une jointure d'égalité entre deux tables : les lignes sont associées quand la valeur de left_col
+    est égale à celle de right_col. Une table de hachage est construite sur une table, l'autre est parcourue une
+    seule fois.
+
+    - inner : les lignes associées, mises bout à bout (ligne de gauche + ligne de droite). La table de hachage est
+      construite sur la plus petite table, le résultat suit l'ordre de la plus grande
+    - left : comme inner, mais les lignes de gauche sans correspondance sont gardées, complétées avec des 'NULL'
+    - semi : les lignes de gauche qui ont au moins une correspondance, sans doublon
+    - anti : les lignes de gauche qui n'ont aucune correspondance
+
+    Pour left, semi et anti, la table de gauche est parcourue et garde son ordre ; pour semi et anti seules les clés
+    de droite sont gardées en mémoire. Si une des tables est un générateur, la table de hachage est construite sur
+    la table de droite. Pour left, le nombre de 'NULL' ajoutés est le nombre de colones de la première ligne de
+    droite, ou right_width si la table de droite est vide.
+
+    :param list[tuple] left: la table de gauche
+    :param list[tuple] right: la table de droite
+    :param int left_col: l'index de la colone clé dans la table de gauche
+    :param int right_col: l'index de la colone clé dans la table de droite
+    :param str how: le type de jointure (inner, left, semi ou anti)
+    :param int right_width: le nombre de colones de la table de droite, seulement utilisé par left quand elle est
+        vide. None pour le déduire de la première ligne
+    :return list[tuple]: la table jointe
+    """
+    if how == 'semi':
+        right_keys = {row[right_col] for row in right}
+        return [row for row in left if row[left_col] in right_keys]
+    elif how == 'anti':
+        right_keys = {row[right_col] for row in right}
+        return [row for row in left if row[left_col] not in right_keys]
+    elif how == 'inner':
+        if not isinstance(left, list) or not isinstance(right, list) or len(right) <= len(left):
+            right_groups = group_by(right, right_col)
+            return [row + match for row in left for match in right_groups.get(row[left_col], ())]
+        else:
+            left_groups = group_by(left, left_col)
+            return [match + row for row in right for match in left_groups.get(row[right_col], ())]
+    elif how == 'left':
+        # La table de droite peut être un générateur : la largeur est lue pendant la construction des groupes
+        right_groups = dict()
+        for row in right:
+            if right_width is None:
+                right_width = len(row)
+            group = right_groups.get(row[right_col])
+            if group is None:
+                right_groups[row[right_col]] = [row]
+            else:
+                group.append(row)
+        null_row = None if right_width is None else ('NULL',) * right_width
+        new_table = list()
+        for row in left:
+            matches = right_groups.get(row[left_col])
+            if matches is None:
+                if null_row is None:
+                    raise ValueError('The width of an empty right table is unknown, right_width is required')
+                new_table.append(row + null_row)
+            else:
+                for match in matches:
+                    new_table.append(row + match)
+        return new_table
+    else:
+        raise ValueError('Unknown join type ' + how)
+
+
+@profiled
+@memoized
+def filter_table_by_regex(table, column_index, regex, lazy=False):
+    """
+    Permet de filter une table en regardant si les valeurs de la colone spécifiée respectent l'expression régulière
+    :param list[tuple] | ColumnTable table: la table source
+    :param int column_index: l'index de la colone à filtrer
+    :param str regex: l'expression régulière qui sert de filtre
+    :param bool lazy: true pour obtenir un générateur au lieu d'une liste
+    :return list[tuple]: la table filtrée
+    """
+    if isinstance(table, ColumnTable):
+        return table.filter_by_regex(column_index, regex)
+    match = get_regex_matcher(regex, re.IGNORECASE)  # Compilée une seule fois, ou remplacée par startswith / in
+    rows = (row for row in table if match(row[column_index]))
+    return rows if lazy else list(rows)
+
+
+@profiled
+@memoized
+def filter_table_by_value(table, column_index, value, lazy=False):
+    """
+    Permet de filter une table en regardant si les valeurs de la colone spécifiée respectent l'expression régulière
+    :param list[tuple] | ColumnTable table: la table source
+    :param int column_index: l'index de la colone à filtrer
+    :param str value: la valeur qui sera comparée
+    :param bool lazy: true pour obtenir un générateur au lieu d'une liste
+    :return list[tuple]: la table filtrée
+    """
+    if isinstance(table, ColumnTable):
+        return table.filter_by_value(column_index, value)
+    # L'index n'est utilisé que s'il garde peu de lignes, sinon le parcours de la table est plus rapide
+    positions = None
+    if isinstance(table, IndexedTable):
+        positions = table.find_value(column_index, value, INDEX_MAX_SELECTIVITY)
+    if positions is not None:
+        rows = map(table.__getitem__, positions)
+    else:
+        rows = (row for row in table if value == row[column_index])
+    return rows if lazy else list(rows)
+
+
+@profiled
+@memoized
+def filter_table_by_list(table, column_index, whitelist, lazy=False):
+    """
+    Permet de filtrer une table en regardant si les valeurs de la colone spécifiée sont dans une liste blanche
+    :param list[tuple] | ColumnTable table: la table source
+    :param int column_index: l'index de la colone à filtrer
+    :param tuple[str] | list[str] | set[str] whitelist: la liste blanche
+    :param bool lazy: true pour obtenir un générateur au lieu d'une liste
+    :return list[tuple]: la table filtrée
+    """
+    if isinstance(table, ColumnTable):
+        return table.filter_by_list(column_index, whitelist)
+    positions = None
+    if isinstance(table, IndexedTable):
+        positions = table.find_list(column_index, whitelist, INDEX_MAX_SELECTIVITY)
+    if positions is not None:
+        rows = map(table.__getitem__, positions)
+    else:
+        if not isinstance(whitelist, (set, frozenset)):
+            whitelist = set(whitelist)  # Une recherche dans une liste parcourrait toute la liste pour chaque ligne
+        rows = (row for row in table if row[column_index] in whitelist)
+    return rows if lazy else list(rows)
+
+
+@profiled
+@memoized
+def filter_table_by_comparator(table, column_index, comparator, number, lazy=False):
+    """
+    Permet de filtrer une table en regardant si les valeurs de la colone spécifiée sont supérieurs, inférieurs, ou
+    égaux au nombre spécifié
+    :param list[tuple] | ColumnTable table: la table source
+    :param int column_index: l'index de la colone à filtrer
+    :param str comparator: le signe qui permet de comparer (>, <=, == et autres)
+    :param int | float number: le nombre auquel les valeurs sont comparées
+    :param bool lazy: true pour obtenir un générateur au lieu d'une liste
+    :return list[tuple]: la table filtrée
+    """
+    if isinstance(table, ColumnTable):
+        return table.filter_by_comparator(column_index, comparator, number)
+    positions = None
+    if isinstance(table, IndexedTable):
+        positions = table.find_range(column_index, comparator, number, INDEX_MAX_SELECTIVITY)
+    if positions is not None:
+        rows = map(table.__getitem__, positions)
+    elif comparator == '<':
+        rows = (row for row in table if row[column_index] != 'NULL' and float(row[column_index]) < float(number))
+    elif comparator == '>':
+        rows = (row for row in table if row[column_index] != 'NULL' and float(row[column_index]) > float(number))
+    else:
+        raise ValueError('Unkonw comparator ' + comparator)
+    return rows if lazy else list(rows)
+
+
+def count_rows(table):
+    """
+    Permet de compter les lignes d'une table, y compris quand c'est un générateur
+    :param list[tuple] | ColumnTable table: la table source
+    :return int: le nombre de lignes
+    """
+    if isinstance(table, (list, tuple, ColumnTable)):
+        return len(table)
+    return sum(1 for _ in table)
+
+
+@profiled
+@memoized
+def get_unique_values_on_column(table, column_index):
+    """
+    Permet de récupérer une tuple contenant toutes les valeurs de la colone spécifiée, en évitant les doublons.
+    Les valeurs sont dans l'ordre de leur première apparition
+    :param list[tuple] | ColumnTable table: la table source
+    :param column_index: l'index de la colone à récupérer
+    :return tuple[str]: tuple contenant les valeurs uniques
+    """
+    if isinstance(table, ColumnTable):
+        return tuple(dict.fromkeys(table.values(column_index)))
+    # Les clés d'un dict ne peuvent pas être en double, et gardent leur ordre d'insertion
+    return tuple(dict.fromkeys(map(itemgetter(column_index), table)))
+
+
+@profiled
+def filter_duplicated_rows(table, *column_indexes, lazy=False):
+    """
+    Permet retirer les lignes dupliquées en prenant pour échantillon les colones spécifiées.
+    Seul la première ligne de chaque doublons sera gardée, l'ordre des lignes est conservé.
+    Avec plusieurs colones, deux lignes sont des doublons si toutes ces colones sont égales ; sans colone, si les
+    lignes entières sont égales
+    :param list[tuple] table: la table source
+    :param int column_indexes: les index des colones servant d'échantillon
+    :param bool lazy: true pour obtenir un générateur au lieu d'une liste
+    :return list[tuple]: la liste filtrée
+    """
+    rows = _iter_distinct_rows(table, itemgetter(*column_indexes) if column_indexes else None)
+    return rows if lazy else list(rows)
+
+
+def _iter_distinct_rows(table, key):
+    """
+    Générateur utilisé par filter_duplicated_rows : les clés déjà vues sont gardées dans un set
+    :param list[tuple] table: la table source
+    :param key: la fonction qui donne la clé d'une ligne, None pour utiliser la ligne entière
+    :return: les lignes dont la clé n'a pas encore été vue
+    """
+    seen = set()
+    for row in table:
+        value = row if key is None else key(row)
+        if value not in seen:
+            seen.add(value)
+            yield row
+
+
+@profiled
+@memoized
+def summarize_column(table, column_index):
+    """
+    Permet de faire le total des nombres de la colone d'un tableau
+    :param list[tuple] | ColumnTable table: la table source
+    :param int column_index: l'index de la colone à traiter
+    :return : un objet dans lequel se trouve le nombre total (clé sum) et le nombre de valeurs traitées (clé count)
+    """
+    if isinstance(table, ColumnTable):
+        return table.summarize_column(column_index)
+    total = float()
+    matches = 0
+    for row in table:
+        if is_number(row[column_index]):  # On teste si c'est un nombre pour éviter les erreurs
+            total += float(row[column_index])
+            matches += 1
+    return {'sum': total, 'count': matches}
+
+
+@profiled
+@memoized
+def group_by(table, key_column):
+    """
+    Permet de regrouper les lignes d'une table d'après la valeur de la colone clé, en un seul passage.
+    Les groupes sont dans l'ordre de première apparition de chaque clé
+    :param list[tuple] table: la table source
+    :param int key_column: l'index de la colone qui sert de clé
+    :return dict[str, list[tuple]]: les lignes de chaque groupe, indexées par la valeur de la clé
+    """
+    groups = dict()
+    for row in table:
+        group = groups.get(row[key_column])
+        if group is None:
+            groups[row[key_column]] = [row]
+        else:
+            group.append(row)
+    return groups
+
+
+@profiled
+@memoized
+def summarize_column_by_group(table, key_column, column_index):
+    """
+    Permet de calculer en un seul passage le minimum, le maximum, la somme, le nombre et la moyenne des nombres d'une
+    colone pour chaque valeur de la colone clé. Comme pour summarize_column, les valeurs qui ne sont pas des nombres
+    sont ignorées
+    :param list[tuple] | ColumnTable table: la table source
+    :param int key_column: l'index de la colone qui sert de clé
+    :param int column_index: l'index de la colone à traiter
+    :return dict[str, dict]: pour chaque clé, un objet avec les clés min, max, sum, count et mean
+    """
+    groups = dict()
+    update_column_summary_by_group(groups, table, key_column, column_index)
+    return groups
+
+
+def update_column_summary_by_group(groups, table, key_column, column_index):
+    """
+    Permet d'ajouter des lignes à un résultat de summarize_column_by_group, sans reprendre les lignes déjà comptées.
+    Le dict groups est modifié directement, et seule la moyenne des groupes qui ont de nouvelles lignes est recalculée :
+    le coût dépend du nombre de nouvelles lignes, pas du nombre de groupes
+    :param dict[str, dict] groups: le résultat à mettre à jour, un dict vide pour commencer
+    :param list[tuple] | ColumnTable table: les nouvelles lignes
+    :param int key_column: l'index de la colone qui sert de clé
+    :param int column_index: l'index de la colone à traiter
+    """
+    if isinstance(table, ColumnTable):
+        # Les colones sont déjà converties, on retire les nombres négatifs comme is_number, et les NULL (NaN >= 0 est
+        # faux)
+        pairs = ((key, value) for key, value in zip(table.values(key_column), table.values(column_index))
+                 if value >= 0)
+    else:
+        pairs = ((row[key_column], float(row[column_index])) for row in table
+                 # On teste si c'est un nombre pour éviter les erreurs
+                 if is_number(row[column_index]))
+
+    touched = list()  # Les statistiques des groupes modifiés, chaque groupe une seule fois
+    for key, value in pairs:
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = {'min': value, 'max': value, 'sum': value, 'count': 1, 'mean': None}
+            touched.append(stats)
+        else:
+            if stats['mean'] is not None:  # Première nouvelle ligne du groupe
+                stats['mean'] = None
+                touched.append(stats)
+            if value < stats['min']:
+                stats['min'] = value
+            if value > stats['max']:
+                stats['max'] = value
+            stats['sum'] += value
+            stats['count'] += 1
+
+    for stats in touched:
+        stats['mean'] = stats['sum'] / stats['count']
+
+
+@profiled
+def order_table_by_column(table, column_index, reverse=False, chunk_size=None, numeric_columns=()):
+    """
+    Permet de trier une table à partir de la colone spécifiée
+    :param list[tuple] table: la table à trier
+    :param int | tuple[int] column_index: l'index de la colone qui sert de référence, ou les index de plusieurs
+        colones dans l'ordre de priorité
+    :param boolean reverse: true si on doit trier la table dans le sens inverse
+    :param int chunk_size: si donné, la table (ou un générateur) est triée par morceaux de chunk_size lignes avec un
+        tri externe, sans être gardée en mémoire (voir le module external_sort). Les cases doivent être des strings
+    :param tuple[int] numeric_columns: les colones à comparer comme des nombres plutôt que comme des strings, les NULL
+        sont placés après les nombres, dans les deux sens de tri
+    :return list[tuple]: la table triée, un générateur avec chunk_size
+    """
+    if chunk_size is not None:
+        return external_sort(table, column_index, reverse, numeric_columns, chunk_size=chunk_size)
+    if numeric_columns:
+        return sorted(table, key=get_sort_key(column_index, numeric_columns, reverse), reverse=reverse)
+    if isinstance(column_index, tuple):
+        return sorted(table, key=itemgetter(*column_index), reverse=reverse)
+    return sorted(table, key=lambda value: value[column_index], reverse=reverse)
+
+
+@profiled
+def top_k(table, column_index, k, reverse=False, numeric=None):
+    """
+    Permet d'obtenir les k lignes qui ont les plus petites valeurs (ou les plus grandes avec reverse) dans une colone,
+    sans trier toute la table : un tas de k lignes est gardé pendant un seul passage (heapq), en O(n log k).
+    Le résultat est le même que order_table_by_column(table, column_index, reverse)[:k], sans les NULL. La table
+    peut être un générateur, seules k lignes sont alors gardées en mémoire
+    :param list[tuple] | ColumnTable table: la table source
+    :param int column_index: l'index de la colone qui sert de référence
+    :param int k: le nombre de lignes à garder
+    :param bool reverse: true pour garder les plus grandes valeurs
+    :param bool numeric: true pour comparer les cases (des strings) comme des nombres. Sinon, les strings sont
+        comparées comme des strings, comme avec order_table_by_column, et les cases qui ne sont pas des strings
+        (ColumnTable, NumPy...) comme des nombres
+    :return list[tuple]: les k lignes, triées
+    """
+    # Les NULL et les NaN (NULL d'une ColumnTable, NaN != NaN) sont ignorés
+    rows = (row for row in table if row[column_index] != 'NULL' and row[column_index] == row[column_index])
+    first_row = next(rows, None)
+    if first_row is None:
+        return []
+    rows = chain((first_row,), rows)
+
+    # Une case qui n'est pas une string est déjà un nombre, et se compare sans conversion
+    if numeric and isinstance(first_row[column_index], str):
+        key = lambda row: float(row[column_index])
+    else:
+        key = itemgetter(column_index)
+    return heapq.nlargest(k, rows, key) if reverse else heapq.nsmallest(k, rows, key)
+
+
+def argmin(table, column_index, numeric=None):
+    """
+    Permet d'obtenir la ligne qui a la plus petite valeur dans une colone, en un seul passage. Les NULL sont ignorés
+    :param list[tuple] | ColumnTable table: la table source, ou un générateur
+    :param int column_index: l'index de la colone qui sert de référence
+    :param bool numeric: voir top_k
+    :return tuple | None: la première ligne qui a la plus petite valeur, None si la table est vide
+    """
+    rows = top_k(table, column_index, 1, numeric=numeric)
+    return rows[0] if rows else None
+
+
+def argmax(table, column_index, numeric=None):
+    """
+    Permet d'obtenir la ligne qui a la plus grande valeur dans une colone, en un seul passage. Les NULL sont ignorés
+    :param list[tuple] | ColumnTable table: la table source, ou un générateur
+    :param int column_index: l'index de la colone qui sert de référence
+    :param bool numeric: voir top_k
+    :return tuple | None: la première ligne qui a la plus grande valeur, None si la table est vide
+    """
+    rows = top_k(table, column_index, 1, reverse=True, numeric=numeric)
+    return rows[0] if rows else None
+
+
+def convert_column_to_float(table, colomn_index):
+    """
+    Convertis une colone de strings dans une table en une colone de floats
+    :param list[tuple] table: la table source
+    :param int colomn_index:
+    :return list[tuple]: la table avec la colone convertie
+    """
+    return [
+        tuple(
+            list(row[:colomn_index]) + [float(row[colomn_index])] + list(row[colomn_index + 1:])
+        )
+        for row in table
+    ]